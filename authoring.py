@@ -1,6 +1,10 @@
-import imp
 import sys
 
+try:
+    from importlib import reload as reload_module
+except ImportError:
+    from imp import reload as reload_module
+
 
 ###----------------------------------------------------------------------------
 
@@ -11,7 +15,7 @@ def reload(prefix, modules=[""]):
     for module in modules:
         module = (prefix + module).rstrip(".")
         if module in sys.modules:
-            imp.reload(sys.modules[module])
+            reload_module(sys.modules[module])
 
 
 ###----------------------------------------------------------------------------
@@ -0,0 +1,4 @@
+"""
+A command line batch linter for HyperHelp help packages, which runs all of the
+HyperHelpAuthor linters without needing Sublime Text; see __main__.py.
+"""
@@ -0,0 +1,129 @@
+"""
+Lint HyperHelp help packages from the command line, without Sublime Text:
+
+    python -m hhlint [--packages PATH] [--format text|json|sarif]
+                     [--fail-on error|warning|info|never]
+                     [--jobs N] [--workers N] [--chunk-size N] [--profile]
+                     [--cache-dir PATH] [PACKAGE ...]
+
+Help indexes are loaded from the hyperhelp.json files in the given Packages
+folder, which defaults to the folder that HyperHelpAuthor is installed in.
+With no package names, every help package in that folder is linted. All of
+the packages are linted in one run, sharing the loaded help indexes and the
+resolution of links between packages; --jobs packages are linted at a time.
+
+The exit code is 0 when there are no issues at or above the --fail-on level,
+1 when there are, and 2 if the lint could not be run at all.
+
+hyperhelpcore is found in the Packages folder or the Lib folder next to it
+unless --hyperhelpcore gives its location.
+
+Nothing is written outside of the output unless --cache-dir is given, in
+which case the link graph of each package is kept there between runs, the
+way that Sublime keeps it in its cache folder.
+"""
+import os
+import sys
+import argparse
+
+from .host import install_host, package_root
+
+
+###----------------------------------------------------------------------------
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="hhlint",
+        description="Lint HyperHelp help packages without Sublime Text")
+
+    parser.add_argument("package", nargs="*",
+                        help="the help packages to lint (default: all)")
+    parser.add_argument("--packages", metavar="PATH",
+                        default=os.path.dirname(package_root),
+                        help="the Sublime Text Packages folder to use")
+    parser.add_argument("--hyperhelpcore", metavar="PATH",
+                        help="the folder that contains hyperhelpcore")
+    parser.add_argument("--format", choices=["text", "json", "sarif"],
+                        default="text", help="the output format")
+    parser.add_argument("--fail-on", dest="fail_on",
+                        choices=["error", "warning", "info", "never"],
+                        default="error",
+                        help="the issue type that causes a failing exit code")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of packages to lint at the same time "
+                             "(0 for one per CPU)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (0 for one per CPU)")
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int,
+                        default=25, help="files per chunk given to a worker")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each linter and include a profile of the "
+                             "lint in the text and json output")
+    parser.add_argument("--cache-dir", dest="cache_dir", metavar="PATH",
+                        help="a folder to keep link graphs in between runs "
+                             "(default: none)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    packages = os.path.abspath(args.packages)
+    if not os.path.isdir(packages):
+        print("hhlint: packages folder not found: %s" % packages,
+              file=sys.stderr)
+        return 2
+
+    try:
+        install_host(packages, args.hyperhelpcore, args.cache_dir)
+    except ImportError as error:
+        print("hhlint: unable to load HyperHelpAuthor: %s" % error,
+              file=sys.stderr)
+        return 2
+
+    from hyperhelpcore.core import help_index_list
+    from HyperHelpAuthor.src.linter_support import lint_all_targets
+    from HyperHelpAuthor.src.linter_support import lint_packages
+    from HyperHelpAuthor.src.index_snapshot import index_snapshot
+    from HyperHelpAuthor.src.lint_cache import LintCache
+    from . import report
+
+    index_list = help_index_list()
+    names = args.package or sorted(index_list.keys())
+
+    unknown = [name for name in names if name not in index_list]
+    if unknown:
+        print("hhlint: unknown help package(s): %s" % ", ".join(unknown),
+              file=sys.stderr)
+        return 2
+
+    targets = {target.pkg_info.package: target
+               for target in lint_all_targets(index_list)[1]}
+
+    results = lint_packages([targets[name] for name in names],
+                            index_snapshot(index_list), jobs=args.jobs,
+                            workers=args.workers, chunk_size=args.chunk_size,
+                            cache=LintCache(), profile=args.profile,
+                            processes=True)
+
+    sys.stdout.write(report.FORMATS[args.format](results, packages))
+    return report.exit_code(results, args.fail_on)
+
+
+###----------------------------------------------------------------------------
+
+
+# Worker processes that are spawned rather than forked import this module
+# under a different name; set the host up again for them.
+if __name__ != "__main__" and "HHLINT_PACKAGES" in os.environ:
+    install_host(os.environ["HHLINT_PACKAGES"],
+                 os.environ.get("HHLINT_HYPERHELPCORE"),
+                 os.environ.get("HHLINT_CACHE"))
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,4 @@
+"""
+Benchmarks for the HyperHelpAuthor linters, run against synthetic help
+packages; see __main__.py.
+"""
@@ -0,0 +1,255 @@
+"""
+Benchmark the HyperHelpAuthor linters against synthetic help packages:
+
+    python -m hhlint.bench [--files N] [--anchors N] [--links N] ...
+                           [--repeat N] [--baseline FILE] [--save]
+                           [--tolerance FRACTION]
+
+Packages with the requested shape are generated (see generate.py) and then
+each of these is timed against the first of them, taking the best of several
+runs:
+
+    - loading and tokenizing all of the help files
+    - scanning the header, anchors and links of each of them
+    - every LinterBase subclass, run over every scanned file
+    - the whole lint command, from the command to the finished output
+    - format_lint(), over the issues from a full lint
+
+The sublime module and hyperhelpcore are replaced with lightweight stand-ins
+so that this runs under a regular Python interpreter.
+
+With --save the timings are stored as the baseline; otherwise they're compared
+against the stored baseline (if any) and any benchmark that is slower than the
+baseline by more than the tolerance is flagged as a regression, which makes the
+exit code 1. Baselines are only meaningful on the machine they were recorded
+on and are not compared if the package shape is different.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from collections import OrderedDict
+
+from ..host import install_host
+from .generate import PackageShape, default_shape, generate_packages
+
+
+###----------------------------------------------------------------------------
+
+
+_bench_root = os.path.dirname(os.path.abspath(__file__))
+
+# Regressions smaller than this many seconds are considered to be noise.
+_noise = 0.0005
+
+
+###----------------------------------------------------------------------------
+
+
+def _best(func, repeat):
+    """
+    Run the function the given number of times and return the shortest time
+    that it took, in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def linter_classes():
+    """
+    Return every subclass of LinterBase, in the order they were defined.
+    """
+    from HyperHelpAuthor.src.linter_base import LinterBase
+
+    classes = []
+    pending = list(LinterBase.__subclasses__())
+    while pending:
+        linter_class = pending.pop(0)
+        classes.append(linter_class)
+        pending.extend(linter_class.__subclasses__())
+
+    return classes
+
+
+def run_benchmarks(package, repeat):
+    """
+    Run all of the benchmarks against the help package with the given name,
+    returning an OrderedDict of benchmark names and times in seconds.
+    """
+    import sublime
+    from hyperhelpcore.core import help_index_list
+    from HyperHelpAuthor.src.linter_base import LintTarget
+    from HyperHelpAuthor.src.index_snapshot import index_snapshot
+    from HyperHelpAuthor.src.document import HelpDocument, load_help_document
+    from HyperHelpAuthor.src.lint_cache import lint_cache
+    from HyperHelpAuthor.src.linter_support import get_linters, lint_target
+    from HyperHelpAuthor.src.linter_support import lint_document
+    from HyperHelpAuthor.src.linter_support import format_lint
+    from HyperHelpAuthor.src.commands.lint import HyperhelpAuthorLintCommand
+    from .window import BenchWindow
+
+    index_list = help_index_list()
+    index = index_snapshot(index_list)
+    pkg_info = index_list[package]
+    target = LintTarget("package", pkg_info, list(pkg_info.help_files))
+
+    doc_root = os.path.join(sublime.packages_path(), pkg_info.doc_root)
+    paths = [os.path.join(doc_root, file) for file in target.files]
+
+    timings = OrderedDict()
+
+    timings["load documents"] = _best(
+        lambda: [load_help_document(path) for path in paths], repeat)
+
+    docs = [load_help_document(path) for path in paths]
+    timings["scan documents"] = _best(
+        lambda: [HelpDocument(doc.content, doc.file_name).scan()
+                 for doc in docs], repeat)
+
+    facts = [doc.facts() for doc in docs]
+    for linter_class in linter_classes():
+        def lint(linter_class=linter_class):
+            linter = linter_class(pkg_info, index)
+            for file, doc in zip(target.files, docs):
+                lint_document(doc, file, [linter])
+            for file, file_facts in zip(target.files, facts):
+                linter.lint_facts(file, file_facts)
+
+            return linter.results()
+
+        timings["linter %s" % linter_class.__name__] = _best(lint, repeat)
+
+    window = BenchWindow(os.path.join(doc_root, "hyperhelp.json"))
+    def command():
+        lint_cache.clear()
+        HyperhelpAuthorLintCommand(window).run()
+
+    timings["lint command"] = _best(command, repeat)
+
+    linters = get_linters(target, index)
+    lint_target(target, linters)
+    issues = [issue for linter in linters for issue in linter.results()]
+    timings["format_lint (%d issues)" % len(issues)] = _best(
+        lambda: format_lint(target, issues), repeat)
+
+    return timings
+
+
+###----------------------------------------------------------------------------
+
+
+def load_baseline(filename):
+    try:
+        with open(filename, "r") as handle:
+            return json.load(handle)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def save_baseline(filename, shape, timings):
+    with open(filename, "w") as handle:
+        json.dump({"shape": shape._asdict(), "timings": timings},
+                  handle, indent=4)
+        handle.write("\n")
+
+
+def report(timings, baseline, tolerance):
+    """
+    Print a table of the timings, compared against the timings from the given
+    baseline, if any. Returns the number of benchmarks that regressed.
+    """
+    base = baseline["timings"] if baseline is not None else {}
+    width = max(len(name) for name in timings)
+
+    print("%-*s %12s %12s %8s" % (width, "benchmark", "time (ms)",
+                                   "base (ms)", "change"))
+
+    regressions = 0
+    for name, elapsed in timings.items():
+        line = "%-*s %12.3f" % (width, name, elapsed * 1000)
+
+        if name in base:
+            before = base[name]
+            line += " %12.3f %+7.1f%%" % (before * 1000,
+                                          (elapsed - before) / before * 100)
+            if elapsed > before * (1 + tolerance) and elapsed - before > _noise:
+                line += "  REGRESSION"
+                regressions += 1
+
+        print(line)
+
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="hhlint.bench",
+        description="Benchmark the HyperHelpAuthor linters")
+
+    for field in PackageShape._fields:
+        default = getattr(default_shape, field)
+        parser.add_argument("--" + field.replace("_", "-"), dest=field,
+                            type=type(default), default=default,
+                            help="default: %s" % default)
+
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs of each benchmark; the best is used")
+    parser.add_argument("--baseline", metavar="FILE",
+                        default=os.path.join(_bench_root, "baseline.json"),
+                        help="the file that baseline timings are stored in")
+    parser.add_argument("--save", action="store_true",
+                        help="store the timings as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="slowdown (as a fraction) that is a regression")
+    parser.add_argument("--keep", metavar="PATH",
+                        help="generate packages here and keep them")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    shape = PackageShape(*[getattr(args, field)
+                           for field in PackageShape._fields])
+
+    packages = args.keep or tempfile.mkdtemp(prefix="hhbench")
+    try:
+        names = generate_packages(packages, shape)
+        install_host(os.path.abspath(packages),
+                     os.path.join(_bench_root, "stubs"))
+
+        timings = run_benchmarks(names[0], args.repeat)
+
+    finally:
+        if args.keep is None:
+            shutil.rmtree(packages, ignore_errors=True)
+
+    if args.save:
+        report(timings, None, args.tolerance)
+        save_baseline(args.baseline, shape, timings)
+        print("\nBaseline saved to %s" % args.baseline)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is not None and baseline.get("shape") != shape._asdict():
+        print("Baseline in %s is for a different package shape; ignoring it\n"
+              % args.baseline)
+        baseline = None
+
+    return 1 if report(timings, baseline, args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,200 @@
+"""
+Generate synthetic help packages for benchmarking.
+
+Every package has an index.txt that links to the rest of its help files, a
+hyperhelp.json that describes all of the files and topics in it and a table of
+contents nested to the requested depth. The content is random but repeatable
+for a given seed, and mostly correct so that the linters do the same work they
+do on real help; a small fraction of links are deliberately broken.
+"""
+import os
+import json
+import random
+import codecs
+from collections import namedtuple
+
+
+###----------------------------------------------------------------------------
+
+
+# The shape of the packages to generate:
+#   packages     - number of help packages
+#   files        - help files per package, including index.txt
+#   anchors      - anchors per help file
+#   links        - links per anchor (link density)
+#   cross_links  - fraction of links that go to a topic in another package
+#   broken_links - fraction of links that go to a topic that doesn't exist
+#   toc_depth    - maximum depth of the table of contents
+#   aliases      - aliases per topic in the index
+#   seed         - seed for the random content
+PackageShape = namedtuple("PackageShape", [
+    "packages", "files", "anchors", "links", "cross_links", "broken_links",
+    "toc_depth", "aliases", "seed"
+])
+
+default_shape = PackageShape(packages=2, files=100, anchors=20, links=1.0,
+                             cross_links=0.1, broken_links=0.02, toc_depth=3,
+                             aliases=1, seed=1)
+
+
+_words = """
+    lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod
+    tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam
+    quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo
+    consequat duis aute irure in reprehenderit voluptate velit esse cillum
+""".split()
+
+
+###----------------------------------------------------------------------------
+
+
+def package_name(number):
+    return "BenchPkg%d" % number
+
+
+def _file_name(number):
+    return "index.txt" if number == 0 else "file%04d.txt" % number
+
+
+def _topic(pkg_number, file_number, anchor_number):
+    return "p%d_f%d_t%d" % (pkg_number, file_number, anchor_number)
+
+
+def _title(file_number):
+    return "Synthetic help file %d" % file_number
+
+
+def _sentence(rng, words=8):
+    return " ".join(rng.choice(_words) for _ in range(words))
+
+
+def _link(rng, shape, pkg_number, file_number):
+    """
+    Return the markup for a random link from a file in a package.
+    """
+    roll = rng.random()
+    if roll < shape.broken_links:
+        return "|no_such_topic_%d|" % rng.randrange(1000)
+
+    target_file = rng.randrange(shape.files)
+    target_anchor = rng.randrange(shape.anchors)
+
+    if shape.packages > 1 and roll < shape.broken_links + shape.cross_links:
+        other = rng.choice([p for p in range(shape.packages)
+                            if p != pkg_number])
+        return "|%s:%s:%s|" % (package_name(other),
+                               _topic(other, target_file, target_anchor),
+                               _sentence(rng, 2))
+
+    return "|%s|" % _topic(pkg_number, target_file, target_anchor)
+
+
+def _help_file(rng, shape, pkg_number, file_number):
+    """
+    Return the content of a help file in a package.
+    """
+    lines = ['%%hyperhelp title="%s" date="2019-01-01"' % _title(file_number),
+             ""]
+
+    if file_number == 0:
+        lines.extend("|%s|" % _file_name(n) for n in range(1, shape.files))
+        lines.append("")
+
+    links = 0.0
+    for anchor in range(shape.anchors):
+        links += shape.links
+        parts = [_sentence(rng),
+                 "*%s:%s*" % (_topic(pkg_number, file_number, anchor),
+                              _sentence(rng, 2)),
+                 _sentence(rng)]
+        while links >= 1:
+            links -= 1
+            parts.append(_link(rng, shape, pkg_number, file_number))
+            parts.append(_sentence(rng, 4))
+
+        lines.append(" ".join(parts) + ".")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def _toc(files, depth):
+    """
+    Return a table of contents for the list of help files, nested no more
+    than depth levels deep.
+    """
+    if depth <= 1 or len(files) <= 2:
+        return list(files)
+
+    width = max(2, int(round(len(files) ** (1.0 / depth))))
+    size = -(-len(files) // width)
+
+    toc = []
+    for start in range(0, len(files), size):
+        group = files[start:start + size]
+        toc.append({"topic": group[0],
+                    "children": _toc(group[1:], depth - 1)})
+
+    return toc
+
+
+def _help_index(shape, pkg_number):
+    """
+    Return the help index for a package.
+    """
+    help_files = {}
+    for file_number in range(shape.files):
+        entries = [_title(file_number)]
+        for anchor in range(shape.anchors):
+            topic = _topic(pkg_number, file_number, anchor)
+            entries.append({
+                "topic": topic,
+                "caption": "Topic %s" % topic,
+                "aliases": ["%s alias %d" % (topic, n)
+                            for n in range(shape.aliases)]
+            })
+
+        help_files[_file_name(file_number)] = entries
+
+    return {
+        "package": package_name(pkg_number),
+        "description": "Synthetic help package %d" % pkg_number,
+        "doc_root": "help/",
+        "help_files": help_files,
+        "help_contents": _toc([_file_name(n) for n in range(shape.files)],
+                              shape.toc_depth)
+    }
+
+
+###----------------------------------------------------------------------------
+
+
+def generate_packages(packages_path, shape=default_shape):
+    """
+    Generate the help packages described by the given PackageShape in the
+    provided Packages folder, returning the list of package names.
+    """
+    rng = random.Random(shape.seed)
+
+    names = []
+    for pkg_number in range(shape.packages):
+        name = package_name(pkg_number)
+        help_path = os.path.join(packages_path, name, "help")
+        os.makedirs(help_path, exist_ok=True)
+
+        with codecs.open(os.path.join(help_path, "hyperhelp.json"), "w",
+                         "utf-8") as handle:
+            json.dump(_help_index(shape, pkg_number), handle, indent=4)
+
+        for file_number in range(shape.files):
+            content = _help_file(rng, shape, pkg_number, file_number)
+            with codecs.open(os.path.join(help_path, _file_name(file_number)),
+                             "w", "utf-8") as handle:
+                handle.write(content)
+
+        names.append(name)
+
+    return names
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,96 @@
+"""
+Measure the memory used to hold the issues from a large lint:
+
+    python -m hhlint.bench.issue_memory [--issues N]
+
+The same synthetic issues (spread over a few hundred files, with a realistic
+mix of messages) are held both as a list of LintResult tuples with formatted
+messages, which is how linters used to store them, and in an IssueStore. The
+memory allocated for each is measured with tracemalloc.
+"""
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+
+from ..host import install_host
+from .__main__ import _bench_root
+
+
+###----------------------------------------------------------------------------
+
+
+_templates = [
+    ("warning", "Link references unknown topic '%s'"),
+    ("error", "Link references a topic in a non-existant package ('%s')"),
+    ("error", "The topic '%s' is defined in another file ('%s')"),
+    ("warning", "Topic '%s' was not found in the help index"),
+]
+
+
+def synthetic_issues(count):
+    """
+    Yield (type, file, line, column, template, args) for the given number of
+    synthetic issues.
+    """
+    for number in range(count):
+        m_type, template = _templates[number % len(_templates)]
+        file = "file%04d.txt" % (number % 500)
+        args = tuple("topic_%d" % (number + n)
+                     for n in range(template.count("%s")))
+        yield (m_type, file, number % 2000 + 1, number % 80 + 1, template, args)
+
+
+def _measure(build, count):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        issues = build(count)
+        return tracemalloc.get_traced_memory()[0] - before, issues
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="hhlint.bench.issue_memory")
+    parser.add_argument("--issues", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    install_host(tempfile.gettempdir(), os.path.join(_bench_root, "stubs"))
+    from HyperHelpAuthor.src.linter_base import IssueStore, LintResult
+
+    def as_list(count):
+        return [LintResult(m_type, file, line, column,
+                           template % args)
+                for m_type, file, line, column, template, args
+                in synthetic_issues(count)]
+
+    def as_store(count):
+        store = IssueStore()
+        for issue in synthetic_issues(count):
+            store.add(*issue)
+
+        return store
+
+    list_size, issue_list = _measure(as_list, args.issues)
+    store_size, store = _measure(as_store, args.issues)
+
+    assert store.results() == issue_list
+
+    print("%d issues" % args.issues)
+    print("    LintResult list: %10d bytes (%.1f per issue)" % (
+        list_size, list_size / args.issues))
+    print("    IssueStore:      %10d bytes (%.1f per issue)" % (
+        store_size, store_size / args.issues))
+    print("    saved:           %9.1f%%" % (
+        (list_size - store_size) / list_size * 100))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+###----------------------------------------------------------------------------
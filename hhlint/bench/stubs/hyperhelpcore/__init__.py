@@ -0,0 +1,13 @@
+"""
+A lightweight stand-in for hyperhelpcore, used by the benchmarks so that they
+can run under a plain Python interpreter and so that the cost of hyperhelpcore
+itself is not part of what is being measured.
+
+Only the parts of the API that HyperHelpAuthor uses are provided, and they are
+simplified versions of the real thing; help indexes are loaded and topics are
+looked up in the same way, but nothing that needs a window does anything.
+"""
+
+
+def initialize():
+    pass
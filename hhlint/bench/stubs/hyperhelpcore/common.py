@@ -0,0 +1,37 @@
+"""
+Stand-ins for the parts of hyperhelpcore.common that HyperHelpAuthor uses.
+"""
+import sys
+
+
+###----------------------------------------------------------------------------
+
+
+def log(message, *args, status=False, dialog=False):
+    """
+    Log the formatted message to stderr; messages that are only meant for the
+    status bar are dropped.
+    """
+    if not status or dialog:
+        print("HyperHelp:", message % args if args else message,
+              file=sys.stderr)
+
+
+def hh_syntax(base_file):
+    return "Packages/hyperhelpcore/resources/syntax/%s" % base_file
+
+
+def current_help_package(view=None, window=None):
+    return None
+
+
+def current_help_file(view=None, window=None):
+    return None
+
+
+def help_package_prompt(help_list, on_select, on_cancel=None):
+    if on_cancel is not None:
+        on_cancel()
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,202 @@
+"""
+Stand-ins for the parts of hyperhelpcore.core that HyperHelpAuthor uses.
+"""
+import sublime
+
+import re
+import time
+import posixpath
+from collections import namedtuple, OrderedDict
+
+
+###----------------------------------------------------------------------------
+
+
+HeaderData = namedtuple("HeaderData", ["file", "title", "date"])
+
+HelpData = namedtuple("HelpData", [
+    "package", "index_file", "description", "doc_root", "help_topics",
+    "help_aliases", "help_files", "package_files", "urls", "help_toc"
+])
+
+
+_header_keys_re = re.compile(r'\b(\w+)="([^"]*)"')
+
+
+###----------------------------------------------------------------------------
+
+
+def _topics(entries, file, topics, aliases):
+    """
+    Add the topics and aliases from a list of topic entries for the given file
+    into the provided dictionaries.
+    """
+    for entry in entries:
+        topic = " ".join(entry["topic"].casefold().split())
+        topics[topic] = dict(entry, topic=topic, file=file)
+        for alias in entry.get("aliases", []):
+            aliases[" ".join(alias.casefold().split())] = topic
+
+
+def _toc(items, topics):
+    """
+    Resolve a table of contents from an index into a list of topic entries.
+    """
+    toc = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"topic": item}
+
+        entry = topics.get(item["topic"].casefold())
+        if entry is None:
+            continue
+
+        entry = dict(entry)
+        if "children" in item:
+            entry["children"] = _toc(item["children"], topics)
+
+        toc.append(entry)
+
+    return toc
+
+
+###----------------------------------------------------------------------------
+
+
+def load_help_index(index_resource):
+    """
+    Load the help index from the given resource, returning a HelpData tuple or
+    None if the index can't be loaded.
+    """
+    try:
+        raw = sublime.decode_value(sublime.load_resource(index_resource))
+    except Exception:
+        return None
+
+    package = raw.get("package") or index_resource.split("/")[1]
+    if "doc_root" in raw:
+        doc_root = posixpath.normpath(posixpath.join(
+            index_resource.split("/")[1], raw["doc_root"]))
+    else:
+        doc_root = posixpath.dirname(index_resource[len("Packages/"):])
+
+    topics = {}
+    aliases = {}
+    help_files = OrderedDict()
+    for file, entries in raw.get("help_files", {}).items():
+        help_files[file] = entries[0]
+        _topics([{"topic": file, "caption": entries[0]}] + entries[1:],
+                file, topics, aliases)
+
+    externals = {}
+    for key in ("package_files", "urls"):
+        externals[key] = OrderedDict()
+        for file, entries in raw.get(key, {}).items():
+            externals[key][file] = entries[0]
+            _topics(entries[1:], file, topics, aliases)
+
+    toc = raw.get("help_contents")
+    toc = _toc(toc if toc is not None else list(help_files), topics)
+
+    return HelpData(package, index_resource,
+                    raw.get("description", "Help for %s" % package),
+                    doc_root, topics, aliases, help_files,
+                    externals["package_files"], externals["urls"], toc)
+
+
+def help_index_list(reload=False, package=None):
+    """
+    Return the help indexes for all packages, loading them the first time.
+    """
+    index = getattr(help_index_list, "index", None)
+    if index is None or (reload and package is None):
+        index = OrderedDict()
+        for res in sublime.find_resources("hyperhelp.json"):
+            pkg_info = load_help_index(res)
+            if pkg_info is not None:
+                index[pkg_info.package] = pkg_info
+
+        help_index_list.index = index
+
+    elif reload and package in index:
+        pkg_info = load_help_index(index[package].index_file)
+        if pkg_info is not None:
+            index[package] = pkg_info
+
+    return index
+
+
+def lookup_help_topic(pkg_info, topic):
+    """
+    Look up a topic in a help index, allowing for aliases.
+    """
+    if isinstance(pkg_info, str):
+        pkg_info = help_index_list().get(pkg_info)
+
+    if pkg_info is None:
+        return None
+
+    topic = " ".join(topic.casefold().split())
+    return pkg_info.help_topics.get(pkg_info.help_aliases.get(topic, topic))
+
+
+def is_topic_file_valid(pkg_info, topic_dict):
+    return True
+
+
+def parse_help_header(help_file, header_line):
+    """
+    Parse the header line of a help file, returning a HeaderData tuple or None
+    if it's not a help header.
+    """
+    if not header_line.startswith("%hyperhelp"):
+        return None
+
+    title = "No Title Provided"
+    date = 0.0
+    for key, value in _header_keys_re.findall(header_line):
+        if key == "title":
+            title = value
+        elif key == "date":
+            try:
+                date = time.mktime(time.strptime(value, "%Y-%m-%d"))
+            except ValueError:
+                pass
+
+    return HeaderData(help_file, title, date)
+
+
+def parse_anchor_body(anchor_body):
+    """
+    Split the body of an anchor into its topic and text.
+    """
+    topic, sep, text = anchor_body.partition(":")
+    if not sep:
+        text = topic
+    elif not topic:
+        topic = text
+
+    return (topic.casefold().rstrip(), text.strip())
+
+
+def parse_link_body(link_body):
+    """
+    Split the body of a link into its package, topic and text; all three are
+    None if the link is malformed.
+    """
+    parts = link_body.split(":")
+    if len(parts) == 1:
+        return (None, link_body.rstrip(), link_body.rstrip())
+
+    if len(parts) == 2:
+        return (None, None, None)
+
+    pkg, topic, text = parts[0], parts[1], ":".join(parts[2:])
+    return (pkg or None, (topic or text).strip(), text.strip())
+
+
+def reload_help_file(help_list, help_view):
+    return True
+
+
+###----------------------------------------------------------------------------
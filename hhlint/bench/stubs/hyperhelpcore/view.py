@@ -0,0 +1,13 @@
+"""
+Stand-ins for the parts of hyperhelpcore.view that HyperHelpAuthor uses.
+"""
+
+
+###----------------------------------------------------------------------------
+
+
+def find_help_view(window=None):
+    return None
+
+
+###----------------------------------------------------------------------------
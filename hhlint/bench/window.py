@@ -0,0 +1,144 @@
+"""
+Minimal stand-ins for a Sublime window and its views, so that the lint command
+can run from start to finish in a benchmark. Text appended to a view is kept,
+but nothing is displayed.
+"""
+import sublime
+
+
+###----------------------------------------------------------------------------
+
+
+class BenchView():
+    """
+    A view, either for a file or an output panel. The scope of the view is
+    determined by the file extension, the same way the HyperHelp syntaxes
+    apply.
+    """
+    _next_id = 1
+
+    def __init__(self, window, file_name=None):
+        self._id = BenchView._next_id
+        BenchView._next_id += 1
+
+        self._window = window
+        self._file_name = file_name
+        self._settings = sublime.Settings()
+        self._status = {}
+        self._read_only = False
+        self._regions = {}
+        self.text = ""
+
+        self.scope = ""
+        if file_name is not None:
+            if file_name.endswith("hyperhelp.json"):
+                self.scope = "text.hyperhelp.index"
+            elif file_name.endswith(".txt"):
+                self.scope = "text.hyperhelp.help"
+
+    def id(self):
+        return self._id
+
+    def window(self):
+        return self._window
+
+    def file_name(self):
+        return self._file_name
+
+    def settings(self):
+        return self._settings
+
+    def size(self):
+        return len(self.text)
+
+    def substr(self, region):
+        return self.text[region.begin():region.end()]
+
+    def rowcol(self, point):
+        row = self.text.count("\n", 0, point)
+        return (row, point - (self.text.rfind("\n", 0, point) + 1))
+
+    def text_point(self, row, col):
+        start = 0
+        for _ in range(row):
+            start = self.text.find("\n", start) + 1
+            if start == 0:
+                return len(self.text)
+
+        return min(start + col, len(self.text))
+
+    def line(self, point):
+        start = self.text.rfind("\n", 0, point) + 1
+        end = self.text.find("\n", point)
+        return sublime.Region(start, len(self.text) if end < 0 else end)
+
+    def match_selector(self, point, selector):
+        return self.scope == selector or self.scope.startswith(selector + ".")
+
+    def is_read_only(self):
+        return self._read_only
+
+    def set_read_only(self, read_only):
+        self._read_only = read_only
+
+    def set_scratch(self, scratch):
+        pass
+
+    def set_name(self, name):
+        pass
+
+    def assign_syntax(self, syntax):
+        pass
+
+    def set_status(self, key, value):
+        self._status[key] = value
+
+    def erase_status(self, key):
+        self._status.pop(key, None)
+
+    def add_regions(self, key, regions, *args, **kwargs):
+        self._regions[key] = list(regions)
+
+    def get_regions(self, key):
+        return list(self._regions.get(key, []))
+
+    def erase_regions(self, key):
+        self._regions.pop(key, None)
+
+    def replace(self, edit, region, text):
+        self.text = self.text[:region.begin()] + text + self.text[region.end():]
+
+    def run_command(self, command, args=None):
+        if command == "append":
+            self.text += args["characters"]
+
+
+class BenchWindow():
+    """
+    A window whose active view is the file with the given name.
+    """
+    def __init__(self, file_name):
+        self._active = BenchView(self, file_name)
+        self.panels = {}
+
+    def active_view(self):
+        return self._active
+
+    def views(self):
+        return [self._active]
+
+    def find_open_file(self, file_name):
+        return None
+
+    def focus_view(self, view):
+        pass
+
+    def create_output_panel(self, name, unlisted=False):
+        self.panels[name] = BenchView(self)
+        return self.panels[name]
+
+    def run_command(self, command, args=None):
+        pass
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,94 @@
+"""
+Check the lint tokenizer against the conformance corpus:
+
+    python -m hhlint.conformance
+
+The anchors and links that the headless HelpDocument tokenizer finds in
+resources/corpus/conformance.txt are compared with the spans that the
+HyperHelp-Help syntax gives them, as recorded in conformance.json next to it.
+Every difference is reported and makes the exit code 1.
+
+Inside Sublime, "HyperHelpAuthor: Check lint tokenizer" compares the tokenizer
+against the syntax itself; when the corpus changes, that is how the recorded
+spans are confirmed.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+
+from .host import install_host, package_root
+
+
+###----------------------------------------------------------------------------
+
+
+_corpus_root = os.path.join(package_root, "resources", "corpus")
+_stubs_root = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "bench", "stubs")
+
+
+###----------------------------------------------------------------------------
+
+
+def check_corpus(content, expected):
+    """
+    Compare the tokenizer against the expected spans for the given corpus
+    content; expected maps each selector to a list of [line, column, text]
+    spans, 1 based. Returns a list of (line, column, message) tuples for
+    every difference, in file order.
+    """
+    from HyperHelpAuthor.src.document import HelpDocument
+
+    doc = HelpDocument(content, "conformance.txt")
+
+    issues = []
+    for selector, spans in sorted(expected.items()):
+        want = {tuple(span) for span in spans}
+        found = set()
+        for region in doc.find_by_selector(selector):
+            row, col = doc.rowcol(region.a)
+            found.add((row + 1, col + 1, doc.substr(region)))
+
+        issues.extend((line, column, "tokenizer missed '%s' ('%s')" % (
+                       selector, text))
+                      for line, column, text in want - found)
+        issues.extend((line, column, "tokenizer found extra '%s' ('%s')" % (
+                       selector, text))
+                      for line, column, text in found - want)
+
+    return sorted(issues)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="hhlint.conformance",
+        description="Check the lint tokenizer against the conformance corpus")
+    parser.parse_args(argv)
+
+    install_host(tempfile.gettempdir(), _stubs_root)
+
+    with open(os.path.join(_corpus_root, "conformance.txt"), "r",
+              encoding="utf-8") as handle:
+        content = handle.read()
+
+    with open(os.path.join(_corpus_root, "conformance.json"), "r",
+              encoding="utf-8") as handle:
+        expected = json.load(handle)
+
+    issues = check_corpus(content, expected)
+    for line, column, msg in issues:
+        print("conformance.txt:%d:%d: %s" % (line, column, msg))
+
+    print("%d span(s) checked, %d difference(s)" % (
+        sum(len(spans) for spans in expected.values()), len(issues)))
+
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,268 @@
+"""
+A headless stand-in for the sublime module.
+
+This provides just enough of the Sublime Text API for HyperHelpAuthor and
+hyperhelpcore to load help indexes and lint help files from a Packages folder
+without Sublime running. Resources are served from the folder given to
+set_packages_path() (or the HHLINT_PACKAGES environment variable); there are
+no windows or views. There is also no cache folder unless one is given to
+set_cache_path() (or the HHLINT_CACHE environment variable), so nothing is
+saved between runs by default.
+"""
+import os
+import re
+import sys
+import json
+import fnmatch
+
+
+###----------------------------------------------------------------------------
+
+
+_packages_path = os.path.abspath(os.environ.get("HHLINT_PACKAGES", "."))
+_cache_path = os.environ.get("HHLINT_CACHE")
+_resources = None
+_settings = {}
+
+
+# Tokens in sublime flavoured JSON; strings are matched so that comment and
+# comma handling can skip over them.
+_json_token_re = re.compile(r'''
+      (?P<string>  "(?:[^"\\]|\\.)*")
+    | (?P<comment> //[^\n]*|/\*.*?\*/)
+    | (?P<comma>   ,(?=(?:\s|//[^\n]*|/\*.*?\*/)*[\]}]))
+    ''', re.VERBOSE | re.DOTALL)
+
+
+###----------------------------------------------------------------------------
+
+
+def __getattr__(name):
+    # Constants such as flags for regions and popups have no meaning here.
+    if name.isupper():
+        return 0
+
+    raise AttributeError("module 'sublime' has no attribute '%s'" % name)
+
+
+def set_packages_path(path):
+    """
+    Set the folder that resources are served from. This is not part of the
+    Sublime API.
+    """
+    global _packages_path, _resources
+
+    _packages_path = os.path.abspath(path)
+    _resources = None
+
+
+def set_cache_path(path):
+    """
+    Set the cache folder, or None for there to be none. This is not part of
+    the Sublime API, which always has one.
+    """
+    global _cache_path
+
+    _cache_path = None if path is None else os.path.abspath(path)
+
+
+###----------------------------------------------------------------------------
+
+
+class Region():
+    def __init__(self, a, b=None):
+        self.a = a
+        self.b = a if b is None else b
+
+    def __repr__(self):
+        return "(%d, %d)" % (self.a, self.b)
+
+    def __eq__(self, other):
+        return (isinstance(other, Region) and
+                self.a == other.a and self.b == other.b)
+
+    def __hash__(self):
+        return hash((self.a, self.b))
+
+    def __len__(self):
+        return self.size()
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+    def size(self):
+        return abs(self.b - self.a)
+
+    def empty(self):
+        return self.a == self.b
+
+    def contains(self, x):
+        if isinstance(x, Region):
+            return self.begin() <= x.begin() and x.end() <= self.end()
+
+        return self.begin() <= x <= self.end()
+
+
+class Settings():
+    def __init__(self, values=None):
+        self._values = dict(values or {})
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def has(self, key):
+        return key in self._values
+
+    def set(self, key, value):
+        self._values[key] = value
+
+    def erase(self, key):
+        self._values.pop(key, None)
+
+    def add_on_change(self, tag, callback):
+        pass
+
+    def clear_on_change(self, tag):
+        pass
+
+
+###----------------------------------------------------------------------------
+
+
+def version():
+    return "4000"
+
+
+def channel():
+    return "stable"
+
+
+def platform():
+    return {"darwin": "osx", "win32": "windows"}.get(sys.platform, "linux")
+
+
+def arch():
+    return "x64"
+
+
+def executable_path():
+    return sys.executable
+
+
+def packages_path():
+    return _packages_path
+
+
+def installed_packages_path():
+    return os.path.join(os.path.dirname(_packages_path), "Installed Packages")
+
+
+def cache_path():
+    return _cache_path
+
+
+def windows():
+    return []
+
+
+def active_window():
+    return None
+
+
+def set_timeout(callback, delay=0):
+    callback()
+
+
+def set_timeout_async(callback, delay=0):
+    callback()
+
+
+def status_message(msg):
+    pass
+
+
+def error_message(msg):
+    print(msg, file=sys.stderr)
+
+
+def message_dialog(msg):
+    print(msg, file=sys.stderr)
+
+
+def ok_cancel_dialog(msg, ok_title=""):
+    return False
+
+
+def load_settings(base_name):
+    if base_name not in _settings:
+        _settings[base_name] = Settings()
+
+    return _settings[base_name]
+
+
+def save_settings(base_name):
+    pass
+
+
+###----------------------------------------------------------------------------
+
+
+def _resource_list():
+    """
+    Get the list of all resources in the packages folder, gathering it the
+    first time it's needed.
+    """
+    global _resources
+
+    if _resources is None:
+        _resources = []
+        for root, dirs, files in os.walk(_packages_path, followlinks=True):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            rel = os.path.relpath(root, _packages_path).replace(os.sep, "/")
+            for file in sorted(files):
+                if rel != ".":
+                    _resources.append("Packages/%s/%s" % (rel, file))
+
+    return _resources
+
+
+def find_resources(pattern):
+    return [res for res in _resource_list()
+            if fnmatch.fnmatchcase(res.rsplit("/", 1)[-1], pattern or "*")]
+
+
+def _resource_path(name):
+    if not name.startswith("Packages/"):
+        raise IOError("resource not found")
+
+    return os.path.join(_packages_path, *name.split("/")[1:])
+
+
+def load_binary_resource(name):
+    with open(_resource_path(name), "rb") as handle:
+        return handle.read()
+
+
+def load_resource(name):
+    data = load_binary_resource(name).decode("utf-8")
+    return data.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def decode_value(data):
+    def strip(match):
+        if match.group("string") is not None:
+            return match.group("string")
+
+        return ""
+
+    return json.loads(_json_token_re.sub(strip, data))
+
+
+def encode_value(value, pretty=False):
+    return json.dumps(value, indent=4 if pretty else None)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,41 @@
+"""
+A headless stand-in for the sublime_plugin module, providing the base classes
+that plugins derive from so that they can be imported without Sublime.
+"""
+
+
+###----------------------------------------------------------------------------
+
+
+class EventListener():
+    pass
+
+
+class ViewEventListener():
+    def __init__(self, view):
+        self.view = view
+
+
+class ApplicationCommand():
+    pass
+
+
+class WindowCommand():
+    def __init__(self, window):
+        self.window = window
+
+
+class TextCommand():
+    def __init__(self, view):
+        self.view = view
+
+
+class TextInputHandler():
+    pass
+
+
+class ListInputHandler():
+    pass
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,73 @@
+"""
+Set up a headless host for HyperHelpAuthor, so that it can be imported and
+used from a regular Python interpreter without Sublime Text.
+"""
+import os
+import sys
+import types
+
+
+###----------------------------------------------------------------------------
+
+
+# The folder that contains the HyperHelpAuthor package.
+package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+###----------------------------------------------------------------------------
+
+
+def _core_paths(packages):
+    """
+    Yield the paths in a Sublime data folder that hyperhelpcore could be
+    imported from.
+    """
+    data = os.path.dirname(packages)
+    yield os.path.join(packages, "hyperhelpcore", "all")
+    yield os.path.join(data, "Lib", "python38")
+    yield os.path.join(data, "Lib", "python33")
+
+
+def install_host(packages, hyperhelpcore=None, cache=None):
+    """
+    Install the headless stand-ins for the sublime and sublime_plugin modules,
+    serving resources from the given Packages folder, then load the
+    HyperHelpAuthor package the way that Sublime would. Nothing is saved in a
+    cache folder unless one is given.
+    """
+    os.environ["HHLINT_PACKAGES"] = packages
+    if hyperhelpcore is not None:
+        os.environ["HHLINT_HYPERHELPCORE"] = hyperhelpcore
+    if cache is not None:
+        os.environ["HHLINT_CACHE"] = cache
+
+    headless = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "headless")
+    if headless not in sys.path:
+        sys.path.insert(0, headless)
+
+    import sublime
+    sublime.set_packages_path(packages)
+    sublime.set_cache_path(cache)
+
+    # An explicitly given hyperhelpcore is used over any other copy.
+    if hyperhelpcore is not None and hyperhelpcore not in sys.path:
+        sys.path.insert(0, hyperhelpcore)
+
+    for path in _core_paths(packages):
+        if os.path.isdir(path) and path not in sys.path:
+            sys.path.append(path)
+
+    # Make the package importable by the name Sublime gives it, regardless of
+    # the name of the folder it's in.
+    if "HyperHelpAuthor" not in sys.modules:
+        module = types.ModuleType("HyperHelpAuthor")
+        module.__path__ = [package_root]
+        sys.modules["HyperHelpAuthor"] = module
+
+    import HyperHelpAuthor.authoring
+    from HyperHelpAuthor.src import common
+    common.load_settings()
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,158 @@
+import os
+import json
+
+
+###----------------------------------------------------------------------------
+
+
+# The issue types that cause a non-zero exit code for each --fail-on value.
+FAIL_ON = {
+    "never": set(),
+    "error": {"error"},
+    "warning": {"error", "warning"},
+    "info": {"error", "warning", "info"},
+}
+
+# How issue types map to SARIF result levels.
+_sarif_levels = {
+    "error": "error",
+    "warning": "warning",
+    "info": "note",
+}
+
+
+###----------------------------------------------------------------------------
+
+
+def _issues(linters):
+    return [issue for name, issues in linters for issue in issues]
+
+
+def text_report(results, packages_path):
+    """
+    Report on the results of a lint in the same format as the lint output in
+    Sublime, one package after the other. When there is more than one package,
+    a summary of all of them follows.
+    """
+    from HyperHelpAuthor.src.linter_support import format_lint, count_lint
+    from HyperHelpAuthor.src.linter_support import format_lint_packages
+
+    output = ["\n".join(format_lint(target, _issues(linters),
+                                    profile=profile))
+              for target, linters, profile in results]
+
+    if len(results) > 1:
+        output.append("\n".join(format_lint_packages(
+            [(target.pkg_info.package,) + count_lint(_issues(linters))
+             for target, linters, profile in results])))
+
+    return "\n\n".join(output) + "\n"
+
+
+def json_report(results, packages_path):
+    """
+    Report on the results of a lint as a JSON object, with the issues for each
+    package along with counts of warnings and errors and the lint profile, if
+    there is one.
+    """
+    from HyperHelpAuthor.src.linter_support import count_lint
+
+    packages = []
+    for target, linters, profile in results:
+        warn, err = count_lint(_issues(linters))
+        package = {
+            "package": target.pkg_info.package,
+            "doc_root": target.pkg_info.doc_root,
+            "warnings": warn,
+            "errors": err,
+            "issues": [dict(issue._asdict(), linter=name)
+                       for name, issues in linters for issue in issues]
+        }
+        if profile is not None:
+            package["profile"] = profile.as_dict()
+
+        packages.append(package)
+
+    return json.dumps({"packages": packages}, indent=4) + "\n"
+
+
+def sarif_report(results, packages_path):
+    """
+    Report on the results of a lint as a SARIF 2.1.0 log, for tools that can
+    annotate source files with the results. Each linter is a rule, and file
+    locations are relative to the packages folder.
+    """
+    rules = []
+    sarif_results = []
+    for target, linters, profile in results:
+        doc_root = target.pkg_info.doc_root.rstrip("/")
+        for name, issues in linters:
+            if name not in rules:
+                rules.append(name)
+
+            for issue in issues:
+                sarif_results.append({
+                    "ruleId": name,
+                    "level": _sarif_levels.get(issue.type, "none"),
+                    "message": {"text": issue.message},
+                    "locations": [{
+                        "physicalLocation": {
+                            "artifactLocation": {
+                                "uri": "%s/%s" % (doc_root, issue.file),
+                                "uriBaseId": "PACKAGES"
+                            },
+                            "region": {
+                                "startLine": issue.line,
+                                "startColumn": issue.column
+                            }
+                        }
+                    }]
+                })
+
+    base_uri = "file://" + os.path.abspath(packages_path).replace(os.sep, "/")
+    if not base_uri.startswith("file:///"):
+        base_uri = base_uri.replace("file://", "file:///", 1)
+
+    log = {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {
+                "driver": {
+                    "name": "hhlint",
+                    "informationUri": "https://github.com/STealthy-and-haSTy/HyperHelpAuthor",
+                    "rules": [{"id": name} for name in rules]
+                }
+            },
+            "originalUriBaseIds": {
+                "PACKAGES": {"uri": base_uri.rstrip("/") + "/"}
+            },
+            "results": sarif_results
+        }]
+    }
+
+    return json.dumps(log, indent=4) + "\n"
+
+
+def exit_code(results, fail_on):
+    """
+    Return the exit code for the results of a lint; 1 if any issue has a type
+    that the fail_on level says should fail, 0 otherwise.
+    """
+    failing = FAIL_ON[fail_on]
+    for target, linters, profile in results:
+        for issue in _issues(linters):
+            if issue.type in failing:
+                return 1
+
+    return 0
+
+
+FORMATS = {
+    "text": text_report,
+    "json": json_report,
+    "sarif": sarif_report,
+}
+
+
+###----------------------------------------------------------------------------
@@ -1,6 +1,10 @@
 from ..authoring import reload
 
-reload("src", ["common", "events", "linter_base", "linter_support"])
+reload("src", ["package_archive", "resource_inventory", "index_snapshot",
+       "lint_cache", "link_graph", "common", "header_dates", "document",
+       "lint_profile", "linter_base", "linter_support", "inline_lint",
+       "save_reload", "refactor", "topic_completions", "topic_finder",
+       "events"])
 reload("src.commands")
 reload("src.linter")
 
@@ -14,14 +18,22 @@ __all__ = [
     # commands
     "HyperhelpAuthorCreateHelpCommand",
     "HyperhelpAuthorEditHelpCommand",
+    "HyperhelpAuthorFindTopicCommand",
     "HyperhelpAuthorReloadHelpCommand",
     "HyperhelpAuthorContextEditHelpCommand",
     "HyperhelpAuthorUpdateHeaderCommand",
+    "HyperhelpAuthorUpdateHeadersCommand",
+    "HyperhelpAuthorWhatLinksHereCommand",
+    "HyperhelpAuthorRenameTopicCommand",
+    "HyperhelpAuthorMoveTopicCommand",
     "HyperhelpAuthorCreateIndexCommand",
     "HyperhelpAuthorEditIndexCommand",
     "HyperhelpAuthorReloadIndexCommand",
     "HyperhelpAuthorContextEditIndexCommand",
     "HyperhelpAuthorLintCommand",
+    "HyperhelpAuthorLintAllCommand",
+    "HyperhelpAuthorExpandLintCommand",
+    "HyperhelpAuthorCheckDocumentCommand",
 
     # events/contexts
     "HyperhelpAuthorEventListener",
@@ -1,27 +1,42 @@
 from ...authoring import reload
 
-reload("src.commands", ["common", "context_edit_help", "context_edit_index",
-       "create_help", "create_index", "edit_help", "edit_index", "lint",
-       "reload_help", "reload_index", "update_header"])
+reload("src.commands", ["common", "check_document", "context_edit_help",
+       "context_edit_index", "create_help", "create_index", "edit_help",
+       "edit_index", "expand_lint", "find_topic", "lint", "lint_all",
+       "move_topic", "reload_help", "reload_index", "rename_topic",
+       "update_header", "update_headers", "what_links_here"])
 
+from .check_document import HyperhelpAuthorCheckDocumentCommand
 from .context_edit_help import HyperhelpAuthorContextEditHelpCommand
 from .context_edit_index import HyperhelpAuthorContextEditIndexCommand
 from .create_help import HyperhelpAuthorCreateHelpCommand
 from .create_index import HyperhelpAuthorCreateIndexCommand
 from .edit_help import HyperhelpAuthorEditHelpCommand
 from .edit_index import HyperhelpAuthorEditIndexCommand
+from .expand_lint import HyperhelpAuthorExpandLintCommand
+from .find_topic import HyperhelpAuthorFindTopicCommand
 from .lint import HyperhelpAuthorLintCommand
+from .lint_all import HyperhelpAuthorLintAllCommand
+from .move_topic import HyperhelpAuthorMoveTopicCommand
 from .reload_help import HyperhelpAuthorReloadHelpCommand
 from .reload_index import HyperhelpAuthorReloadIndexCommand
+from .rename_topic import HyperhelpAuthorRenameTopicCommand
 from .update_header import HyperhelpAuthorUpdateHeaderCommand
+from .update_headers import HyperhelpAuthorUpdateHeadersCommand
+from .what_links_here import HyperhelpAuthorWhatLinksHereCommand
 
 __all__ = [
     # Help Files
     "HyperhelpAuthorCreateHelpCommand",
     "HyperhelpAuthorEditHelpCommand",
+    "HyperhelpAuthorFindTopicCommand",
     "HyperhelpAuthorReloadHelpCommand",
     "HyperhelpAuthorContextEditHelpCommand",
     "HyperhelpAuthorUpdateHeaderCommand",
+    "HyperhelpAuthorUpdateHeadersCommand",
+    "HyperhelpAuthorWhatLinksHereCommand",
+    "HyperhelpAuthorRenameTopicCommand",
+    "HyperhelpAuthorMoveTopicCommand",
 
     # Index Files
     "HyperhelpAuthorCreateIndexCommand",
@@ -30,5 +45,8 @@ __all__ = [
     "HyperhelpAuthorContextEditIndexCommand",
 
     # Linting
-    "HyperhelpAuthorLintCommand"
+    "HyperhelpAuthorLintCommand",
+    "HyperhelpAuthorLintAllCommand",
+    "HyperhelpAuthorExpandLintCommand",
+    "HyperhelpAuthorCheckDocumentCommand"
 ]
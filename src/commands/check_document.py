@@ -0,0 +1,101 @@
+import sublime
+import sublime_plugin
+
+import os
+
+from hyperhelpcore.common import log, hh_syntax
+
+from ..document import HelpDocument
+from ..linter_base import LintResult
+from ..linter_support import can_lint_view, find_lint_target, format_lint
+
+
+###----------------------------------------------------------------------------
+
+
+# The selectors that the headless tokenizer needs to agree with the syntax on.
+_selectors = ["meta.anchor", "meta.link"]
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorCheckDocumentCommand(sublime_plugin.WindowCommand):
+    """
+    Verify that the headless HelpDocument tokenizer used by the linter finds
+    the same anchors and links as the HyperHelp-Help syntax does. This checks
+    the conformance corpus that ships with the package as well as every help
+    file in the package that the current view belongs to, and displays any
+    differences as lint output.
+    """
+    def run(self):
+        target = find_lint_target(self.window.active_view())
+        if target is None:
+            return
+
+        sources = []
+        for res in sublime.find_resources("conformance.txt"):
+            if res.startswith("Packages/HyperHelpAuthor/"):
+                sources.append((res, sublime.load_resource(res)))
+
+        spp = sublime.packages_path()
+        for file in sorted(target.pkg_info.help_files):
+            doc = HelpDocument.from_file(
+                os.path.join(spp, target.pkg_info.doc_root, file))
+            if doc is not None:
+                sources.append((file, doc.content))
+
+        issues = []
+        for name, content in sources:
+            issues.extend(self.check(name, content))
+
+        log("Checked lint tokenizer against %d file(s)", len(sources),
+            status=True)
+
+        format_lint(target, issues, self.window)
+
+    def is_enabled(self):
+        return can_lint_view(self.window.active_view())
+
+    def check(self, name, content):
+        """
+        Compare the tokenizer against the syntax for the given content and
+        return a list of LintResult entries for every difference found.
+        """
+        doc = HelpDocument(content, name)
+        view = self.syntax_view(doc.content)
+
+        issues = []
+        for selector in _selectors:
+            expected = {(r.a, r.b) for r in view.find_by_selector(selector)}
+            actual = {(r.a, r.b) for r in doc.find_by_selector(selector)}
+
+            for a, b in sorted(expected - actual):
+                issues.append(self.issue(doc, "error", a, b,
+                              "tokenizer missed '%s'" % selector))
+
+            for a, b in sorted(actual - expected):
+                issues.append(self.issue(doc, "error", a, b,
+                              "tokenizer found extra '%s'" % selector))
+
+        return issues
+
+    def issue(self, doc, m_type, a, b, msg):
+        row, col = doc.rowcol(a)
+        return LintResult(m_type, doc.file_name, row + 1, col + 1,
+                          "%s ('%s')" % (msg, doc.content[a:b]))
+
+    def syntax_view(self, content):
+        """
+        Load the given content into a hidden panel with the help syntax
+        applied so that it gets tokenized by Sublime.
+        """
+        view = self.window.create_output_panel("_hha_tmp", True)
+        view.run_command("select_all")
+        view.run_command("left_delete")
+        view.run_command("append", {"characters": content})
+        view.assign_syntax(hh_syntax("HyperHelp-Help.sublime-syntax"))
+        return view
+
+
+###----------------------------------------------------------------------------
@@ -3,11 +3,13 @@ import sublime_plugin
 
 import datetime
 import codecs
-import re
 
 from hyperhelpcore.core import help_index_list
 from hyperhelpcore.common import log
-from ..common import format_template
+from ..common import format_template, package_for_view
+from ..document import HelpDocument
+from ..resource_inventory import resource_inventory
+from ..header_dates import header_date_re
 
 
 ###----------------------------------------------------------------------------
@@ -19,10 +21,6 @@ from ..common import format_template
 # work with local files and match them to resources.
 
 
-# Match a help header line focusing on the date field.
-header_date_re = re.compile(r'^(%hyperhelp.*\bdate=")(\d{4}-\d{2}-\d{2})(".*)')
-
-
 ###----------------------------------------------------------------------------
 
 
@@ -41,10 +39,7 @@ def global_package_list(filter_with_help=True):
 
     The list is yielded in package load order.
     """
-    pkg_set = set()
-    for res in sublime.find_resources(''):
-        if res.startswith("Packages/"):
-            pkg_set.add(res.split("/")[1])
+    pkg_set = resource_inventory.packages()
 
     if filter_with_help:
         pkg_set -= set([pkg.package for pkg in help_index_list().values()])
@@ -110,4 +105,27 @@ def make_root_help(package, help_path):
         handle.write(template)
 
 
+def topic_at_point(view, point):
+    """
+    Return a tuple of the package and topic of the anchor or link that
+    contains the given point in the provided help file view, or None if there
+    isn't one. For a link, this is the topic that the link links to.
+    """
+    pkg_info = package_for_view(view)
+    if pkg_info is None:
+        return None
+
+    scan = HelpDocument.from_view(view).scan()
+    for anchor in scan.anchors:
+        if anchor.point - 1 <= point <= anchor.point + len(anchor.body) + 1:
+            return (pkg_info.package, anchor.topic)
+
+    for link in scan.links:
+        if link.point - 1 <= point <= link.point + len(link.body) + 1:
+            if link.topic is not None:
+                return (link.pkg or pkg_info.package, link.topic)
+
+    return None
+
+
 ###----------------------------------------------------------------------------
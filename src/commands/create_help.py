@@ -10,6 +10,7 @@ from hyperhelpcore.core import help_index_list
 from ..common import format_template
 from ..common import local_help_filename
 from ..common import apply_authoring_settings
+from ..resource_inventory import resource_inventory
 
 
 ###----------------------------------------------------------------------------
@@ -50,6 +51,7 @@ class HyperhelpAuthorCreateHelpCommand(sublime_plugin.WindowCommand):
         help_file = os.path.split(local_path)
 
         os.makedirs(help_file[0], exist_ok=True)
+        resource_inventory.invalidate(package)
 
         view = self.window.new_file()
         view.settings().set("_hh_auth", True)
@@ -11,6 +11,7 @@ from hyperhelpcore.common import log
 from hyperhelpcore.core import help_index_list, load_help_index
 
 from ..common import format_template
+from ..resource_inventory import resource_inventory
 
 
 ###----------------------------------------------------------------------------
@@ -82,6 +83,7 @@ class HyperhelpAuthorCreateIndexCommand(sublime_plugin.WindowCommand):
                 os.makedirs(root_path, exist_ok=True)
                 make_help_index(package, doc_root, index_path)
                 make_root_help(package, help_path)
+                resource_inventory.invalidate(package)
 
                 res = posixpath.join("Packages", package, doc_root, "hyperhelp.json")
                 new_pkg_info = load_help_index(res)
@@ -0,0 +1,35 @@
+import sublime
+import sublime_plugin
+
+from ..linter_support import lint_fold_at, lint_fold_count, expand_lint_fold
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorExpandLintCommand(sublime_plugin.TextCommand):
+    """
+    In lint output, replace the fold line at the given point (or under any of
+    the carets, if no point is given) with the lint issues that it stands in
+    for. With all set, every fold line in the output is expanded.
+    """
+    def run(self, edit, point=None, all=False):
+        if all:
+            indexes = set(range(lint_fold_count(self.view)))
+        else:
+            points = [point] if point is not None else [
+                sel.b for sel in self.view.sel()]
+            indexes = {lint_fold_at(self.view, pt) for pt in points} - {None}
+
+        # Expand from the bottom up, so that the earlier folds stay put.
+        for index in sorted(indexes, reverse=True):
+            expand_lint_fold(self.view, edit, index)
+
+    def is_enabled(self, point=None, all=False):
+        return lint_fold_count(self.view) > 0
+
+    def is_visible(self, point=None, all=False):
+        return self.is_enabled(point, all)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,54 @@
+import sublime
+import sublime_plugin
+
+from hyperhelpcore.common import log
+from hyperhelpcore.core import help_index_list
+
+from ..common import open_local_help, hha_setting
+from ..topic_finder import topic_finder
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorFindTopicCommand(sublime_plugin.WindowCommand):
+    """
+    Find a topic, alias or caption across every loaded help package with a
+    fuzzy search and open the help file that defines it for editing, with the
+    cursor on its anchor. If no query is given, the user is prompted for one;
+    the best matches for it are then offered in a quick panel.
+    """
+    last_query = ""
+
+    def run(self, query=None):
+        if query is None:
+            return self.window.show_input_panel(
+                "Find help topic:", HyperhelpAuthorFindTopicCommand.last_query,
+                lambda query: self.run(query), None, None)
+
+        HyperhelpAuthorFindTopicCommand.last_query = query
+
+        index_list = help_index_list()
+        results = topic_finder(index_list).search(
+            query, hha_setting("topic_finder_limit"))
+        if not results:
+            return log("No help topics match '%s'", query, status=True)
+
+        def pick(index):
+            if index >= 0:
+                found = results[index]
+                pkg_info = index_list.get(found.package)
+                if pkg_info is not None:
+                    open_local_help(pkg_info, found.file, window=self.window,
+                                    topic=found.alias_of or found.topic)
+
+        if len(results) == 1:
+            return pick(0)
+
+        items = [[found.topic, "%s: %s" % (found.package,
+                                           found.caption or found.file)]
+                 for found in results]
+        self.window.show_quick_panel(items, pick)
+
+
+###----------------------------------------------------------------------------
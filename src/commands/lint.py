@@ -1,48 +1,130 @@
 import sublime
 import sublime_plugin
 
-import os
+import time
 
 from hyperhelpcore.common import log
 
+from ..common import hha_setting
+from ..lint_cache import lint_cache
+from ..lint_profile import LintProfile, save_lint_profile
 from ..linter_support import can_lint_view, find_lint_target, get_linters
-from ..linter_support import get_lint_file, format_lint
+from ..linter_support import lint_target, collect_lint, LintOutput
+from ..linter_support import close_lint_output
 
 
 ###----------------------------------------------------------------------------
 
 
 class HyperhelpAuthorLintCommand(sublime_plugin.WindowCommand):
+    """
+    Lint the help file or help package associated with the current view. The
+    lint runs in the background, with the results for each file being added to
+    the lint output as they become available.
+
+    Starting a lint while another is still running cancels the earlier one,
+    including a lint of a different kind, since they share the lint output.
+    """
     def run(self):
         # The command can trigger from a build system, so don't execute if the
         # build is triggered from the help view; is_enabled() is not invoked
         # for build targets.
-        target = find_lint_target(self.window.active_view())
+        source = self.window.active_view()
+        target = find_lint_target(source)
         if target is None:
             return
 
-        linters = get_linters(target)
+        close_lint_output()
+        output = LintOutput(self.window, target)
 
-        spp = sublime.packages_path()
-        doc_root = target.pkg_info.doc_root
+        sublime.set_timeout_async(lambda: self.lint(target, output, source))
 
-        for file in target.files:
-            view = get_lint_file(os.path.join(spp, doc_root, file))
-            if view is not None:
-                for linter in linters:
-                    linter.lint(view, file)
+    def is_enabled(self):
+        return can_lint_view(self.window.active_view())
+
+    def lint(self, target, output, source):
+        """
+        Perform the lint of the given target, sending results to the provided
+        output and progress to the status bar of the source view. This runs
+        in the background.
+        """
+        if output.closed:
+            return
 
-            else:
-                log("Unable to lint '%s' in '%s'", file, target.pkg_info.package)
+        profile = LintProfile(target) if hha_setting("lint_profile") else None
+        linters = get_linters(target, profile=profile)
+        progress = LintProgress(source, target)
 
-        issues = list()
-        for linter in linters:
-            issues += linter.results()
+        def file_done(file, shard, facts):
+            if output.closed:
+                return False
 
-        format_lint(target, issues, self.window)
+            output.add_file(file, [issue for linter in shard
+                                   for issue in linter.results()])
+            progress.step()
 
-    def is_enabled(self):
-        return can_lint_view(self.window.active_view())
+        finished = False
+        try:
+            finished = lint_target(
+                target, linters,
+                workers=hha_setting("lint_workers"),
+                chunk_size=hha_setting("lint_chunk_size"),
+                cache=lint_cache if hha_setting("lint_cache") else None,
+                progress=file_done,
+                profile=profile)
+
+            if finished:
+                issues = collect_lint(linters, profile)
+                if profile is not None:
+                    profile.finish()
+                    save_lint_profile(profile)
+
+                output.finish(issues, profile)
+
+        finally:
+            progress.done(not finished)
+
+
+###----------------------------------------------------------------------------
+
+
+class LintProgress():
+    """
+    Show the progress of a lint in the status bar of the provided view,
+    including an estimate of how long the rest of the lint will take.
+    """
+    key = "hha_lint"
+    interval = 0.1
+
+    def __init__(self, view, target):
+        self.view = view
+        self.package = target.pkg_info.package
+        self.total = len(target.files)
+        self.count = 0
+        self.start = time.time()
+        self.shown = 0
+
+    def step(self):
+        self.count += 1
+
+        now = time.time()
+        if now - self.shown < self.interval and self.count < self.total:
+            return
+
+        self.shown = now
+        elapsed = now - self.start
+        eta = elapsed / self.count * (self.total - self.count)
+
+        self.view.set_status(self.key, "Linting %s: %d/%d files (ETA %ds)" % (
+            self.package, self.count, self.total, round(eta)))
+
+    def done(self, cancelled):
+        self.view.erase_status(self.key)
+        if cancelled:
+            log("Lint of '%s' cancelled", self.package, status=True)
+        else:
+            log("Linted %d file(s) in '%s' in %.2fs", self.count,
+                self.package, time.time() - self.start, status=True)
 
 
 ###----------------------------------------------------------------------------
@@ -0,0 +1,114 @@
+import sublime
+import sublime_plugin
+
+import time
+
+from hyperhelpcore.common import log
+
+from ..common import hha_setting
+from ..lint_cache import lint_cache
+from ..lint_profile import save_lint_profile
+from ..linter_support import lint_all_targets, lint_packages, LintAllOutput
+from ..linter_support import close_lint_output
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorLintAllCommand(sublime_plugin.WindowCommand):
+    """
+    Lint every loaded help package in one run, so that links between packages
+    that no longer resolve are found. Packages are linted in the background,
+    several at a time, and the results for each package are added to the lint
+    output as it finishes.
+
+    Starting a lint while another is still running cancels the earlier one,
+    including a lint of a different kind, since they share the lint output.
+    """
+    def run(self):
+        target, targets = lint_all_targets()
+        if not targets:
+            return log("There are no help packages to lint", status=True)
+
+        close_lint_output()
+        output = LintAllOutput(self.window, target)
+
+        source = self.window.active_view()
+        sublime.set_timeout_async(lambda: self.lint(targets, output, source))
+
+    def lint(self, targets, output, source):
+        """
+        Perform the lint of the given package targets, sending results to the
+        provided output and progress to the status bar of the source view.
+        This runs in the background.
+        """
+        if output.closed:
+            return
+
+        status = LintAllProgress(source, len(targets))
+
+        def package_done(target, issues, profile):
+            if output.closed:
+                return False
+
+            output.add_package(target, [issue for name, linter_issues in issues
+                                        for issue in linter_issues])
+            status.step(target.pkg_info.package)
+
+        results = None
+        try:
+            results = lint_packages(
+                targets,
+                jobs=hha_setting("lint_package_jobs"),
+                workers=hha_setting("lint_workers"),
+                chunk_size=hha_setting("lint_chunk_size"),
+                cache=lint_cache if hha_setting("lint_cache") else None,
+                progress=package_done,
+                profile=hha_setting("lint_profile"))
+
+            if results is not None:
+                profiles = [profile for target, issues, profile in results
+                            if profile is not None]
+                for profile in profiles:
+                    save_lint_profile(profile)
+
+                output.finish(profile=profiles)
+
+        finally:
+            status.done(results is None)
+
+
+###----------------------------------------------------------------------------
+
+
+class LintAllProgress():
+    """
+    Show the progress of a lint of all help packages in the status bar of the
+    provided view.
+    """
+    key = "hha_lint"
+
+    def __init__(self, view, total):
+        self.view = view
+        self.total = total
+        self.count = 0
+        self.start = time.time()
+
+    def step(self, package):
+        self.count += 1
+        if self.view is not None:
+            self.view.set_status(self.key, "Linting all help: %d/%d packages "
+                                 "(%s)" % (self.count, self.total, package))
+
+    def done(self, cancelled):
+        if self.view is not None:
+            self.view.erase_status(self.key)
+
+        if cancelled:
+            log("Lint of all help packages cancelled", status=True)
+        else:
+            log("Linted %d help package(s) in %.2fs", self.count,
+                time.time() - self.start, status=True)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,66 @@
+import sublime
+import sublime_plugin
+
+from hyperhelpcore.common import log
+from hyperhelpcore.core import help_index_list
+
+from ..common import is_authoring_source
+from ..index_snapshot import normalize_topic
+from ..refactor import plan_topic_move, confirm_refactor, apply_refactor
+from .common import topic_at_point
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorMoveTopicCommand(sublime_plugin.WindowCommand):
+    """
+    Move a topic in a help package to a different help file in the same
+    package; the section of the help file that the anchor for the topic
+    starts is moved to the end of the new file, and the help index is updated
+    to match, without opening any of the files, once the files to be changed
+    have been confirmed.
+
+    When no topic is given, the anchor or link under the cursor in the
+    current help file is used, and the user is prompted for the help file to
+    move it to if that's not given.
+    """
+    def run(self, package=None, topic=None, file=None):
+        if topic is None:
+            view = self.window.active_view()
+            target = None
+            if view is not None and is_authoring_source(view):
+                target = topic_at_point(view, view.sel()[0].b)
+
+            if target is None:
+                return log("The cursor is not on an anchor or a link",
+                           status=True)
+
+            package, topic = target
+
+        index_list = help_index_list()
+        pkg_info = index_list.get(package)
+        if pkg_info is None:
+            return log("Cannot move topic; package '%s' unknown", package,
+                       dialog=True)
+
+        if file is None:
+            entry = pkg_info.help_topics.get(normalize_topic(topic), {})
+            items = [[name, pkg_info.help_files[name]]
+                     for name in sorted(pkg_info.help_files)
+                     if name != entry.get("file")]
+
+            return self.window.show_quick_panel(
+                items, lambda index: index >= 0 and self.run(
+                    package, topic, items[index][0]))
+
+        plan = plan_topic_move(index_list, pkg_info, topic, file)
+        if plan is None or not confirm_refactor(
+                plan, "Move topic '%s' to '%s'" % (topic, file), "Move"):
+            return
+
+        apply_refactor(plan)
+        log("Moved topic '%s' to '%s'", topic, file, status=True)
+
+
+###----------------------------------------------------------------------------
@@ -1,10 +1,10 @@
 import sublime
 import sublime_plugin
 
-import os
-
 from hyperhelpcore.common import log
-from hyperhelpcore.core import help_index_list
+
+from ..common import reload_help_index, package_relative_path
+from ..inline_lint import refresh_inline_lint
 
 
 ###----------------------------------------------------------------------------
@@ -18,38 +18,25 @@ class HyperhelpAuthorReloadIndexCommand(sublime_plugin.TextCommand):
     This will work both for an index file that is directly contained within
     the Packages folder as well as for any file that is a symlink to a file
     in the Packages folder.
+
+    Only the saved index is loaded, even when it's for a package that has no
+    help index yet, and only the lint results that depend on the parts of the
+    index that changed are thrown away.
     """
     def run(self, edit):
-        filename = self.filename()
+        filename = package_relative_path(self.view.file_name())
         if filename is None:
             return log("Cannot reload help index; not in package", status=True)
 
-        # Make the filename be relative to the Packages folder.
-        filename = os.path.relpath(filename, sublime.packages_path())
-        filename = os.path.join("Packages/", filename)
-
-        # Flip the help index structure so we can look up the package based on
-        # the index file instead of the other way around.
-        indexes = {value.index_file: key for key, value in help_index_list().items()}
+        res = "Packages/" + filename
 
-        # If this index is known, reload it's package; otherwise rescan all
-        # packages in order to bring this one in.
-        package = None if filename not in indexes else indexes[filename]
-
-        help_index_list(reload=True, package=package)
+        result = reload_help_index(res)
+        if result is not None:
+            refresh_inline_lint(result[1])
 
     def is_enabled(self):
         return (self.view.match_selector(0, "text.hyperhelp.index") and
                 self.view.file_name() is not None)
 
-    def filename(self):
-        filename = self.view.file_name()
-        if filename.startswith(sublime.packages_path()):
-            return filename
-
-        filename = os.path.realpath(filename)
-        if filename.startswith(sublime.packages_path()):
-            return filename
-
 
 ###----------------------------------------------------------------------------
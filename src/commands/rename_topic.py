@@ -0,0 +1,66 @@
+import sublime
+import sublime_plugin
+
+from hyperhelpcore.common import log
+from hyperhelpcore.core import help_index_list
+
+from ..common import is_authoring_source
+from ..refactor import plan_topic_rename, confirm_refactor, apply_refactor
+from .common import topic_at_point
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorRenameTopicCommand(sublime_plugin.WindowCommand):
+    """
+    Rename a topic in a help package; the anchor for it, the entries for it
+    in the help index and table of contents and every link to it in every
+    help package are all updated in one go, without opening any of the files,
+    once the files to be changed have been confirmed.
+
+    When no topic is given, the anchor or link under the cursor in the
+    current help file is used, and the user is prompted for the new name if
+    it's not given.
+    """
+    def run(self, package=None, topic=None, new_topic=None):
+        if topic is None:
+            view = self.window.active_view()
+            target = None
+            if view is not None and is_authoring_source(view):
+                target = topic_at_point(view, view.sel()[0].b)
+
+            if target is None:
+                return log("The cursor is not on an anchor or a link",
+                           status=True)
+
+            package, topic = target
+
+        if new_topic is None:
+            return self.window.show_input_panel(
+                "Rename topic '%s' to:" % topic, topic,
+                lambda new: self.run(package, topic, new), None, None)
+
+        index_list = help_index_list()
+        pkg_info = index_list.get(package)
+        if pkg_info is None:
+            return log("Cannot rename topic; package '%s' unknown", package,
+                       dialog=True)
+
+        plan = plan_topic_rename(index_list, pkg_info, topic, new_topic)
+        if plan is None or not confirm_refactor(
+                plan, "Rename topic '%s' to '%s'" % (topic, new_topic),
+                "Rename"):
+            return
+
+        count = apply_refactor(plan)
+        log("Renamed topic '%s' to '%s'; %d edit(s) in %d file(s)", topic,
+            new_topic, plan.sites, count, status=True)
+
+        if plan.skipped:
+            log("Links to '%s' in packed packages were not renamed: %s",
+                topic, ", ".join("%s/%s" % item for item in plan.skipped),
+                dialog=True)
+
+
+###----------------------------------------------------------------------------
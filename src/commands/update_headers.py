@@ -0,0 +1,60 @@
+import sublime
+import sublime_plugin
+
+from hyperhelpcore.common import log, help_package_prompt, current_help_package
+from hyperhelpcore.core import help_index_list
+
+from ..common import hha_setting, local_help_filename
+from ..header_dates import refresh_header_dates
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorUpdateHeadersCommand(sublime_plugin.WindowCommand):
+    """
+    Update the date in the header of every help file in a package whose
+    content has changed since the last time this was done, without opening
+    them. Changes are detected with the method given (or the one in the
+    settings); "manifest" compares the files against the state recorded by
+    the last run, while "git" uses the git working tree status.
+
+    If no package is given and one cannot be inferred from the current help
+    view, the user will be prompted to supply one.
+    """
+    def run(self, package=None, method=None, prompt=False):
+        package = package or current_help_package(window=self.window)
+        if package is None or prompt:
+            return help_package_prompt(
+                help_index_list(),
+                on_select=lambda p: self.run(p, method))
+
+        pkg_info = help_index_list().get(package, None)
+        if pkg_info is None:
+            return log("Cannot update headers; package '%s' unknown", package,
+                       dialog=True)
+
+        method = method or hha_setting("header_change_detection")
+
+        # Files with unsaved changes get their header updated when saved.
+        skip = {file for file in pkg_info.help_files
+                if self.is_dirty(local_help_filename(pkg_info, file))}
+
+        sublime.set_timeout_async(
+            lambda: self.update(pkg_info, method, skip))
+
+    def is_dirty(self, file_name):
+        view = self.window.find_open_file(file_name)
+        return view is not None and view.is_dirty()
+
+    def update(self, pkg_info, method, skip):
+        updated = refresh_header_dates(pkg_info, method, skip)
+        if updated is None:
+            return log("Unable to find changed help files in '%s' using %s",
+                       pkg_info.package, method, status=True)
+
+        log("Updated the header date of %d help file(s) in '%s'",
+            len(updated), pkg_info.package, status=True)
+
+
+###----------------------------------------------------------------------------
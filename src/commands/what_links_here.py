@@ -0,0 +1,59 @@
+import sublime
+import sublime_plugin
+
+from hyperhelpcore.common import log
+from hyperhelpcore.core import help_index_list
+
+from ..common import is_authoring_source, open_local_help
+from ..link_graph import links_to
+from .common import topic_at_point
+
+
+###----------------------------------------------------------------------------
+
+
+class HyperhelpAuthorWhatLinksHereCommand(sublime_plugin.TextCommand):
+    """
+    List every link in every loaded help package that resolves to the topic
+    under the cursor, which is either the topic of the anchor the cursor is
+    in or the topic that the link the cursor is in links to. Picking a link
+    from the list opens the file that it's in at the link.
+    """
+    def run(self, edit):
+        target = topic_at_point(self.view, self.view.sel()[0].b)
+        if target is None:
+            return log("The cursor is not on an anchor or a link", status=True)
+
+        package, topic = target
+        index_list = help_index_list()
+        pkg_info = index_list.get(package)
+        if pkg_info is None:
+            return log("Cannot find links; package '%s' unknown", package,
+                       status=True)
+
+        sites = links_to(index_list, package, topic)
+        if not sites:
+            return log("Nothing links to '%s:%s'", package, topic,
+                       status=True)
+
+        items = [["%s/%s:%d:%d" % (link_pkg, file, link.line, link.column),
+                  "%s:%s" % (link.pkg, link.topic) if link.pkg else link.topic]
+                 for link_pkg, file, link in sites]
+
+        def pick(index):
+            if index >= 0:
+                link_pkg, file, link = sites[index]
+                open_local_help(index_list[link_pkg], file,
+                                window=self.view.window(),
+                                position=(link.line, link.column))
+
+        self.view.window().show_quick_panel(items, pick)
+
+    def is_enabled(self):
+        return is_authoring_source(self.view)
+
+    def is_visible(self):
+        return self.is_enabled()
+
+
+###----------------------------------------------------------------------------
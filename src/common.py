@@ -5,7 +5,14 @@ import textwrap
 
 import hyperhelpcore
 from hyperhelpcore.common import log, hh_syntax
-from hyperhelpcore.core import help_index_list
+from hyperhelpcore.core import help_index_list, load_help_index
+from hyperhelpcore.core import reload_help_file
+
+from .resource_inventory import resource_inventory
+from .package_archive import read_packed_resource
+from .index_snapshot import doc_root_index, diff_help_index, normalize_topic
+from .document import load_help_document
+from .lint_cache import lint_cache, index_version
 
 
 ###----------------------------------------------------------------------------
@@ -15,25 +22,51 @@ def loaded():
     """
     Do package setup at package load time.
     """
+    load_settings()
+    hyperhelpcore.initialize()
+
+    prefs = sublime.load_settings("Preferences.sublime-settings")
+    prefs.add_on_change("HyperHelpAuthor",
+                        resource_inventory.preferences_changed)
+    resource_inventory.preferences_changed()
+
+
+def unloaded():
+    """
+    Do package cleanup at unload time.
+    """
+    prefs = sublime.load_settings("Preferences.sublime-settings")
+    prefs.clear_on_change("HyperHelpAuthor")
+
+
+def load_settings():
+    """
+    Load the package settings and set up their defaults.
+    """
     hha_setting.obj = sublime.load_settings("HyperHelpAuthor.sublime-settings")
     hha_setting.default = {
         "update_header_on_save": True,
+        "header_change_detection": "manifest",
         "reload_index_on_save": True,
+        "reload_help_on_save": True,
+        "reload_on_save_delay": 100,
         "lint_output_to_view": False,
+        "lint_workers": 1,
+        "lint_package_jobs": 4,
+        "lint_chunk_size": 25,
+        "lint_cache": True,
+        "lint_on_save": False,
+        "lint_on_save_delay": 250,
+        "lint_profile": False,
+        "lint_max_file_issues": 100,
+        "topic_completion_limit": 100,
+        "topic_finder_limit": 50,
         "author_view_settings": {
             "rulers": [80],
             "match_selection": True,
             "draw_indent_guides": True
         }
     }
-    hyperhelpcore.initialize()
-
-
-def unloaded():
-    """
-    Do package cleanup at unload time.
-    """
-    pass
 
 
 ###----------------------------------------------------------------------------
@@ -66,13 +99,28 @@ def package_for_view(view):
     This does not verify that the file is actually a part of the provided help
     package, only that it is in the document root for said package.
     """
-    if view.file_name() is not None:
+    file_name = package_relative_path(view.file_name())
+    if file_name is not None:
+        return doc_root_index(help_index_list()).package_for_path(file_name)
+
+    return None
+
+
+def package_relative_path(file_name):
+    """
+    Given the full path of a file, return its path relative to the Packages
+    folder, with posix separators. This is None if the file name is None or
+    the file is not inside of the Packages folder.
+
+    When the name is not inside of the Packages folder, its real path is
+    tried as well, so that a file that was opened through a symlink that
+    leads into the Packages folder is still found.
+    """
+    if file_name is not None:
         spp = sublime.packages_path()
-        if view.file_name().startswith(spp):
-            file_name = view.file_name()[len(spp)+1:]
-            for pkg_name, pkg_info in help_index_list().items():
-                if file_name.startswith(pkg_info.doc_root):
-                    return pkg_info
+        for name in (file_name, os.path.realpath(file_name)):
+            if name.startswith(spp + os.sep):
+                return name[len(spp)+1:].replace("\\", "/")
 
     return None
 
@@ -95,6 +143,69 @@ def local_help_index(pkg_info):
                             pkg_info.index_file[len("Packages/"):]))
 
 
+def reload_help_index(res):
+    """
+    Load the help index with the given resource name and put it in place of
+    the help index for its package (adding the package if it's new), without
+    rescanning any other package. Returns a tuple of the IndexChange that
+    describes what changed and the list of (package, file) tuples whose
+    cached lint results were thrown away as a result, or None if the index
+    could not be loaded.
+
+    The outcome is reported in the status bar.
+    """
+    return install_help_index(res, load_help_index(res))
+
+
+def install_help_index(res, new_info):
+    """
+    Put the provided help index, loaded from the given resource name (or None
+    if it could not be loaded), in place of the help index for its package
+    the way that reload_help_index() does, returning the same thing. Loading
+    the index can happen in any thread, but this has to be called in the main
+    thread.
+    """
+    if new_info is None:
+        log("Unable to reload help index '%s'", res, status=True)
+        return None
+
+    index_list = help_index_list()
+    old_version = index_version(index_list)
+
+    # An index that has moved within its package replaces the old one.
+    old_info = index_list.get(new_info.package)
+    index_list[new_info.package] = new_info
+
+    change = diff_help_index(old_info, new_info)
+    dropped = lint_cache.index_changed(change, old_version,
+                                       index_version(index_list))
+
+    if change.everything:
+        log("Loaded help index for '%s'", change.package, status=True)
+    else:
+        log("Reloaded help index for '%s'; %d topic(s) and %d file(s) "
+            "changed", change.package, len(change.topics), len(change.files),
+            status=True)
+
+    return (change, dropped)
+
+
+def reload_help_view(help_view, help_file):
+    """
+    Reload the help file displayed in the provided help view from disk,
+    keeping the viewport and the caret where they were. This has to be called
+    in the main thread.
+    """
+    viewport = help_view.viewport_position()
+    caret = help_view.sel()[0].b
+
+    if reload_help_file(help_index_list(), help_view):
+        help_view.sel().clear()
+        help_view.sel().add(sublime.Region(caret))
+        help_view.set_viewport_position(viewport, False)
+        log("Reloaded help file '%s'", help_file, status=True)
+
+
 def format_template(template, *args):
     """
     Given incoming text, remove all common indent, then strip away the leading
@@ -106,28 +217,71 @@ def format_template(template, *args):
     return textwrap.dedent(template % args).strip()
 
 
-def open_local_help(pkg_info, help_file, window=None):
+def open_local_help(pkg_info, help_file, window=None, topic=None,
+                    position=None):
     """
-    Attempt to open the provided help file locally for editing.
+    Attempt to open the provided help file locally for editing. Help files
+    that only exist in a packed package are opened read-only for inspection.
+
+    When a topic is given, the cursor is placed at the anchor for that topic
+    in the file, if it has one. Alternately, position can be a (line, column)
+    tuple (both 1 based) to place the cursor at.
     """
     window = window if window is not None else sublime.active_window()
     local_path = local_help_filename(pkg_info, help_file)
+    if position is None and topic is not None:
+        anchor = find_anchor(local_path, topic)
+        if anchor is not None:
+            position = (anchor.line, anchor.column)
 
     if not os.path.exists(local_path):
+        res = "Packages/%s/%s" % (pkg_info.doc_root.rstrip("/"), help_file)
+        view = open_packed_help(res, window)
+        if view is not None:
+            if position is not None:
+                point = view.text_point(position[0] - 1, position[1] - 1)
+                view.sel().clear()
+                view.sel().add(sublime.Region(point))
+                view.show_at_center(point)
+            return
+
         return log(format_template(
             """
             Specified help file does not exist; cannot open.
 
-            Note: HyperHelpAuthor can not currently open help
-            files from packed packages for editing.
+            Note: HyperHelpAuthor can not open help files from
+            packed packages for editing, only for viewing.
             """), dialog=True)
 
-    view = window.open_file(local_path)
+    if position is not None:
+        view = window.open_file("%s:%d:%d" % (local_path, position[0],
+                                              position[1]),
+                                sublime.ENCODED_POSITION)
+    else:
+        view = window.open_file(local_path)
+
     view.settings().set("_hh_auth", True)
     if not view.is_loading():
         apply_authoring_settings(view)
 
 
+def find_anchor(filename, topic):
+    """
+    Return the HelpAnchor for the given topic in the provided help file, or
+    None if the file can't be loaded or has no anchor for the topic.
+    """
+    document = load_help_document(filename)
+    if document is None:
+        return None
+
+    topic = normalize_topic(topic)
+    for anchor in document.scan().anchors:
+        if normalize_topic(anchor.topic) == topic:
+            return anchor
+
+    return None
+
+
 def open_help_index(pkg_info, window=None):
     """
     Attempt to open the provided help index file localy for editing.
@@ -149,6 +303,27 @@ def open_help_index(pkg_info, window=None):
     window.open_file(local_path)
 
 
+def open_packed_help(res, window=None):
+    """
+    Open the resource with the given name from the packed package that holds
+    it in a new read-only view, returning the view. None is returned if the
+    package is not packed or has no such resource.
+    """
+    content = read_packed_resource(res)
+    if content is None:
+        return None
+
+    window = window if window is not None else sublime.active_window()
+    view = window.new_file()
+    view.set_name("%s (packed)" % res[len("Packages/"):])
+    view.set_scratch(True)
+    view.assign_syntax(hh_syntax("HyperHelp-Help.sublime-syntax"))
+    view.run_command("append", {"characters": content.replace("\r\n", "\n")})
+    view.set_read_only(True)
+
+    return view
+
+
 def apply_authoring_settings(view):
     """
     Given a view, apply the appropriate settings to it to ensure that it is set
@@ -0,0 +1,339 @@
+import sublime
+
+import os
+import re
+import codecs
+from bisect import bisect_right
+from collections import namedtuple
+
+from hyperhelpcore.core import parse_help_header
+from hyperhelpcore.core import parse_anchor_body, parse_link_body
+
+from .package_archive import read_packed_resource
+
+
+###----------------------------------------------------------------------------
+
+
+# A span of text inside of a HelpDocument. This mirrors the parts of the API of
+# sublime.Region that the linters use, so that code which was written to work
+# against a view will work unchanged against a document.
+class HelpRegion(namedtuple("HelpRegion", ["a", "b"])):
+    __slots__ = ()
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+    def size(self):
+        return abs(self.b - self.a)
+
+    def empty(self):
+        return self.a == self.b
+
+
+# The facts about a help file that linters which work across files need; the
+# anchors and links in the file, parsed into their parts. These are small and
+# can be kept around (e.g. in the lint cache) long after the text is gone.
+LintFacts = namedtuple("LintFacts", ["anchors", "links"])
+
+# An anchor or link in a help file; line and column are 1 based, as in the
+# LintResult tuples produced by linters.
+AnchorFact = namedtuple("AnchorFact", ["topic", "text", "line", "column"])
+LinkFact = namedtuple("LinkFact", ["pkg", "topic", "text", "line", "column"])
+
+
+# The result of scanning a help file once, which is shared by all of the
+# linters that lint it. The header is the HeaderData for the file (or None if
+# it doesn't have one), and anchors and links are lists of the items below;
+# body is the raw text between the punctuation, point is the offset of the
+# start of the body in the document, and line and column are 1 based.
+DocumentScan = namedtuple("DocumentScan", ["header", "anchors", "links"])
+
+HelpAnchor = namedtuple("HelpAnchor", [
+    "topic", "text", "body", "point", "line", "column"
+])
+HelpLink = namedtuple("HelpLink", [
+    "pkg", "topic", "text", "body", "point", "line", "column"
+])
+
+
+# The scope selectors that linters use to find items in a help file, mapped to
+# the attribute in the HelpDocument that holds the regions for them.
+_selectors = {
+    "meta.anchor": "anchors",
+    "meta.link": "links",
+}
+
+
+# The header line that starts a help file; this only counts when it's the
+# very first thing in the file.
+_header_re = re.compile(r'%hyperhelp\b')
+
+# Lines that start or end a fenced code block; no markup is recognized in
+# such a block.
+_fence_re = re.compile(r'^\s*```')
+
+# The markup that can appear inline within a line of help text. The order here
+# is significant; hidden anchors must be tried before regular anchors and
+# links, and inline code and comments consume anything inside of them.
+_inline_re = re.compile(r'''
+      (?P<comment>  <\#)
+    | (?P<code>     `[^`\n]+`)
+    | \*\|(?P<hidden>[^|\n]+)\|\*
+    | \*(?P<anchor> [^\s*](?:[^*\n]*?[^\s*])?)\*
+    | \|(?P<link>   [^\s|](?:[^|\n]*?[^\s|])?)\|
+    ''', re.VERBOSE)
+
+# The end of a comment, which may be on a different line than the start.
+_comment_end_re = re.compile(r'\#>')
+
+
+###----------------------------------------------------------------------------
+
+
+def scan_help_text(content):
+    """
+    Tokenize the text of a help file, returning a tuple of (header, anchors,
+    links), where the header is the text of the help header line or None and
+    the other items are lists of HelpRegion instances that cover the body of
+    each anchor or link (i.e. without the surrounding punctuation).
+
+    The rules here follow those in the HyperHelp-Help syntax; anchors and links
+    can't span lines, can't start or end with whitespace and are not
+    recognized inside of comments or code.
+    """
+    header = None
+    anchors = []
+    links = []
+
+    if _header_re.match(content):
+        header = content.split("\n", 1)[0]
+
+    in_fence = False
+    in_comment = False
+    offset = 0
+    for line in content.splitlines(True):
+        l_start = offset
+        offset += len(line)
+
+        if l_start == 0 and header is not None:
+            continue
+
+        if not in_comment and _fence_re.match(line):
+            in_fence = not in_fence
+            continue
+
+        if in_fence:
+            continue
+
+        pos = 0
+        while pos < len(line):
+            if in_comment:
+                match = _comment_end_re.search(line, pos)
+                if match is None:
+                    break
+
+                in_comment = False
+                pos = match.end()
+                continue
+
+            match = _inline_re.search(line, pos)
+            if match is None:
+                break
+
+            pos = match.end()
+            if match.group("comment") is not None:
+                in_comment = True
+
+            elif match.group("hidden") is not None:
+                anchors.append(HelpRegion(l_start + match.start("hidden"),
+                                          l_start + match.end("hidden")))
+
+            elif match.group("anchor") is not None:
+                anchors.append(HelpRegion(l_start + match.start("anchor"),
+                                          l_start + match.end("anchor")))
+
+            elif match.group("link") is not None:
+                links.append(HelpRegion(l_start + match.start("link"),
+                                        l_start + match.end("link")))
+
+    return (header, anchors, links)
+
+
+###----------------------------------------------------------------------------
+
+
+class HelpDocument():
+    """
+    A headless model of a help source file. The text is tokenized once when
+    the document is created, pulling out the header, anchors and links in the
+    same way that the HyperHelp-Help syntax would scope them.
+
+    The subset of the sublime.View API that linters need is provided, so a
+    document can be passed to LinterBase.lint() in place of a view.
+    """
+    def __init__(self, content, file_name=None):
+        self.file_name = file_name
+        self.content = content.replace("\r\n", "\n")
+
+        self.header, self.anchors, self.links = scan_help_text(self.content)
+
+        self._lines = [0]
+        self._lines.extend(m.end() for m in re.finditer("\n", self.content))
+        self._scan = None
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Create a document from the contents of the file with the given name.
+        Returns None if the file can't be read.
+        """
+        try:
+            with codecs.open(filename, 'r', encoding='utf-8') as file:
+                return cls(file.read(), filename)
+        except:
+            return None
+
+    @classmethod
+    def from_view(cls, view):
+        """
+        Create a document from the current contents of the provided view,
+        which includes any unsaved changes.
+        """
+        return cls(view.substr(sublime.Region(0, view.size())),
+                   view.file_name())
+
+    def size(self):
+        return len(self.content)
+
+    def substr(self, region):
+        if isinstance(region, int):
+            return self.content[region:region + 1]
+
+        return self.content[region.begin():region.end()]
+
+    def rowcol(self, point):
+        row = bisect_right(self._lines, point) - 1
+        return (row, point - self._lines[row])
+
+    def line(self, point):
+        row = self.rowcol(point)[0]
+        end = self.content.find("\n", self._lines[row])
+        return HelpRegion(self._lines[row],
+                          len(self.content) if end < 0 else end)
+
+    def full_line(self, point):
+        row = self.rowcol(point)[0]
+        end = self.content.find("\n", self._lines[row])
+        return HelpRegion(self._lines[row],
+                          len(self.content) if end < 0 else end + 1)
+
+    def scan(self):
+        """
+        Return the DocumentScan for this document; the header, anchors and
+        links are parsed the first time this is called and then reused.
+        """
+        if self._scan is None:
+            anchors = []
+            for region in self.anchors:
+                body = self.substr(region)
+                topic, text = parse_anchor_body(body)
+                row, col = self.rowcol(region.begin())
+                anchors.append(HelpAnchor(topic, text, body, region.begin(),
+                                          row + 1, col + 1))
+
+            links = []
+            for region in self.links:
+                body = self.substr(region)
+                pkg, topic, text = parse_link_body(body)
+                row, col = self.rowcol(region.begin())
+                links.append(HelpLink(pkg, topic, text, body, region.begin(),
+                                      row + 1, col + 1))
+
+            header = parse_help_header(self.file_name,
+                                       self.substr(self.full_line(0)))
+
+            self._scan = DocumentScan(header, anchors, links)
+
+        return self._scan
+
+    def facts(self):
+        """
+        Return the LintFacts for this document.
+        """
+        scan = self.scan()
+        return LintFacts(
+            [AnchorFact(a.topic, a.text, a.line, a.column)
+             for a in scan.anchors],
+            [LinkFact(l.pkg, l.topic, l.text, l.line, l.column)
+             for l in scan.links])
+
+    def find_by_selector(self, selector):
+        attr = _selectors.get(selector, None)
+        if attr is None:
+            raise ValueError("HelpDocument can't match selector '%s'" % selector)
+
+        return list(getattr(self, attr))
+
+
+###----------------------------------------------------------------------------
+
+
+def read_help_file(filename):
+    """
+    Return the text of the help file with the provided file name. If the file
+    is currently open in a view, the contents of the view are used so that
+    unsaved changes will be seen; otherwise the file is read from disk.
+
+    Files in the Packages folder that don't exist on disk are read from the
+    packed package that contains them, if there is one.
+
+    Can return None if the file is not open and cannot be loaded.
+    """
+    for window in sublime.windows():
+        view = window.find_open_file(filename)
+        if view is not None:
+            return view.substr(sublime.Region(0, view.size()))
+
+    try:
+        with codecs.open(filename, 'r', encoding='utf-8') as file:
+            return file.read()
+    except:
+        pass
+
+    res = packed_resource_name(filename)
+    return read_packed_resource(res) if res is not None else None
+
+
+def packed_resource_name(filename):
+    """
+    Return the resource name for the provided file name if it is inside the
+    Packages folder (where a file from a packed package would be if it was
+    unpacked), or None if it is not.
+    """
+    spp = os.path.normpath(sublime.packages_path())
+    path = os.path.normpath(filename)
+    if not path.startswith(spp + os.sep):
+        return None
+
+    return "Packages/" + os.path.relpath(path, spp).replace(os.sep, "/")
+
+
+def load_help_document(filename):
+    """
+    Return a HelpDocument for the provided file name, using read_help_file()
+    to get at the content.
+
+    Can return None if the file is not open and cannot be loaded.
+    """
+    content = read_help_file(filename)
+    if content is not None:
+        return HelpDocument(content, filename)
+
+    return None
+
+
+###----------------------------------------------------------------------------
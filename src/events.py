@@ -1,7 +1,15 @@
 import sublime
 import sublime_plugin
 
+from hyperhelpcore.core import help_index_list
+
 from .common import hha_setting, is_authoring_source, apply_authoring_settings
+from .common import package_for_view
+from .inline_lint import queue_inline_lint, inline_lint_popup
+from .inline_lint import forget_inline_lint
+from .save_reload import queue_save_reload
+from .topic_completions import link_completions
+from .linter_support import lint_fold_at, forget_lint_folds
 
 
 ###----------------------------------------------------------------------------
@@ -33,9 +41,69 @@ class HyperhelpAuthorEventListener(sublime_plugin.EventListener):
             view.run_command("hyperhelp_author_update_header", {"quiet": True})
 
     def on_post_save(self, view):
-        if hha_setting("reload_index_on_save") and view.file_name() is not None:
-            if view.match_selector(0, "text.hyperhelp.index"):
-                view.run_command("hyperhelp_author_reload_index")
+        """
+        Queue up reloading the help index or the help file in the help view if
+        one of them was saved, and an inline lint if that's turned on.
+        """
+        queue_save_reload(view)
+
+        if hha_setting("lint_on_save") and is_authoring_source(view):
+            queue_inline_lint(view)
+
+    def on_hover(self, view, point, hover_zone):
+        """
+        Show the messages for any inline lint issues under the mouse.
+        """
+        if hover_zone == sublime.HOVER_TEXT:
+            inline_lint_popup(view, point)
+
+    def on_query_completions(self, view, prefix, locations):
+        """
+        Offer the topics and packages that could complete a link that is
+        being typed in a help file.
+        """
+        if not is_authoring_source(view) or len(locations) != 1:
+            return None
+
+        pkg_info = package_for_view(view)
+        if pkg_info is None:
+            return None
+
+        point = locations[0]
+        line = view.substr(sublime.Region(view.line(point).begin(), point))
+        result = link_completions(help_index_list(), pkg_info.package, line,
+                                  hha_setting("topic_completion_limit"))
+        if result is None:
+            return None
+
+        # Sublime only replaces the word before the cursor, which may be just
+        # the end of what was typed of the topic.
+        partial, completions = result
+        start = max(0, len(partial) - len(prefix))
+
+        return ([["%s\t%s" % (text[start:], desc), text[start:]]
+                 for text, desc in completions],
+                sublime.INHIBIT_WORD_COMPLETIONS)
+
+    def on_close(self, view):
+        forget_inline_lint(view)
+        forget_lint_folds(view)
+
+    def on_text_command(self, view, command, args):
+        """
+        Double clicking on a fold line in lint output expands it.
+        """
+        if command == "drag_select" and (args or {}).get("by") == "words":
+            event = args.get("event")
+            if (event is None or
+                    not view.match_selector(0, "text.authoring.lint")):
+                return None
+
+            point = view.window_to_text((event["x"], event["y"]))
+            if lint_fold_at(view, point) is not None:
+                return ("hyperhelp_author_expand_lint", {"point": point})
+
+        return None
 
     def on_load(self, view):
         """
@@ -0,0 +1,254 @@
+import sublime
+
+import os
+import re
+import json
+import hashlib
+import datetime
+import subprocess
+
+
+###----------------------------------------------------------------------------
+
+
+# Match a help header line focusing on the date field.
+header_date_re = re.compile(r'^(%hyperhelp.*\bdate=")(\d{4}-\d{2}-\d{2})(".*)')
+
+# How much of a help file to read at a time when hashing it.
+_chunk_size = 64 * 1024
+
+
+###----------------------------------------------------------------------------
+
+
+def _manifest_file():
+    return os.path.join(sublime.cache_path(), "HyperHelpAuthor",
+                        "header_manifest.json")
+
+
+def load_header_manifest():
+    """
+    Load the manifest of help file states that header dates were last
+    refreshed against. This is a dictionary keyed by package name, with a
+    dictionary for each that maps file names to [mtime, size, digest].
+    """
+    try:
+        with open(_manifest_file(), "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_header_manifest(manifest):
+    """
+    Save the provided header manifest to the cache folder.
+    """
+    try:
+        os.makedirs(os.path.dirname(_manifest_file()), exist_ok=True)
+        with open(_manifest_file(), "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=1, sort_keys=True)
+    except OSError:
+        pass
+
+
+def body_digest(path):
+    """
+    Return a digest of everything in the given file after the first line,
+    reading it in chunks. The header is left out so that updating the date
+    in it doesn't count as a change.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        handle.readline()
+        for chunk in iter(lambda: handle.read(_chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def file_state(path):
+    """
+    Return the [mtime, size, digest] manifest entry for the given file.
+    """
+    info = os.stat(path)
+    return [info.st_mtime, info.st_size, body_digest(path)]
+
+
+def _current_state(path, entry, updated):
+    """
+    Return the manifest entry for the given file, reusing the provided old
+    entry when the file has not been touched since it was made. A file that
+    only had its header updated keeps its old digest.
+    """
+    info = os.stat(path)
+    if entry is not None:
+        if updated or [info.st_mtime, info.st_size] == entry[:2]:
+            return [info.st_mtime, info.st_size, entry[2]]
+
+    return [info.st_mtime, info.st_size, body_digest(path)]
+
+
+###----------------------------------------------------------------------------
+
+
+def manifest_changes(pkg_info, files, manifest):
+    """
+    Return the list of the given help files (full paths, keyed by help file
+    name in the provided dictionary) in the given package whose content has
+    changed since the header manifest was recorded. The modification time and
+    size are checked first, and only files where one of those differs are
+    hashed to see if their content actually changed.
+
+    A package that is not in the manifest yet has no changed files; this run
+    just records the baseline.
+    """
+    entries = manifest.get(pkg_info.package)
+    if entries is None:
+        return []
+
+    changed = []
+    for file, path in files.items():
+        entry = entries.get(file)
+        if entry is None:
+            changed.append(file)
+            continue
+
+        info = os.stat(path)
+        if [info.st_mtime, info.st_size] == entry[:2]:
+            continue
+
+        if body_digest(path) != entry[2]:
+            changed.append(file)
+
+    return changed
+
+
+def git_changes(pkg_info, files):
+    """
+    Return the list of the given help files (full paths, keyed by help file
+    name in the provided dictionary) that git reports as modified, added or
+    untracked in the working tree. Returns None if git can't be run or the
+    files are not in a git repository.
+    """
+    if not files:
+        return []
+
+    folder = os.path.dirname(next(iter(files.values())))
+    try:
+        output = subprocess.check_output(
+            ["git", "status", "--porcelain", "-z", "--untracked-files=all",
+             "--", "."],
+            cwd=folder, stderr=subprocess.DEVNULL)
+        root = subprocess.check_output(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=folder, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    root = root.decode("utf-8").strip()
+    paths = {os.path.normcase(os.path.realpath(path)): file
+             for file, path in files.items()}
+
+    changed = []
+    entries = output.decode("utf-8").split("\0")
+    index = 0
+    while index < len(entries):
+        entry = entries[index]
+        index += 1
+        if len(entry) < 4:
+            continue
+
+        status, name = entry[:2], entry[3:]
+        # Renames and copies are followed by the name they came from.
+        if "R" in status or "C" in status:
+            index += 1
+
+        if "D" in status:
+            continue
+
+        path = os.path.normcase(os.path.realpath(os.path.join(root, name)))
+        if path in paths:
+            changed.append(paths[path])
+
+    return changed
+
+
+###----------------------------------------------------------------------------
+
+
+def update_header_date(path, date):
+    """
+    Update the date in the help header on the first line of the given file to
+    the given YYYY-MM-DD date, returning True if the file was changed. The
+    new date is always the same length as the old one, so only the first line
+    is read and rewritten in place.
+    """
+    with open(path, "r+b") as handle:
+        first = handle.readline()
+        try:
+            line = first.decode("utf-8")
+        except UnicodeDecodeError:
+            return False
+
+        ending = line[len(line.rstrip("\r\n")):]
+        match = header_date_re.match(line[:len(line) - len(ending)])
+        if match is None or match.group(2) == date:
+            return False
+
+        new_first = (match.expand(r'\g<1>%s\g<3>' % date) +
+                     ending).encode("utf-8")
+        if len(new_first) != len(first):
+            return False
+
+        handle.seek(0)
+        handle.write(new_first)
+        return True
+
+
+def refresh_header_dates(pkg_info, method="manifest", skip=None):
+    """
+    Update the header date to today in every help file in the given package
+    whose content has changed, as detected by the given method; "manifest"
+    compares against the header manifest in the cache folder and "git" uses
+    the git working tree status. Help files whose names are in skip (such as
+    ones with unsaved changes in a view) are left alone.
+
+    Only help files that are stored unpacked in the Packages folder can be
+    updated. The manifest is updated for every other file in the package
+    either way, so that it's the baseline for the next refresh; skipped files
+    keep their old entry, so that they're still seen as changed next time.
+
+    Returns the list of files that were updated, or None if the changes could
+    not be detected.
+    """
+    root = os.path.join(sublime.packages_path(), pkg_info.doc_root)
+    files = {file: os.path.join(root, file) for file in pkg_info.help_files
+             if os.path.isfile(os.path.join(root, file))}
+
+    manifest = load_header_manifest()
+    if method == "git":
+        changed = git_changes(pkg_info, files)
+    else:
+        changed = manifest_changes(pkg_info, files, manifest)
+
+    if changed is None:
+        return None
+
+    date = datetime.date.today().strftime("%Y-%m-%d")
+    skip = skip or ()
+
+    updated = [file for file in changed
+               if file not in skip and update_header_date(files[file], date)]
+
+    entries = manifest.get(pkg_info.package, {})
+    manifest[pkg_info.package] = {
+        file: (entries[file] if file in skip else
+               _current_state(path, entries.get(file), file in updated))
+        for file, path in files.items()
+        if file not in skip or file in entries}
+    save_header_manifest(manifest)
+
+    return updated
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,384 @@
+from types import MappingProxyType
+from collections import namedtuple
+
+
+###----------------------------------------------------------------------------
+
+
+def normalize_topic(topic):
+    """
+    Normalize a topic the same way that lookup_help_topic() does, so that it
+    can be used as a key in the maps of a help index.
+    """
+    return " ".join(topic.casefold().split())
+
+
+# The difference between two versions of the help index for a package. topics
+# is the set of normalized topics and aliases whose index entry was added,
+# removed or changed, and files is the set of help files that were added,
+# removed, retitled or gained or lost a topic. everything is True when the
+# index changed in a way that can affect any lookup in the package (such as
+# it being loaded for the first time or the document root moving).
+IndexChange = namedtuple("IndexChange", [
+    "package", "topics", "files", "everything"
+])
+
+
+# The result of walking the table of contents of a package. files is the set
+# of help files that the TOC mentions, cycles is a list of the topic paths
+# (each a tuple starting and ending with the same topic) where an entry is
+# nested inside of itself, and duplicates maps each topic that appears in
+# more than one place in the TOC to the number of times that it appears.
+TocWalk = namedtuple("TocWalk", ["files", "cycles", "duplicates"])
+
+
+def walk_toc(toc):
+    """
+    Walk the provided table of contents (the help_toc of a help index) and
+    return a TocWalk for it.
+
+    The walk uses an explicit stack rather than recursion, so there is no
+    limit on how deeply the TOC can be nested. An entry that is nested inside
+    of itself is recorded as a cycle and not descended into again, and an
+    entry that has already been walked (the same entry in two places) has its
+    children walked only once.
+    """
+    files = set()
+    cycles = []
+    counts = {}
+    walked = set()
+
+    path = []
+    ancestors = set()
+    stack = [(entry, False) for entry in reversed(toc)]
+    while stack:
+        entry, leaving = stack.pop()
+        topic = entry.get("topic")
+        if leaving:
+            ancestors.discard(path.pop())
+            continue
+
+        if topic in ancestors:
+            cycles.append(tuple(path[path.index(topic):]) + (topic,))
+            continue
+
+        counts[topic] = counts.get(topic, 0) + 1
+        if entry.get("file") is not None:
+            files.add(entry["file"])
+
+        if id(entry) in walked:
+            continue
+
+        walked.add(id(entry))
+        path.append(topic)
+        ancestors.add(topic)
+        stack.append((entry, True))
+        stack.extend((child, False)
+                     for child in reversed(entry.get("children") or []))
+
+    return TocWalk(frozenset(files), cycles,
+                   {topic: count for topic, count in counts.items()
+                    if count > 1})
+
+
+def diff_help_index(old, new):
+    """
+    Compare two versions of the help index for a package (either of which can
+    be None if the package had or has no index) and return an IndexChange
+    that describes what changed between them.
+    """
+    package = (new or old).package
+    if (old is None or new is None or old.doc_root != new.doc_root or
+            old.index_file != new.index_file):
+        return IndexChange(package, frozenset(), frozenset(), True)
+
+    topics = set()
+    files = set()
+
+    for key in set(old.help_topics) | set(new.help_topics):
+        old_entry = old.help_topics.get(key)
+        new_entry = new.help_topics.get(key)
+        if old_entry != new_entry:
+            topics.add(normalize_topic(key))
+            files.update(entry["file"] for entry in (old_entry, new_entry)
+                         if entry is not None)
+
+    for alias in set(old.help_aliases) | set(new.help_aliases):
+        if old.help_aliases.get(alias) != new.help_aliases.get(alias):
+            topics.add(normalize_topic(alias))
+
+    # Lookups through an alias change when the topic it names does.
+    for alias, topic in new.help_aliases.items():
+        if normalize_topic(topic) in topics:
+            topics.add(normalize_topic(alias))
+
+    for file in set(old.help_files) | set(new.help_files):
+        if old.help_files.get(file) != new.help_files.get(file):
+            files.add(file)
+
+    return IndexChange(package, frozenset(topics), frozenset(files), False)
+
+
+###----------------------------------------------------------------------------
+
+
+class PackageIndex():
+    """
+    Read-only lookup tables for the help index of a single package:
+
+        files   - help file name to the frozenset of topics in that file
+        topics  - topic to the index entry for that topic
+        aliases - alias to the topic that it is an alias for
+        folded  - normalized topic to a tuple of all of the index entries
+                  whose topic normalizes to it
+
+    The TocWalk of the table of contents is only worked out when it's first
+    asked for.
+    """
+    __slots__ = ("pkg_info", "files", "topics", "aliases", "folded", "_toc")
+
+    def __init__(self, pkg_info):
+        files = {}
+        folded = {}
+        for key, entry in pkg_info.help_topics.items():
+            files.setdefault(entry["file"], set()).add(entry["topic"])
+            folded.setdefault(normalize_topic(key), []).append(entry)
+
+        self.pkg_info = pkg_info
+        self.files = MappingProxyType(
+            {file: frozenset(topics) for file, topics in files.items()})
+        self.topics = MappingProxyType(dict(pkg_info.help_topics))
+        self.aliases = MappingProxyType(dict(pkg_info.help_aliases))
+        self.folded = MappingProxyType(
+            {topic: tuple(entries) for topic, entries in folded.items()})
+        self._toc = None
+
+    def toc(self):
+        """
+        Return the TocWalk for the table of contents of this package.
+        """
+        if self._toc is None:
+            self._toc = walk_toc(self.pkg_info.help_toc)
+
+        return self._toc
+
+    def file_topics(self, file_name):
+        """
+        Return the set of topics that the index says are in the given file.
+        """
+        return self.files.get(file_name, frozenset())
+
+    def lookup(self, topic):
+        """
+        Look up the given topic (or alias) in this package, returning the
+        index entry for it or None; this is the same as lookup_help_topic().
+        """
+        topic = normalize_topic(topic)
+        return self.topics.get(self.aliases.get(topic, None) or topic, None)
+
+
+###----------------------------------------------------------------------------
+
+
+class IndexSnapshot():
+    """
+    An immutable snapshot of the loaded help indexes, taken once per lint run
+    and shared between all of the linters in that run. The lookup tables for
+    each package are built the first time that package is asked for.
+
+    Snapshots pickle as just the help indexes they were taken from, so they're
+    cheap to hand to lint workers in other processes.
+    """
+    def __init__(self, index_list):
+        self._index_list = dict(index_list)
+        self._packages = {}
+        self._links = {}
+
+    def __reduce__(self):
+        return (self.__class__, (self._index_list,))
+
+    def inherit(self, other):
+        """
+        Copy the lookup tables and link resolutions from an older snapshot
+        that are still valid for this one; only those that involve a package
+        whose help index is different between the two are left behind.
+        """
+        changed = {package
+                   for package in set(self._index_list) | set(other._index_list)
+                   if self._index_list.get(package) is not
+                      other._index_list.get(package)}
+
+        for package, index in other._packages.items():
+            if package not in changed:
+                self._packages.setdefault(package, index)
+
+        for key, result in other._links.items():
+            if (key[1] or key[0]) not in changed:
+                self._links.setdefault(key, result)
+
+    def __contains__(self, package):
+        return package in self._index_list
+
+    def pkg_info(self, package):
+        """
+        Return the help index for the named package, or None if there is no
+        such package in the snapshot.
+        """
+        return self._index_list.get(package, None)
+
+    def package(self, pkg_info):
+        """
+        Return the PackageIndex for the given package, which can be either a
+        help index or the name of a package. None is returned if the package
+        is unknown.
+        """
+        if isinstance(pkg_info, str):
+            pkg_info = self._index_list.get(pkg_info, None)
+            if pkg_info is None:
+                return None
+
+        index = self._packages.get(pkg_info.package, None)
+        if index is None or index.pkg_info is not pkg_info:
+            index = PackageIndex(pkg_info)
+            self._packages[pkg_info.package] = index
+
+        return index
+
+    def prepare(self):
+        """
+        Build the lookup tables for every package in the snapshot up front,
+        for when most of them are going to be needed (as in a lint of all of
+        the help packages) and the snapshot is shared between threads.
+        """
+        for pkg_info in self._index_list.values():
+            self.package(pkg_info)
+
+    def lookup(self, pkg_info, topic):
+        """
+        Look up the given topic in the given package (a help index or the name
+        of a package), returning the index entry or None. This is a drop in
+        replacement for lookup_help_topic().
+        """
+        index = self.package(pkg_info)
+        return index.lookup(topic) if index is not None else None
+
+    def resolve(self, pkg_info, pkg, topic):
+        """
+        Resolve a link with the given package name (None for a link with no
+        package) and topic that appears in a help file in the given package,
+        returning a tuple of the help index for the package it links to and
+        the index entry for the topic. Either can be None if the package or
+        the topic is unknown.
+
+        Links to the same topic tend to appear many times in a package, so
+        the result is remembered for as long as the snapshot is in use. Links
+        that name their package resolve the same way no matter which package
+        they appear in, so those are shared between all packages.
+        """
+        key = (pkg_info.package if pkg is None else None, pkg, topic)
+        result = self._links.get(key)
+        if result is None:
+            link_pkg = pkg_info if pkg is None else self.pkg_info(pkg)
+            index_info = (self.lookup(link_pkg, topic)
+                          if link_pkg is not None else None)
+
+            result = self._links[key] = (link_pkg, index_info)
+
+        return result
+
+
+###----------------------------------------------------------------------------
+
+
+def index_snapshot(index_list):
+    """
+    Return an IndexSnapshot of the provided help index list. The last snapshot
+    taken is reused for as long as none of the help indexes in the list have
+    been added, removed or reloaded; when that happens, the new snapshot
+    inherits everything from the old one that does not involve the packages
+    whose indexes changed.
+    """
+    key = tuple(id(pkg_info) for pkg_info in index_list.values())
+    if index_snapshot.last is None or index_snapshot.last[0] != key:
+        snapshot = IndexSnapshot(index_list)
+        if index_snapshot.last is not None:
+            snapshot.inherit(index_snapshot.last[1])
+
+        index_snapshot.last = (key, snapshot)
+
+    return index_snapshot.last[1]
+
+index_snapshot.last = None
+
+
+###----------------------------------------------------------------------------
+
+
+class DocRootIndex():
+    """
+    Lookup tables for finding the help package that a file belongs to based
+    on its path relative to the Packages folder:
+
+        roots - document root to the help index for the package it belongs to
+        trie  - a tree of nested dictionaries keyed on the path components of
+                each document root; the node for a document root has the help
+                index stored under the key None
+
+    Lookups only depend on the depth of the path, not the number of packages.
+    """
+    __slots__ = ("roots", "trie")
+
+    def __init__(self, index_list):
+        self.roots = {}
+        self.trie = {}
+
+        for pkg_info in index_list.values():
+            doc_root = pkg_info.doc_root.strip("/")
+            self.roots.setdefault(doc_root, pkg_info)
+
+            node = self.trie
+            for part in doc_root.split("/"):
+                node = node.setdefault(part, {})
+            node.setdefault(None, pkg_info)
+
+    def package_for_root(self, doc_root):
+        """
+        Return the help index for the package whose document root is the
+        given path, or None if there isn't one.
+        """
+        return self.roots.get(doc_root.strip("/"))
+
+    def package_for_path(self, path):
+        """
+        Return the help index for the package whose document root contains
+        the given path, or None if there isn't one. When document roots are
+        nested, the deepest one wins.
+        """
+        found = None
+        node = self.trie
+        for part in path.strip("/").split("/"):
+            node = node.get(part)
+            if node is None:
+                break
+
+            found = node.get(None, found)
+
+        return found
+
+
+def doc_root_index(index_list):
+    """
+    Return a DocRootIndex for the provided help index list. The last one made
+    is reused for as long as none of the help indexes in the list have been
+    added, removed or reloaded.
+    """
+    key = tuple(id(pkg_info) for pkg_info in index_list.values())
+    if doc_root_index.last is None or doc_root_index.last[0] != key:
+        doc_root_index.last = (key, DocRootIndex(index_list))
+
+    return doc_root_index.last[1]
+
+doc_root_index.last = None
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,161 @@
+import sublime
+
+import os
+import html
+
+from .common import hha_setting
+from .lint_cache import lint_cache
+from .linter_support import lint_view, find_lint_target
+
+
+###----------------------------------------------------------------------------
+
+
+# The region keys, scopes and icons used to mark issues in a view, by type.
+_styles = {
+    "error": ("hha_lint_error", "invalid", "circle"),
+    "warning": ("hha_lint_warning", "invalid.deprecated", "dot"),
+    "info": ("hha_lint_info", "comment", "dot"),
+}
+
+# The status bar key for the issue counts; this is not the one the lint
+# commands report their progress under, so neither clears the other.
+_status_key = "hha_inline_lint"
+
+_flags = (sublime.DRAW_NO_FILL | sublime.DRAW_NO_OUTLINE |
+          sublime.DRAW_SQUIGGLY_UNDERLINE)
+
+# Views with a lint queued, mapped to the number of saves seen for the view;
+# only the most recent save in a burst of them triggers a lint.
+_queued = {}
+
+# The issues currently marked in views, as lists of (region, LintResult).
+_marked = {}
+
+
+###----------------------------------------------------------------------------
+
+
+def queue_inline_lint(view):
+    """
+    Queue an inline lint of the help file in the provided view, which happens
+    in the background after the lint_on_save_delay has elapsed. Saving again
+    before that restarts the delay, so bursts of saves cause only one lint.
+    """
+    view_id = view.id()
+    _queued[view_id] = _queued.get(view_id, 0) + 1
+    count = _queued[view_id]
+
+    sublime.set_timeout_async(lambda: _inline_lint(view, count),
+                              hha_setting("lint_on_save_delay"))
+
+
+def _inline_lint(view, count):
+    """
+    Perform a queued inline lint, unless another has been queued since.
+    """
+    if _queued.get(view.id()) != count:
+        return
+
+    del _queued[view.id()]
+    if not view.is_valid():
+        return
+
+    issues = lint_view(view, lint_cache if hha_setting("lint_cache") else None)
+    if issues is not None:
+        show_inline_lint(view, issues)
+
+
+def show_inline_lint(view, issues):
+    """
+    Mark the LintResult issues that are for the file in the given view as
+    regions in the view, replacing any issues that were marked previously.
+    """
+    clear_inline_lint(view)
+
+    file = os.path.basename(view.file_name())
+    regions = {issue_type: [] for issue_type in _styles}
+    marked = []
+
+    for issue in issues:
+        if issue.type not in _styles or issue.file != file:
+            continue
+
+        point = view.text_point(issue.line - 1, issue.column - 1)
+        region = view.extract_scope(point)
+        if region.empty() or len(view.lines(region)) > 1:
+            region = view.word(point)
+
+        regions[issue.type].append(region)
+        marked.append((region, issue))
+
+    for issue_type, (key, scope, icon) in _styles.items():
+        if regions[issue_type]:
+            view.add_regions(key, regions[issue_type], scope, icon, _flags)
+
+    _marked[view.id()] = marked
+
+    errors = len(regions["error"])
+    warnings = len(regions["warning"])
+    if errors or warnings:
+        view.set_status(_status_key, "Lint: %d error%s, %d warning%s" % (
+            errors, "" if errors == 1 else "s",
+            warnings, "" if warnings == 1 else "s"))
+
+
+def clear_inline_lint(view):
+    """
+    Remove any inline lint issues marked in the given view.
+    """
+    for key, scope, icon in _styles.values():
+        view.erase_regions(key)
+
+    view.erase_status(_status_key)
+    _marked.pop(view.id(), None)
+
+
+def inline_lint_popup(view, point):
+    """
+    If there are any inline lint issues marked at the given point in the view,
+    show a popup with their messages.
+    """
+    messages = [issue for region, issue in _marked.get(view.id(), [])
+                if region.contains(point)]
+    if not messages:
+        return
+
+    content = "<br>".join("<b>%s</b>: %s" % (issue.type,
+                                             html.escape(issue.message))
+                          for issue in messages)
+
+    view.show_popup(content, sublime.HIDE_ON_MOUSE_MOVE_AWAY, point,
+                    max_width=800)
+
+
+def refresh_inline_lint(files):
+    """
+    Queue an inline lint for every open view that has inline lint issues
+    marked and is for one of the help files in the provided list of
+    (package, file) tuples, since the issues may no longer be correct.
+    """
+    files = set(files)
+    for window in sublime.windows():
+        for view in window.views():
+            if view.id() not in _marked:
+                continue
+
+            target = find_lint_target(view)
+            if (target is not None and
+                    (target.pkg_info.package, target.files[0]) in files):
+                queue_inline_lint(view)
+
+
+def forget_inline_lint(view):
+    """
+    Forget about any issues marked in the given view; it is being closed.
+    """
+    _marked.pop(view.id(), None)
+    _queued.pop(view.id(), None)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,369 @@
+import sublime
+
+import os
+import json
+import threading
+from collections import namedtuple, deque
+
+from .index_snapshot import normalize_topic
+from .document import load_help_document
+from .package_archive import package_archives
+
+
+###----------------------------------------------------------------------------
+
+
+# A link in a help file. pkg and topic are what the link links to and line
+# and column are 1 based.
+LinkSite = namedtuple("LinkSite", ["pkg", "topic", "line", "column"])
+
+
+# Bumped whenever the format of a saved link graph changes; saved graphs with
+# a different version are thrown away.
+_graph_version = 3
+
+
+###----------------------------------------------------------------------------
+
+
+def file_links(facts):
+    """
+    Return a tuple of the LinkSite tuples for the links in a help file with
+    the provided LintFacts, in file order.
+    """
+    return tuple(LinkSite(link.pkg, link.topic, link.line, link.column)
+                 for link in facts.links if link.topic is not None)
+
+
+class LinkGraph():
+    """
+    The directed graph of the links between the help files of a single
+    package, built up from the LintFacts of its files and saved in the cache
+    folder (when there is one) so that it outlives the session.
+
+    Only the links of each file are stored; the edges are worked
+    out from those by resolving the links against the help index of the
+    package. The resolved edges of each file are kept until the file changes
+    or the help index is reloaded, so updating the graph for a changed file
+    costs only the links in that file.
+
+    The graph also keeps the [mtime, size] stamp of each file as it was when
+    its links were recorded (None when that's not known), and a reverse index
+    from the package and normalized topic that each link names to the places
+    that link to it.
+    """
+    def __init__(self, package, files=None, stamps=None):
+        self.package = package
+        self.files = dict(files or {})
+        self.stamps = dict(stamps or {})
+        self.dirty = False
+        self._pkg_info = None
+        self._edges = {}
+        self._targets = None
+
+    def update_file(self, file, facts, stamp=None):
+        """
+        Update the graph with the provided LintFacts for the given help file,
+        returning True if anything about the file changed. The stamp is the
+        [mtime, size] of the file the facts came from, if it's known.
+        """
+        links = file_links(facts)
+        if self.files.get(file) == links:
+            if stamp is not None and self.stamps.get(file) != stamp:
+                self.stamps[file] = stamp
+                self.dirty = True
+            return False
+
+        self._forget_targets(file)
+        self.files[file] = links
+        self.stamps[file] = stamp
+        self._edges.pop(file, None)
+        self._add_targets(file)
+        self.dirty = True
+        return True
+
+    def prune(self, help_files):
+        """
+        Drop the files that are no longer in the provided collection of help
+        files from the graph.
+        """
+        for file in [file for file in self.files if file not in help_files]:
+            self._forget_targets(file)
+            del self.files[file]
+            self.stamps.pop(file, None)
+            self._edges.pop(file, None)
+            self.dirty = True
+
+    def _add_targets(self, file):
+        if self._targets is None:
+            return
+
+        for link in self.files[file]:
+            key = (link.pkg or self.package, normalize_topic(link.topic))
+            self._targets.setdefault(key, {}).setdefault(file, []).append(link)
+
+    def _forget_targets(self, file):
+        if self._targets is None or file not in self.files:
+            return
+
+        for link in self.files[file]:
+            key = (link.pkg or self.package, normalize_topic(link.topic))
+            sites = self._targets.get(key)
+            if sites is not None:
+                sites.pop(file, None)
+                if not sites:
+                    del self._targets[key]
+
+    def link_sites(self, package, topic):
+        """
+        Return a list of (file, LinkSite) tuples for the links in this
+        package whose package and topic are the ones given, as written; no
+        aliases are followed. topic should be normalized.
+
+        The reverse index that this uses is built the first time it's needed
+        and then kept up to date as files are updated.
+        """
+        return [(file, link)
+                for file, links in self._target_index().get((package, topic),
+                                                            {}).items()
+                for link in links]
+
+    def _target_index(self):
+        if self._targets is None:
+            self._targets = {}
+            for file in self.files:
+                self._add_targets(file)
+
+        return self._targets
+
+    def covers(self, help_files):
+        """
+        Determine if the graph has an entry for every one of the provided
+        help files.
+        """
+        return all(file in self.files for file in help_files)
+
+    def edges(self, index, pkg_info, file):
+        """
+        Return a tuple of the help files that the links in the given file
+        link to, for the links that resolve to a topic in this package.
+        """
+        if self._pkg_info is not pkg_info:
+            self._pkg_info = pkg_info
+            self._edges = {}
+
+        edges = self._edges.get(file)
+        if edges is None:
+            edges = []
+            for link in self.files[file]:
+                link_pkg, entry = index.resolve(pkg_info, link.pkg, link.topic)
+                if (link_pkg is not None and
+                        link_pkg.package == pkg_info.package and
+                        entry is not None):
+                    edges.append(entry["file"])
+
+            edges = self._edges[file] = tuple(edges)
+
+        return edges
+
+    def file_graph(self, index, pkg_info):
+        """
+        Return the file level graph as a dictionary that maps each help file
+        to the set of other help files that it links to.
+        """
+        return {file: {target for target in self.edges(index, pkg_info, file)
+                       if target != file}
+                for file in self.files}
+
+    def linked_files(self, index, pkg_info):
+        """
+        Return the set of help files that are linked to from some other help
+        file in the package.
+        """
+        return {target for targets in self.file_graph(index, pkg_info).values()
+                for target in targets}
+
+    def reachable(self, index, pkg_info, roots):
+        """
+        Return the set of help files that can be reached by following links
+        from any of the provided root files, including the roots themselves.
+        This is a breadth first search, so it's linear in the size of the
+        graph.
+        """
+        graph = self.file_graph(index, pkg_info)
+        seen = set(roots)
+        queue = deque(seen)
+        while queue:
+            for target in graph.get(queue.popleft(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+
+        return seen
+
+
+def link_roots(pkg_info):
+    """
+    Return the set of help files in the given package that readers start
+    from; the index file and the files at the top level of the table of
+    contents.
+    """
+    return {"index.txt"} | {entry["file"] for entry in pkg_info.help_toc
+                            if entry.get("file") is not None}
+
+
+###----------------------------------------------------------------------------
+
+
+def _graph_file(package):
+    """
+    Return the name of the file that the LinkGraph for the given package is
+    saved in, or None if there is no cache folder to save it in, as when
+    linting from the command line without one.
+    """
+    cache = sublime.cache_path()
+    if not cache:
+        return None
+
+    return os.path.join(cache, "HyperHelpAuthor", "link_graph",
+                        "%s.json" % package)
+
+
+def load_link_graph(package):
+    """
+    Load the saved LinkGraph for the given package from the cache folder,
+    returning an empty graph if there isn't one or it can't be loaded.
+    """
+    graph_file = _graph_file(package)
+    if graph_file is None:
+        return LinkGraph(package)
+
+    try:
+        with open(graph_file, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+
+        if data.get("version") != _graph_version:
+            return LinkGraph(package)
+
+        return LinkGraph(package, {
+            file: tuple(LinkSite(*link) for link in links)
+            for file, links in data["files"].items()},
+            data["stamps"])
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return LinkGraph(package)
+
+
+def save_link_graph(graph):
+    """
+    Save the provided LinkGraph to the cache folder, if there is one and the
+    graph has changed since it was loaded or last saved.
+    """
+    graph_file = _graph_file(graph.package)
+    if not graph.dirty or graph_file is None:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(graph_file), exist_ok=True)
+        with open(graph_file, "w", encoding="utf-8") as handle:
+            json.dump({"version": _graph_version, "files": graph.files,
+                       "stamps": graph.stamps},
+                      handle, separators=(",", ":"))
+        graph.dirty = False
+    except OSError:
+        pass
+
+
+def link_graph(package):
+    """
+    Return the shared LinkGraph for the given package, loading it from the
+    cache folder the first time it's asked for.
+    """
+    with link_graph.lock:
+        graph = link_graph.graphs.get(package)
+        if graph is None:
+            graph = link_graph.graphs[package] = load_link_graph(package)
+
+    return graph
+
+link_graph.graphs = {}
+link_graph.lock = threading.Lock()
+
+
+def help_file_stamp(pkg_info, file):
+    """
+    Return the [mtime, size] stamp of the given help file in the given
+    package, or None if it's not stored unpacked in the Packages folder.
+    """
+    try:
+        info = os.stat(os.path.join(sublime.packages_path(),
+                                    pkg_info.doc_root, file))
+        return [info.st_mtime, info.st_size]
+    except OSError:
+        return None
+
+
+def refresh_link_graph(pkg_info):
+    """
+    Bring the LinkGraph for the given package up to date with its help files
+    without linting them, returning the graph. Only files that are not in the
+    graph yet or whose modification time or size has changed since they were
+    recorded are read and scanned; files in packed packages are only read if
+    the graph has never seen them.
+    """
+    graph = link_graph(pkg_info.package)
+    graph.prune(pkg_info.help_files)
+
+    root = os.path.join(sublime.packages_path(), pkg_info.doc_root)
+    with package_archives.session():
+        for file in pkg_info.help_files:
+            stamp = help_file_stamp(pkg_info, file)
+            if file in graph.files and (stamp is None or
+                                        graph.stamps.get(file) == stamp):
+                continue
+
+            document = load_help_document(os.path.join(root, file))
+            if document is not None:
+                graph.update_file(file, document.facts(), stamp)
+
+    save_link_graph(graph)
+    return graph
+
+
+def links_to(index_list, package, topic):
+    """
+    Return a list of (package, file, LinkSite) tuples for every link in every
+    help package in the provided help index list that resolves to the given
+    topic in the given package, either directly or through one of its
+    aliases. The list is in package, file and position order.
+
+    The graph of every package with help files is refreshed first, which
+    reads just the help files that have changed since they were recorded, so
+    that links added since the last lint are found.
+    """
+    pkg_info = index_list.get(package)
+    if pkg_info is None:
+        return []
+
+    key = normalize_topic(topic)
+    key = normalize_topic(pkg_info.help_aliases.get(key, None) or key)
+    names = {key} | {normalize_topic(alias)
+                     for alias, target in pkg_info.help_aliases.items()
+                     if normalize_topic(target) == key}
+
+    results = []
+    for link_package, link_pkg in sorted(index_list.items()):
+        if not link_pkg.help_files:
+            continue
+
+        graph = refresh_link_graph(link_pkg)
+
+        for name in names:
+            results.extend((link_pkg.package, file, link)
+                           for file, link in graph.link_sites(package, name))
+
+    results.sort(key=lambda r: (r[0], r[1], r[2].line, r[2].column))
+    return results
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,187 @@
+import json
+import hashlib
+from collections import namedtuple
+
+from .index_snapshot import normalize_topic
+
+
+###----------------------------------------------------------------------------
+
+
+# The cached result of linting a single help file. The linters are the
+# instances of the per-file linters that linted (only) this file, and facts is
+# the LintFacts extracted from it.
+LintCacheEntry = namedtuple("LintCacheEntry", [
+    "digest", "index_version", "linters", "facts"
+])
+
+
+###----------------------------------------------------------------------------
+
+
+def content_digest(content):
+    """
+    Return a digest that identifies the provided help file content.
+    """
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def index_version(index_list):
+    """
+    Return a digest that identifies the state of all of the loaded help
+    indexes in the provided index list. Lint results for a file can depend on
+    the index of any package that it links to, so any change to any index is a
+    change in version.
+
+    The digest for each package is remembered for as long as its help index is
+    loaded, so this is cheap unless indexes have been reloaded.
+    """
+    digests = []
+    for pkg_info in index_list.values():
+        cached = index_version.digests.get(pkg_info.package)
+        if cached is None or cached[0] is not pkg_info:
+            digest = hashlib.sha1(json.dumps(pkg_info, sort_keys=True,
+                                             default=str).encode("utf-8"))
+            cached = (pkg_info, digest.hexdigest())
+            index_version.digests[pkg_info.package] = cached
+
+        digests.append(cached[1])
+
+    return hashlib.sha1("".join(sorted(digests)).encode("utf-8")).hexdigest()
+
+index_version.digests = {}
+
+
+def linter_key(linter_class):
+    """
+    Return the key that identifies the results of the provided linter class
+    in a cache entry. Linters bump their version when their results change.
+    """
+    return (linter_class.__name__, linter_class.version)
+
+
+###----------------------------------------------------------------------------
+
+
+class LintCache():
+    """
+    A cache of the per-file lint results for help files, grouped by package.
+    Entries are only used when the content of the file, the version of the
+    help indexes and the versions of the linters all match what they were when
+    the entry was created.
+    """
+    def __init__(self):
+        self.packages = {}
+
+    def fetch(self, package, file, digest, version, classes):
+        """
+        Return the LintCacheEntry for the given file in the given package if
+        it is still valid for the provided content digest, index version and
+        list of linter classes, or None if there isn't one.
+        """
+        entry = self.packages.get(package, {}).get(file)
+        if (entry is None or entry.digest != digest or
+                entry.index_version != version or
+                entry.linters.keys() != {linter_key(c) for c in classes}):
+            return None
+
+        return entry
+
+    def store(self, package, file, digest, version, linters, facts):
+        """
+        Store the results of linting the given file in the given package.
+        """
+        linters = {linter_key(linter.__class__): linter for linter in linters}
+        self.packages.setdefault(package, {})[file] = LintCacheEntry(
+            digest, version, linters, facts)
+
+    def entry_linters(self, entry, classes):
+        """
+        Return the linters in the given cache entry in the same order as the
+        provided list of linter classes.
+        """
+        return [entry.linters[linter_key(c)] for c in classes]
+
+    def package_facts(self, package):
+        """
+        Return a dictionary of the cached LintFacts for all of the files of the
+        given package that are in the cache, keyed by file name. Facts depend
+        only on the content of a file, so they stay usable even when the help
+        index changes.
+        """
+        return {file: entry.facts
+                for file, entry in self.packages.get(package, {}).items()}
+
+    def index_changed(self, change, old_version, new_version):
+        """
+        Update the cache for a change to the help index of a single package,
+        as described by the provided IndexChange, which took the version of
+        the help indexes from old_version to new_version.
+
+        Only the entries for files whose results could be affected by the
+        change are thrown away; that's files in the package that are named
+        in the change or that contain an anchor or link for a changed topic,
+        and files in other packages with a link to a changed topic in the
+        package. Everything else that was valid for the old version is moved
+        to the new version, so it doesn't need to be linted again.
+
+        Returns a list of (package, file) tuples for the entries that were
+        thrown away.
+        """
+        dropped = []
+        for package, files in self.packages.items():
+            for file, entry in list(files.items()):
+                if entry.index_version != old_version:
+                    continue
+
+                if self._affected(change, package, file, entry.facts):
+                    del files[file]
+                    dropped.append((package, file))
+                else:
+                    files[file] = entry._replace(index_version=new_version)
+
+        return dropped
+
+    def _affected(self, change, package, file, facts):
+        """
+        Determine if the cached results for the given file, whose LintFacts
+        are provided, could be affected by the given IndexChange.
+        """
+        local = package == change.package
+        if local and (change.everything or file in change.files):
+            return True
+
+        if local and any(normalize_topic(anchor.topic) in change.topics
+                         for anchor in facts.anchors):
+            return True
+
+        for link in facts.links:
+            if link.topic is None:
+                continue
+
+            if (link.pkg or package) == change.package and (
+                    change.everything or
+                    normalize_topic(link.topic) in change.topics):
+                return True
+
+        return False
+
+    def clear(self, package=None):
+        """
+        Throw away the cached results for the given package, or for all
+        packages if no package is given.
+        """
+        if package is None:
+            self.packages.clear()
+        else:
+            self.packages.pop(package, None)
+
+
+###----------------------------------------------------------------------------
+
+
+# The lint cache used by lint commands.
+lint_cache = LintCache()
+
+
+###----------------------------------------------------------------------------
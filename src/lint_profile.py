@@ -0,0 +1,133 @@
+import sublime
+
+import os
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+###----------------------------------------------------------------------------
+
+
+class LinterStats():
+    """
+    The timings and counters for a single linter class in a lint. Times are in
+    seconds and cover constructing the linter, calls to lint() (which may have
+    happened in worker processes), calls to lint_facts() and calls to
+    results(). The counters are the files linted (not those that came from the
+    lint cache), the anchors and links in those files and the issues that the
+    linter produced.
+    """
+    __slots__ = ("name", "construct", "lint", "facts", "results",
+                 "files", "anchors", "links", "issues")
+
+    def __init__(self, name):
+        self.name = name
+        self.construct = self.lint = self.facts = self.results = 0.0
+        self.files = self.anchors = self.links = self.issues = 0
+
+    def as_dict(self):
+        return OrderedDict((slot, getattr(self, slot))
+                           for slot in self.__slots__)
+
+
+class LintProfile():
+    """
+    Timings and counters for a whole lint, broken down by linter. A profile is
+    started when it's created and stopped by finish().
+    """
+    def __init__(self, target):
+        self.package = target.pkg_info.package
+        self.target_type = target.target_type
+        self.files = 0
+        self.cached = 0
+        self.elapsed = 0.0
+        self.linters = OrderedDict()
+        self._start = time.perf_counter()
+
+    def stats(self, linter_class):
+        """
+        Return the LinterStats for the given linter class.
+        """
+        name = linter_class.__name__
+        if name not in self.linters:
+            self.linters[name] = LinterStats(name)
+
+        return self.linters[name]
+
+    @contextmanager
+    def timer(self, linter_class, phase):
+        """
+        Time the body of the with statement, adding the time to the given
+        phase ("construct", "lint", "facts" or "results") for the linter.
+        """
+        stats = self.stats(linter_class)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            setattr(stats, phase,
+                    getattr(stats, phase) + time.perf_counter() - start)
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self._start
+
+    def files_per_sec(self):
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+    def footer(self):
+        """
+        Return the lines of a footer for lint output that shows this profile.
+        """
+        output = ["Lint profile for %s; %d file(s) linted, %d cached, in "
+                  "%.3fs (%.1f files/sec)" % (
+                      self.package, self.files, self.cached, self.elapsed,
+                      self.files_per_sec()),
+                  "    %-26s %9s %9s %9s %9s %6s %8s %8s %6s" % (
+                      "linter", "init ms", "lint ms", "facts ms",
+                      "result ms", "files", "anchors", "links", "issues")]
+
+        for stats in self.linters.values():
+            output.append(
+                "    %-26s %9.2f %9.2f %9.2f %9.2f %6d %8d %8d %6d" % (
+                stats.name, stats.construct * 1000, stats.lint * 1000,
+                stats.facts * 1000, stats.results * 1000, stats.files,
+                stats.anchors, stats.links, stats.issues))
+
+        return output
+
+    def as_dict(self):
+        """
+        Return this profile as a dictionary that can be serialized as JSON.
+        """
+        return OrderedDict([
+            ("package", self.package),
+            ("target_type", self.target_type),
+            ("time", time.strftime("%Y-%m-%dT%H:%M:%S")),
+            ("files", self.files),
+            ("cached", self.cached),
+            ("elapsed", self.elapsed),
+            ("files_per_sec", self.files_per_sec()),
+            ("linters", [stats.as_dict() for stats in self.linters.values()])
+        ])
+
+
+###----------------------------------------------------------------------------
+
+
+def save_lint_profile(profile):
+    """
+    Append the provided LintProfile as a line of JSON to the profile log in
+    the cache folder, so that lint performance can be tracked over time.
+    """
+    folder = os.path.join(sublime.cache_path(), "HyperHelpAuthor")
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, "lint_profile.jsonl"), "a") as handle:
+            handle.write(json.dumps(profile.as_dict()) + "\n")
+    except OSError:
+        pass
+
+
+###----------------------------------------------------------------------------
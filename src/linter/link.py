@@ -1,11 +1,8 @@
 import sublime
 import sublime_plugin
 
-from hyperhelpcore.core import help_index_list, lookup_help_topic
-from hyperhelpcore.core import parse_link_body
-from hyperhelpcore.core import is_topic_file_valid
-
 from ..linter_base import LinterBase
+from ..resource_inventory import is_topic_file_valid
 
 
 ###----------------------------------------------------------------------------
@@ -17,45 +14,41 @@ class HelpLinkLinter(LinterBase):
     links contained in that file, such as determining when they are malformed
     or do not point to valid targets.
     """
-    def lint(self, view, file_name):
-        for pos in view.find_by_selector("meta.link"):
-            link_body = view.substr(pos)
-            pkg, topic, text = parse_link_body(link_body)
-
-            sev, msg = self.validate(pkg, topic, text, file_name, link_body)
-            if sev is not None:
-                self.add(view, sev, file_name, pos.begin(), msg)
-
+    def visit_link(self, doc, file_name, link):
+        sev, msg, args = self.validate(link.pkg, link.topic, link.text,
+                                       file_name, link.body)
+        if sev is not None:
+            self.add(doc, sev, file_name, link.point, msg, *args)
 
     def validate(self, pkg, topic, text, file_name, link_body):
         if topic is None:
             return ("error",
-                    "Malformed link; not enough ':' characters ('{}')".format(
-                        link_body))
+                    "Malformed link; not enough ':' characters ('%s')",
+                    (link_body,))
 
         if "\u00a0" in topic or "\t" in topic:
             return ("error",
-                    "Link '{}' contains nonbreaking spaces or tabs".format(
-                        topic))
+                    "Link '%s' contains nonbreaking spaces or tabs",
+                    (topic,))
 
-        link_pkg = self.pkg_info if pkg is None else help_index_list().get(pkg)
+        link_pkg, index_info = self.index.resolve(self.pkg_info, pkg, topic)
 
         if link_pkg is None:
             return ("error",
-                    "Link references a topic in a non-existant package ('{}')".format(
-                        pkg))
+                    "Link references a topic in a non-existant package ('%s')",
+                    (pkg,))
 
-        index_info = lookup_help_topic(link_pkg, topic)
         if index_info is None:
             return ("warning",
-                    "Link references unknown topic '{}'".format(topic))
+                    "Link references unknown topic '%s'",
+                    (topic,))
 
         if is_topic_file_valid(link_pkg, index_info) is False:
             return ("warning",
-                    "Link references a non-existant package file ('{}')".format(
-                        index_info["file"]))
+                    "Link references a non-existant package file ('%s')",
+                    (index_info["file"],))
 
-        return (None, None)
+        return (None, None, None)
 
 
 ###----------------------------------------------------------------------------
@@ -2,6 +2,7 @@ import sublime
 import sublime_plugin
 
 from ..linter_base import LinterBase
+from ..resource_inventory import resource_inventory
 
 
 ###----------------------------------------------------------------------------
@@ -12,12 +13,14 @@ class MissingHelpSourceLinter(LinterBase):
     Lint the help index to determine if the list of help files listed in the
     index matches the list of help files that exist for the package.
     """
-    def __init__(self, pkg_info):
-        super().__init__(pkg_info)
+    lints_files = False
+
+    def __init__(self, pkg_info, index=None):
+        super().__init__(pkg_info, index)
 
         root = "Packages/%s/" % (self.pkg_info.doc_root)
-        d_files = {file[len(root):] for file in sublime.find_resources("*.txt")
-                      if file.startswith(root)}
+        d_files = {file[len(root):] for file in resource_inventory.find(
+                      self.pkg_info.doc_root, "*.txt")}
 
         i_files = {key for key in self.pkg_info.help_files.keys()}
 
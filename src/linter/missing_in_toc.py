@@ -1,9 +1,6 @@
 import sublime
 import sublime_plugin
 
-from hyperhelpcore.core import lookup_help_topic
-from hyperhelpcore.core import parse_anchor_body
-
 from ..linter_base import LinterBase
 
 
@@ -13,32 +10,39 @@ from ..linter_base import LinterBase
 class MissingInTOCLinter(LinterBase):
     """
     Lint in the help index to find all help files that appear in the index but
-    which don't appear at least once in the defined table of contents.
+    which don't appear at least once in the defined table of contents, as
+    well as topics that appear in the table of contents more than once or
+    inside of themselves.
     """
-    def __init__(self, pkg_info):
-        super().__init__(pkg_info)
+    lints_files = False
 
-        help_files = {file for file in pkg_info.help_files}
-        toc_files = None
-        for topic in pkg_info.help_toc:
-            toc_files = self.gather_files(topic, toc_files)
+    def __init__(self, pkg_info, index=None):
+        super().__init__(pkg_info, index)
 
-        for file in help_files - toc_files:
-            self.add_index(
-                "warning",
-                "Help file '%s' is not represented in the table of contents",
-                file)
+        if not pkg_info.help_toc:
+            self.add_index("warning",
+                           "The help index has no table of contents")
+            return
 
-    def gather_files(self, topic, file_set=None):
-        if not file_set:
-            file_set = set()
+        toc = self.index.package(pkg_info).toc()
 
-        file_set.add(topic["file"])
-        for child in topic.get("children", []):
-            file_set = self.gather_files(child, file_set)
+        for path in toc.cycles:
+            self.add_index(
+                "error",
+                "Topic '%s' is nested inside of itself in the table of contents (%s)",
+                path[0], " -> ".join(path))
 
-        return file_set
+        for topic, count in sorted(toc.duplicates.items()):
+            self.add_index(
+                "warning",
+                "Topic '%s' appears %d times in the table of contents",
+                topic, count)
 
+        for file in sorted(set(pkg_info.help_files) - toc.files):
+            self.add_index(
+                "warning",
+                "Help file '%s' is not represented in the table of contents",
+                file)
 
 
 ###----------------------------------------------------------------------------
@@ -1,10 +1,9 @@
 import sublime
 import sublime_plugin
 
-from hyperhelpcore.core import lookup_help_topic, help_index_list
-from hyperhelpcore.core import parse_link_body
-
 from ..linter_base import LinterBase
+from ..link_graph import link_graph, link_roots, save_link_graph
+from ..link_graph import help_file_stamp
 
 
 ###----------------------------------------------------------------------------
@@ -13,48 +12,54 @@ from ..linter_base import LinterBase
 class UnlinkedHelpFilesLinter(LinterBase):
     """
     Lint in the help index to find all help files that appear in the index but
-    which don't appear at least one in the defined table of contents.
-    """
-    def __init__(self, pkg_info):
-        super().__init__(pkg_info)
-
-        self.help_files = {file for file in pkg_info.help_files}
-        self.linked_files = set(["index.txt"])
+    which are not linked to from any other help file in the package, or which
+    are only linked to from files that can't be reached from the package
+    index file or the top level of the table of contents.
 
-    def lint(self, view, file_name):
-        for pos in view.find_by_selector("meta.link"):
-            link_body = view.substr(pos)
-            pkg, topic, text = parse_link_body(link_body)
+    The links between files are kept in the LinkGraph for the package, which
+    is updated from the facts of each file and saved when the lint is done.
+    """
+    lints_files = False
 
-            file = self.validate(pkg, topic, file_name)
-            if file is not None:
-                self.linked_files.add(file)
+    def __init__(self, pkg_info, index=None):
+        super().__init__(pkg_info, index)
 
-    def validate(self, pkg, topic, file_name):
-        if topic is None:
-            return None
+        self.help_files = {file for file in pkg_info.help_files}
+        self.graph = link_graph(pkg_info.package)
 
-        link_pkg = self.pkg_info if pkg is None else help_index_list().get(pkg)
-        if link_pkg is None or link_pkg.package != self.pkg_info.package:
-            return None
+    def lint_facts(self, file_name, facts):
+        self.graph.update_file(file_name, facts,
+                               help_file_stamp(self.pkg_info, file_name))
 
-        index_info = lookup_help_topic(link_pkg, topic)
-        if index_info is None:
-            return None
+    def results(self):
+        self.graph.prune(self.help_files)
+        for m_type, msg, file in unlinked_file_issues(self.graph, self.index,
+                                                      self.pkg_info):
+            self.add_index(m_type, msg, file)
 
-        if index_info["file"] == file_name:
-            return None
+        save_link_graph(self.graph)
 
-        return index_info["file"]
+        return super().results()
 
-    def results(self):
-        for file in self.help_files - self.linked_files:
-            self.add_index(
-                "warning",
-                "Help file '%s' is not linked to from any other file in this package",
-                file)
 
-        return super().results()
+def unlinked_file_issues(graph, index, pkg_info, files=None):
+    """
+    Yield a (type, message, file) tuple for each of the given help files (or
+    all of them) that the provided LinkGraph says is not linked to from any
+    other file or can't be reached from the root files of the package.
+    """
+    linked = graph.linked_files(index, pkg_info) | {"index.txt"}
+    reachable = graph.reachable(index, pkg_info, link_roots(pkg_info))
+
+    for file in sorted(files if files is not None else pkg_info.help_files):
+        if file not in linked:
+            yield ("warning",
+                   "Help file '%s' is not linked to from any other file in this package",
+                   file)
+        elif file not in reachable:
+            yield ("warning",
+                   "Help file '%s' can't be reached by following links from index.txt or the table of contents",
+                   file)
 
 
 ###----------------------------------------------------------------------------
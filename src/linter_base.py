@@ -2,6 +2,7 @@ import sublime
 import sublime_plugin
 
 import os
+from array import array
 from collections import OrderedDict, namedtuple
 import codecs
 
@@ -10,6 +11,7 @@ from hyperhelpcore.core import help_index_list, lookup_help_topic
 from hyperhelpcore.core import parse_help_header, parse_anchor_body, parse_link_body
 from hyperhelpcore.core import is_topic_file_valid
 
+from .index_snapshot import index_snapshot
 
 
 ###----------------------------------------------------------------------------
@@ -37,36 +39,200 @@ LintResult = namedtuple("LintResult", [
 ###----------------------------------------------------------------------------
 
 
+class IssueStore():
+    """
+    Compact storage for the issues that a linter finds, which can run into
+    the hundreds of thousands for a large package.
+
+    Rather than a LintResult per issue, each issue is a row across a set of
+    arrays; the type is a small code, the file name and message template are
+    indexes into tables that hold each distinct value once, and the message
+    arguments are kept as given. Messages are only formatted when the issues
+    are turned back into LintResult tuples by results() (or iteration).
+    """
+    __slots__ = ("_types", "_files", "_lines", "_columns", "_templates",
+                 "_args", "_file_names", "_file_ids", "_template_strs",
+                 "_template_ids")
+
+    types = ("info", "warning", "error")
+
+    def __init__(self):
+        self._types = array("b")
+        self._files = array("I")
+        self._lines = array("I")
+        self._columns = array("I")
+        self._templates = array("I")
+        self._args = []
+
+        self._file_names = []
+        self._file_ids = {}
+        self._template_strs = []
+        self._template_ids = {}
+
+    def __len__(self):
+        return len(self._types)
+
+    def __iter__(self):
+        for row in range(len(self._types)):
+            yield LintResult(self.types[self._types[row]],
+                             self._file_names[self._files[row]],
+                             self._lines[row],
+                             self._columns[row],
+                             self._template_strs[self._templates[row]] %
+                                 self._args[row])
+
+    def _intern(self, value, values, ids):
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(values)
+            values.append(value)
+
+        return index
+
+    def add(self, m_type, file, line, column, template, args=()):
+        """
+        Add an issue of the given type ("info", "warning" or "error") to the
+        store. The message is template % args, but is not formatted yet.
+        """
+        self._types.append(self.types.index(m_type))
+        self._files.append(self._intern(file, self._file_names,
+                                        self._file_ids))
+        self._lines.append(line)
+        self._columns.append(column)
+        self._templates.append(self._intern(template, self._template_strs,
+                                            self._template_ids))
+        self._args.append(tuple(args))
+
+    def extend(self, other):
+        """
+        Add all of the issues from another store to the end of this one.
+        """
+        files = [self._intern(file, self._file_names, self._file_ids)
+                 for file in other._file_names]
+        templates = [self._intern(template, self._template_strs,
+                                  self._template_ids)
+                     for template in other._template_strs]
+
+        self._types.extend(other._types)
+        self._files.extend(files[index] for index in other._files)
+        self._lines.extend(other._lines)
+        self._columns.extend(other._columns)
+        self._templates.extend(templates[index] for index in other._templates)
+        self._args.extend(other._args)
+
+    def results(self):
+        """
+        Return the issues in the store as a list of LintResult tuples.
+        """
+        return list(self)
+
+
+###----------------------------------------------------------------------------
+
+
 class LinterBase():
     """
     The base class for all lint operations in the help linter.
+
+    The index is the IndexSnapshot that all of the linters in a lint run share
+    for looking up topics; one is created if it's not given.
+
+    Linters that only examine the help index and never need to see the help
+    files themselves should set lints_files to False so that they're not
+    handed out to workers when files are linted in parallel.
+
+    The version is part of the key for the results of this linter in the lint
+    cache; bump it whenever a change in the linter would change its results.
+
+    Each help file is scanned once and the parsed header, anchors and links
+    are handed to every linter through the visit_*() methods, between calls
+    to begin_file() and end_file(); linters override only the ones that they
+    care about. The older lint() method is still invoked for linters that
+    need to examine the document themselves.
     """
-    def __init__(self, pkg_info):
+    lints_files = True
+    version = 1
+
+    def __init__(self, pkg_info, index=None):
         self.pkg_info = pkg_info
-        self.issues = list()
+        self.index = index if index is not None else index_snapshot(
+            help_index_list())
+        self.issues = IssueStore()
 
         self.index_file = os.path.relpath(
                               pkg_info.index_file,
                               "Packages/%s/" % (self.pkg_info.doc_root))
 
+    def begin_file(self, doc, file_name):
+        """
+        This is invoked with the HelpDocument for each file to be linted,
+        before any of the visit methods are invoked for it.
+        """
+        pass
+
+    def visit_header(self, doc, file_name, header):
+        """
+        This is invoked with the parsed help header of the file, which is None
+        if the file does not have one.
+        """
+        pass
+
+    def visit_anchor(self, doc, file_name, anchor):
+        """
+        This is invoked with a HelpAnchor for each anchor in the file, in the
+        order that they appear.
+        """
+        pass
+
+    def visit_link(self, doc, file_name, link):
+        """
+        This is invoked with a HelpLink for each link in the file, in the order
+        that they appear.
+        """
+        pass
+
+    def end_file(self, doc, file_name):
+        """
+        This is invoked after all of the visit methods for the file have been
+        invoked.
+        """
+        pass
+
     def lint(self, view, file_name):
         """
-        This is invoked with a view that contains raw help text from the help
-        file, which is contained in the help index given in the constructor.
+        This is invoked with a HelpDocument (or a view) that contains the raw
+        help text from the help file, which is contained in the help index
+        given in the constructor. Both provide find_by_selector() for the
+        "meta.anchor" and "meta.link" selectors, as well as substr(), rowcol()
+        and full_line().
 
-        This will be invoked for each file to be linted.
+        This will be invoked for each file to be linted, after end_file().
+        New linters should prefer the visit methods, which don't need to
+        parse the file again.
+        """
+        pass
+
+    def lint_facts(self, file_name, facts):
+        """
+        This is invoked with the LintFacts (the parsed anchors and links) for
+        each file in the lint target, after all calls to lint() and merge()
+        have finished. The facts may have come from the lint cache, so linters
+        that need information from across files should gather it here rather
+        than in lint(), which is not invoked for files that have not changed.
         """
         pass
 
     def add(self, view, m_type, file, point, msg, *args):
         """
         Add a result to the internal result list. point is the location that is
-        the focus of the error. If view is None, the point is ignored and the
-        issue is added at line 1, column 1.
+        the focus of the error. If view (a view or HelpDocument) is None, the
+        point is ignored and the issue is added at line 1, column 1.
+
+        The message is msg % args, but it is not formatted until the results
+        are asked for.
         """
         pos = view.rowcol(point) if view is not None else (0, 0)
-        msg = msg % args
-        self.issues.append(LintResult(m_type, file, pos[0] + 1, pos[1]+1, msg))
+        self.issues.add(m_type, file, pos[0] + 1, pos[1] + 1, msg, args)
 
     def add_index(self, m_type, msg, *args):
         """
@@ -76,6 +242,19 @@ class LinterBase():
         """
         return self.add(None, m_type, self.index_file, 0, msg, *args)
 
+    def merge(self, other):
+        """
+        This is invoked to fold the state of another instance of this linter
+        into this one, when the files in the lint target have been split up
+        between several instances (e.g. for linting in parallel). Merges
+        happen in file order, so the results are the same as they would be if
+        this instance had linted all of the files itself.
+
+        Linters that gather state across files should extend this to merge
+        that state as well.
+        """
+        self.issues.extend(other.issues)
+
     def results(self):
         """
         This is invoked after all calls to the lint() method have finished to
@@ -84,9 +263,10 @@ class LinterBase():
         This should return a list of LintResult tuples that indicate the issues
         that have been found or an empty list if there are no issues.
 
-        The default is to return the results instance variable.
+        The default is to return the issues in the issues instance variable, an
+        IssueStore.
         """
-        return self.issues
+        return self.issues.results()
 
 
 ###----------------------------------------------------------------------------
@@ -2,16 +2,25 @@ import sublime
 import sublime_plugin
 
 import os
-from collections import OrderedDict, namedtuple
-import codecs
+import time
+import posixpath
+import threading
+import multiprocessing
+from collections import OrderedDict, Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from hyperhelpcore.common import log, hh_syntax
 from hyperhelpcore.core import help_index_list, lookup_help_topic
 from hyperhelpcore.core import parse_help_header, parse_anchor_body, parse_link_body
 from hyperhelpcore.core import is_topic_file_valid
 
-from .linter_base import LintTarget
-from .common import hha_setting
+from .linter_base import LintTarget, LintResult, LinterBase
+from .document import HelpDocument, read_help_file, load_help_document
+from .lint_cache import content_digest, index_version
+from .lint_profile import LintProfile
+from .package_archive import package_archives
+from .index_snapshot import index_snapshot, doc_root_index
+from .common import hha_setting, package_relative_path
 
 from .linter import HelpAnchorLinter
 from .linter import HelpLinkLinter
@@ -19,6 +28,8 @@ from .linter import MissingHelpSourceLinter
 from .linter import MismatchingTitleLinter
 from .linter import MissingInTOCLinter
 from .linter import UnlinkedHelpFilesLinter
+from .linter.unlinked_files import unlinked_file_issues
+from .link_graph import link_graph, help_file_stamp
 
 
 ###----------------------------------------------------------------------------
@@ -30,12 +41,15 @@ def _find_or_create_output_view(window, target):
     This is used when lint_output_to_view is set to True to create the view for
     the lint results to be displayed in.
     """
-    caption = {
-        "package": "HyperHelpAuthor Lint: {pkg}",
-        "single":  "HyperHelpAuthor Lint: {target} ({pkg})"
-    }.get(target.target_type, "???").format(
-        target=target.files[0],
-        pkg=target.pkg_info.package)
+    if target.target_type == "all":
+        caption = "HyperHelpAuthor Lint: All Packages"
+    else:
+        caption = {
+            "package": "HyperHelpAuthor Lint: {pkg}",
+            "single":  "HyperHelpAuthor Lint: {target} ({pkg})"
+        }.get(target.target_type, "???").format(
+            target=target.files[0],
+            pkg=target.pkg_info.package)
 
     for view in window.views():
         if view.name().startswith("HyperHelpAuthor Lint"):
@@ -55,26 +69,44 @@ def _find_or_create_output_view(window, target):
 ###----------------------------------------------------------------------------
 
 
+# The key for the regions that mark the fold lines in lint output, and the
+# folded issues for each lint view, keyed by view id; the list of issues for
+# a view is in the same order as the regions.
+_fold_key = "hha_lint_folds"
+_lint_folds = {}
+
+# The number of lines of output that display_lint() adds to a view at once.
+_display_chunk = 1000
+
+
+###----------------------------------------------------------------------------
+
+
 def can_lint_view(view):
     """
     Determine if the provided view can be the source of a lint. To be valid
     the view must represent a hyperhelp data file that has a path rooted in the
     Packages folder inside of a package whose help index is known.
     """
-    if (view is not None and view.file_name() is not None and
-            view.file_name().startswith(sublime.packages_path()) and
-            view.match_selector(0, "text.hyperhelp")):
+    return _lint_package(view) is not None
 
-        # Make the path relative to the packages folder, then throw the
-        # filename away, which should be a document root.
-        name = os.path.relpath(view.file_name(), sublime.packages_path())
-        name = os.path.split(name)[0].replace("\\", "/")
 
-        for info in help_index_list().values():
-            if info.doc_root == name:
-                return True
+def _lint_package(view):
+    """
+    Return the help index for the package that contains the file in the given
+    view if that view could be the source of a lint (see can_lint_view), or
+    None otherwise.
+    """
+    if view is None or not view.match_selector(0, "text.hyperhelp"):
+        return None
+
+    # The file has to be directly inside of a document root.
+    name = package_relative_path(view.file_name())
+    if name is None:
+        return None
 
-    return False
+    return doc_root_index(help_index_list()).package_for_root(
+        posixpath.dirname(name))
 
 
 def find_lint_target(view):
@@ -82,29 +114,34 @@ def find_lint_target(view):
     Examine a given view and return a LintTarget that describes what is being
     linted. None is returned if the view is not a valid lint target.
     """
-    if not can_lint_view(view):
+    pkg_info = _lint_package(view)
+    if pkg_info is None:
         return None
 
-    # Make the path relative to the packages folder, then get both the path
-    # and the file name parts.
-    name = os.path.relpath(view.file_name(), sublime.packages_path())
-    name, target = os.path.split(name)
-    name = name.replace("\\", "/")
-
-    # Use the location as the document root to find the appropriate package.
-    for info in help_index_list().values():
-        if info.doc_root == name:
-            pkg_name = info.package
-
-    pkg_info = help_index_list().get(pkg_name)
-
     if view.match_selector(0, "text.hyperhelp.help"):
+        target = posixpath.basename(package_relative_path(view.file_name()))
         return LintTarget("single", pkg_info, [target])
 
     return LintTarget("package", pkg_info, list(pkg_info.help_files))
 
 
-def get_linters(target):
+def lint_all_targets(index_list=None):
+    """
+    Return a LintTarget for every help package in the provided help index
+    list (or the loaded help indexes), in package name order, along with a
+    LintTarget of type "all" that stands for all of them together; its files
+    are the names of the packages.
+    """
+    index_list = index_list if index_list is not None else help_index_list()
+
+    targets = [LintTarget("package", pkg_info, list(pkg_info.help_files))
+               for name, pkg_info in sorted(index_list.items())]
+
+    return (LintTarget("all", None, [t.pkg_info.package for t in targets]),
+            targets)
+
+
+def get_linters(target, index=None, profile=None):
     """
     Given a LintTarget, return back an array of all of the linters that should
     be run for that target.
@@ -112,59 +149,515 @@ def get_linters(target):
     Some targets may only be run on the package as a whole while others may be
     allowed on a file by file basis. The returned linters may also be affected
     by user settings.
+
+    All of the linters share a single IndexSnapshot, which is taken from the
+    currently loaded help indexes if one is not provided.
+
+    When a LintProfile is provided, the construction of each linter is timed.
     """
-    linters = []
-    linters.append(HelpAnchorLinter(target.pkg_info))
-    linters.append(HelpLinkLinter(target.pkg_info))
+    index = index if index is not None else index_snapshot(help_index_list())
+
+    classes = [HelpAnchorLinter, HelpLinkLinter]
 
     if target.target_type == "package":
-        linters.append(MissingHelpSourceLinter(target.pkg_info))
-        linters.append(MismatchingTitleLinter(target.pkg_info))
-        linters.append(MissingInTOCLinter(target.pkg_info))
-        linters.append(UnlinkedHelpFilesLinter(target.pkg_info))
+        classes.append(MissingHelpSourceLinter)
+        classes.append(MismatchingTitleLinter)
+        classes.append(MissingInTOCLinter)
+        classes.append(UnlinkedHelpFilesLinter)
+
+    linters = []
+    for linter_class in classes:
+        if profile is None:
+            linters.append(linter_class(target.pkg_info, index))
+        else:
+            with profile.timer(linter_class, "construct"):
+                linters.append(linter_class(target.pkg_info, index))
 
     return linters
 
 
+def collect_lint(linters, profile=None):
+    """
+    Return a list of all of the LintResult issues from the given linters, in
+    linter order. When a LintProfile is provided, the calls to results() are
+    timed and the issues from each linter are counted.
+    """
+    issues = list()
+    for linter in linters:
+        if profile is None:
+            issues += linter.results()
+        else:
+            with profile.timer(linter.__class__, "results") as stats:
+                results = linter.results()
+
+            stats.issues += len(results)
+            issues += results
+
+    return issues
+
+
 def get_lint_file(filename):
     """
-    Return a view that that contains the contents of the provided file name.
-    If the file is not aready loaded, it is loaded into a hidden view and that
-    is returned instead.
+    Return a HelpDocument that contains the contents of the provided file
+    name. If the file is already open in a view, the document reflects the
+    current (possibly unsaved) contents of that view; otherwise the file is
+    read from disk and tokenized directly without the need for a view.
+
+    Files from packed packages are read directly from the package file.
 
     Can return None if the file is not open and cannot be loaded.
     """
-    for window in sublime.windows():
-        view = window.find_open_file(filename)
-        if view is not None:
-            return view
+    return load_help_document(filename)
 
-    content = None
+
+def lint_target(target, linters, workers=1, chunk_size=25, cache=None,
+                progress=None, profile=None, processes=False):
+    """
+    Lint all of the files in the provided LintTarget with the given list of
+    linters.
+
+    Each file is linted by its own instances of the linters that need to see
+    help files, which are then merged back into the provided linters in file
+    order, followed by passing the LintFacts for the file to all linters.
+
+    When a LintCache is provided, files whose content hasn't changed since it
+    was cached (and whose help index and linters are also the same) reuse the
+    cached linters and facts instead of being linted again.
+
+    When workers is larger than 1 (or 0, which uses one worker per CPU), the
+    files that need linting are split into chunks of at most chunk_size files
+    and shared out to a pool of workers. The end result is identical to a
+    serial lint.
+
+    The workers are threads unless processes is True, in which case they're
+    worker processes. Only a regular Python interpreter can spawn those; the
+    Sublime plugin host embeds Python and can't, so there the lint still runs
+    in chunks, but file reads overlap rather than the linting.
+
+    If provided, progress is invoked with the file name, the list of linters
+    that linted just that file and its LintFacts as each file is completed, in
+    file order. Returning False from it cancels the rest of the lint.
+
+    When a LintProfile is provided, the calls to lint() and lint_facts() for
+    each linter are timed and the files, anchors and links scanned are counted.
+
+    The return value is False if the lint was cancelled and True otherwise.
+    """
+    file_linters = [linter for linter in linters if linter.lints_files]
+    classes = [linter.__class__ for linter in file_linters]
+    index = file_linters[0].index if file_linters else None
+
+    pkg_info = target.pkg_info
+    version = index_version(help_index_list()) if cache is not None else None
+
+    spp = sublime.packages_path()
+    results = OrderedDict()
+    pending = []
+
+    # Files from a packed package all come from the same archive, which stays
+    # open until they've all been read.
+    with package_archives.session():
+        for file in target.files:
+            content = read_help_file(os.path.join(spp, pkg_info.doc_root,
+                                                  file))
+            if content is None:
+                log("Unable to lint '%s' in '%s'", file, pkg_info.package)
+                continue
+
+            digest = content_digest(content) if cache is not None else None
+            entry = None if cache is None else cache.fetch(
+                pkg_info.package, file, digest, version, classes)
+
+            if entry is not None:
+                results[file] = (cache.entry_linters(entry, classes),
+                                 entry.facts)
+            else:
+                results[file] = None
+                pending.append((file, content, digest))
+
+    linted = _lint_pending(target, index, classes, pending, workers,
+                           chunk_size, profile is not None, processes)
     try:
-        # TODO: This will break if we lint a packed package
-        with codecs.open(filename, 'r', encoding='utf-8') as file:
-            content = file.read()
-    except:
-        pass
-
-    if content:
-        view = sublime.active_window().create_output_panel("_hha_tmp", True)
-        view.run_command("select_all")
-        view.run_command("left_delete")
-        view.run_command("append", {"characters": content})
-        view.assign_syntax(hh_syntax("HyperHelp-Help.sublime-syntax"))
-        return view
+        for file, result in results.items():
+            if result is None:
+                file, digest, shard, facts, timings = next(linted)
+                if cache is not None:
+                    cache.store(pkg_info.package, file, digest, version,
+                                shard, facts)
+                if profile is not None:
+                    _profile_file(profile, classes, facts, timings)
+            else:
+                shard, facts = result
+                if profile is not None:
+                    profile.cached += 1
 
-    return None
+            for linter, shard_linter in zip(file_linters, shard):
+                linter.merge(shard_linter)
+
+            for linter in linters:
+                if profile is None:
+                    linter.lint_facts(file, facts)
+                else:
+                    with profile.timer(linter.__class__, "facts"):
+                        linter.lint_facts(file, facts)
+
+            if progress is not None and progress(file, shard, facts) is False:
+                return False
 
+    finally:
+        linted.close()
 
-def format_lint(target, issues, window=None):
+    return True
+
+
+def lint_packages(targets, index=None, jobs=1, workers=1, chunk_size=25,
+                  cache=None, progress=None, profile=False, processes=False):
     """
-    Takes a list of LintResult issues for a package and returns back output
-    suitable for passing to display_lint().
+    Lint each of the provided package LintTargets with all of the package
+    linters, returning a list with a (target, issues, profile) tuple for each
+    in the same order; issues is a list of (linter_name, issues) tuples and
+    profile is a LintProfile if profile is True, or None.
 
-    If a window is provided, display_lint() is called prior to returning in
-    order to display the output first.
+    All of the packages share one IndexSnapshot (taken from the loaded help
+    indexes if one isn't given), so the topic and alias lookups for each
+    package are built once and a link to a topic in a named package is only
+    resolved once, no matter how many packages link to it.
+
+    Up to jobs packages (0 for one per CPU) are linted at the same time, each
+    of which uses workers, chunk_size and processes as lint_target() does.
+
+    If provided, progress is invoked with each result tuple in package order
+    as soon as the package is done. Returning False from it cancels the rest
+    of the lint, in which case the return value is None.
+    """
+    index = index if index is not None else index_snapshot(help_index_list())
+    index.prepare()
+
+    jobs = jobs if jobs != 0 else multiprocessing.cpu_count()
+    cancelled = threading.Event()
+
+    def lint_package(target):
+        lint_profile = LintProfile(target) if profile else None
+        linters = get_linters(target, index, lint_profile)
+
+        if not lint_target(target, linters, workers=workers,
+                           chunk_size=chunk_size, cache=cache,
+                           progress=lambda *args: not cancelled.is_set(),
+                           profile=lint_profile, processes=processes):
+            return None
+
+        issues = [(linter.__class__.__name__,
+                   collect_lint([linter], lint_profile))
+                  for linter in linters]
+        if lint_profile is not None:
+            lint_profile.finish()
+
+        return (target, issues, lint_profile)
+
+    results = []
+    with ThreadPoolExecutor(max(1, min(jobs, len(targets)))) as executor:
+        futures = [executor.submit(lint_package, target) for target in targets]
+        try:
+            for future in futures:
+                result = future.result()
+                if result is None or (progress is not None and
+                                      progress(*result) is False):
+                    return None
+
+                results.append(result)
+
+        finally:
+            cancelled.set()
+            for future in futures:
+                future.cancel()
+
+    return results
+
+
+def _profile_file(profile, classes, facts, timings):
+    """
+    Add the timings for the lint of a single file by the given linter classes
+    to the provided LintProfile, along with the counts of what was linted.
+    """
+    profile.files += 1
+    for linter_class, elapsed in zip(classes, timings):
+        stats = profile.stats(linter_class)
+        stats.lint += elapsed
+        stats.files += 1
+        stats.anchors += len(facts.anchors)
+        stats.links += len(facts.links)
+
+
+def _lint_pending(target, index, classes, pending, workers, chunk_size,
+                  timed=False, processes=False):
+    """
+    Lint the list of pending (file, content, digest) tuples with new instances
+    of the provided linter classes sharing the given IndexSnapshot, yielding a
+    tuple of (file, digest, linters, facts, timings) for each one in order.
+    When timed is True, timings is a list of the time each linter took to lint
+    the file; otherwise it's None. Chunks run in worker processes when
+    processes is True and in threads otherwise.
+
+    Closing the generator early cancels any chunks that have not started yet.
+    """
+    workers = workers if workers != 0 else multiprocessing.cpu_count()
+    chunk_size = max(1, chunk_size or 1)
+
+    if workers <= 1 or len(pending) <= chunk_size:
+        for item in pending:
+            for result in _lint_chunk(target, index, classes, [item], timed):
+                yield result
+
+        return
+
+    chunks = [pending[i:i + chunk_size]
+              for i in range(0, len(pending), chunk_size)]
+
+    with _lint_executor(min(workers, len(chunks)), processes) as executor:
+        futures = [executor.submit(_lint_chunk, target, index, classes, chunk,
+                                   timed)
+                   for chunk in chunks]
+        try:
+            for future in futures:
+                for result in future.result():
+                    yield result
+
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _lint_chunk(target, index, classes, pending, timed=False):
+    """
+    Lint a chunk of pending (file, content, digest) tuples, each with its own
+    new instances of the provided linter classes sharing the provided
+    IndexSnapshot, returning a list of (file, digest, linters, facts, timings)
+    tuples. This is the unit of work for a parallel lint, and may be executed
+    in another process.
+    """
+    results = []
+    for file, content, digest in pending:
+        doc = HelpDocument(content, file)
+        linters = [linter_class(target.pkg_info, index)
+                   for linter_class in classes]
+
+        timings = [0.0] * len(linters) if timed else None
+        lint_document(doc, file, linters, timings)
+
+        results.append((file, digest, linters, doc.facts(), timings))
+
+    return results
+
+
+# The hooks that lint_document() dispatches to, in the order they're invoked.
+_lint_hooks = ("begin_file", "visit_header", "visit_anchor", "visit_link",
+               "end_file", "lint")
+
+
+def _linter_hooks(linter):
+    """
+    Return the set of the names of the lint hooks that the given linter
+    overrides; there's no point in calling the others.
+    """
+    cls = type(linter)
+    hooks = _linter_hooks.cache.get(cls)
+    if hooks is None:
+        hooks = _linter_hooks.cache[cls] = frozenset(
+            name for name in _lint_hooks
+            if getattr(cls, name) is not getattr(LinterBase, name))
+
+    return hooks
+
+_linter_hooks.cache = {}
+
+
+def lint_document(doc, file_name, linters, timings=None):
+    """
+    Lint the given HelpDocument with all of the provided linters. The document
+    is scanned once, and the header, anchors and links that are found are
+    dispatched in a single pass to every linter that overrides the matching
+    visit method, followed by a call to lint() for any linter that still
+    implements it.
+
+    When timings is a list with an entry per linter, the time spent in each
+    linter is added to its entry.
+    """
+    scan = doc.scan()
+
+    def hooked(name):
+        return [(i, getattr(linter, name))
+                for i, linter in enumerate(linters)
+                if name in _linter_hooks(linter)]
+
+    def dispatch(handlers, *args):
+        for i, handler in handlers:
+            if timings is None:
+                handler(doc, file_name, *args)
+            else:
+                start = time.perf_counter()
+                handler(doc, file_name, *args)
+                timings[i] += time.perf_counter() - start
+
+    dispatch(hooked("begin_file"))
+    dispatch(hooked("visit_header"), scan.header)
+
+    handlers = hooked("visit_anchor")
+    if handlers:
+        for anchor in scan.anchors:
+            dispatch(handlers, anchor)
+
+    handlers = hooked("visit_link")
+    if handlers:
+        for link in scan.links:
+            dispatch(handlers, link)
+
+    dispatch(hooked("end_file"))
+    dispatch(hooked("lint"))
+
+
+def _lint_executor(workers, processes=False):
+    """
+    Get an executor for running a parallel lint with the given number of
+    workers, which are processes if processes is True and threads otherwise.
+    """
+    if processes:
+        return ProcessPoolExecutor(workers)
+
+    return ThreadPoolExecutor(workers)
+
+
+def lint_view(view, cache=None):
+    """
+    Lint just the help file in the provided view with the per-file linters,
+    returning a list of LintResult issues, or None if the view is not a help
+    file that can be linted.
+
+    Checks that need to see the rest of the package can't be done on a single
+    file, but when the saved LinkGraph for the package knows about every file
+    in it, it's used to check if the file is linked to from any other file in
+    the package and can be reached from its index.
+    """
+    target = find_lint_target(view)
+    if target is None or target.target_type != "single":
+        return None
+
+    pkg_info = target.pkg_info
+    graph = link_graph(pkg_info.package)
+
+    linters = get_linters(target)
+    def record(file, shard, facts):
+        graph.update_file(file, facts, help_file_stamp(pkg_info, file))
+
+    lint_target(target, linters, cache=cache, progress=record)
+
+    issues = collect_lint(linters)
+
+    if graph.covers(pkg_info.help_files):
+        for m_type, msg, file in unlinked_file_issues(
+                graph, linters[0].index, pkg_info, target.files[:1]):
+            issues.append(LintResult(m_type, file, 1, 1, msg % file))
+
+    return issues
+
+
+def format_lint_header(target):
+    """
+    Return the line that starts the lint output for the given target.
+    """
+    if target.target_type == "all":
+        count = len(target.files)
+        return "Linting all help packages: {count} package{s}\n".format(
+            count=count, s="" if count == 1 else "s")
+
+    if target.target_type == "package":
+        return "Linting help package: {pkg}\n".format(
+            pkg=target.pkg_info.package)
+
+    return "Linting {target} in help package: {pkg}\n".format(
+        target=target.files[0],
+        pkg=target.pkg_info.package)
+
+
+def format_lint_file(file, issues, limit=0):
+    """
+    Return the lines of lint output for a list of LintResult issues that are
+    all for the given file.
+
+    If limit is not 0 and there are more issues than that, only that many are
+    included, followed by a fold line (see format_lint_fold) in place of the
+    rest.
+    """
+    output = ["%s:" % file]
+    output.extend(format_lint_issues(issues[:limit] if limit else issues))
+
+    if limit and len(issues) > limit:
+        output.append(format_lint_fold(file, len(issues) - limit))
+
+    output.append("")
+    return output
+
+
+def format_lint_issues(issues):
+    """
+    Return the lines of lint output for each of the LintResult issues in the
+    provided list, without the line that names the file they're in.
+    """
+    output = []
+    for issue in issues:
+        issue_pos = "%d:%d" % (issue.line, issue.column)
+        output.append("    %-7s @ %-7s %s" % (
+            issue.type, issue_pos, issue.message))
+
+    return output
+
+
+def format_lint_fold(file, count):
+    """
+    Return the line that stands in for issues in a file that are not shown
+    in the lint output.
+    """
+    return "    ... %d more issue%s in %s" % (count, "" if count == 1 else "s",
+                                             file)
+
+
+def format_lint_summary(warn, err):
+    """
+    Return the line that ends the lint output, given the warning and error
+    counts.
+    """
+    return "%d warning%s, %d error%s" % (
+        warn,
+        "" if warn == 1 else "s",
+        err,
+        "" if err == 1 else "s")
+
+
+def format_lint_packages(counts):
+    """
+    Return the lines of lint output that summarize a lint of several help
+    packages, given a list of (package, warnings, errors) tuples; each package
+    gets a line, followed by the totals.
+    """
+    width = max([len(package) for package, warn, err in counts] + [0])
+    output = ["Package summary:"]
+    for package, warn, err in counts:
+        output.append("    %-*s  %s" % (width, package,
+                                         format_lint_summary(warn, err)))
+
+    output.append("")
+    output.append("%s in %d package%s" % (
+        format_lint_summary(sum(count[1] for count in counts),
+                            sum(count[2] for count in counts)),
+        len(counts),
+        "" if len(counts) == 1 else "s"))
+
+    return output
+
+
+def group_lint(issues):
+    """
+    Group a list of LintResult issues by file, returning an OrderedDict whose
+    keys are file names in the order they first appear in the issue list.
     """
     files = OrderedDict()
     for issue in issues:
@@ -172,79 +665,381 @@ def format_lint(target, issues, window=None):
             files[issue.file] = []
         files[issue.file].append(issue)
 
-    if target.target_type == "package":
-        output = ["Linting help package: {pkg}\n".format(
-            pkg=target.pkg_info.package)]
-    else:
-        output = ["Linting {target} in help package: {pkg}\n".format(
-            target=target.files[0],
-            pkg=target.pkg_info.package)]
+    return files
 
-    warn = 0
-    err = 0
-    for file in files:
-        output.append("%s:" % file)
 
-        for issue in files[file]:
-            issue_pos = "%d:%d" % (issue.line, issue.column)
-            output.append("    %-7s @ %-7s %s" % (
-                issue.type, issue_pos, issue.message))
+def count_lint(issues):
+    """
+    Return a tuple of the number of warnings and errors in the provided list
+    of LintResult issues.
+    """
+    warn = sum(1 for issue in issues if issue.type == "warning")
+    err = sum(1 for issue in issues if issue.type == "error")
 
-            if issue.type == "warning":
-                warn += 1
-            elif issue.type == "error":
-                err += 1
+    return (warn, err)
 
-        output.append("")
 
-    output.append("%d warning%s, %d error%s" % (
-        warn,
-        "" if warn == 1 else "s",
-        err,
-        "" if err == 1 else "s"))
+def format_lint(target, issues, window=None, profile=None):
+    """
+    Takes a list of LintResult issues for a package and returns back output
+    suitable for passing to display_lint().
+
+    If a LintProfile is provided, a footer that shows it follows the summary.
+
+    If a window is provided, display_lint() is called prior to returning in
+    order to display the output first. In that case the issues for each file
+    are limited by the lint_max_file_issues setting, with the rest folded
+    away the same as they are in the output of a LintOutput.
+    """
+    limit = (hha_setting("lint_max_file_issues") or 0) if window else 0
+
+    output = [format_lint_header(target)]
+    folds = []
+    for file, file_issues in group_lint(issues).items():
+        if limit and len(file_issues) > limit:
+            # The fold follows the file name and the issues that are shown.
+            folds.append((lint_output_rows(output) + 1 + limit, file,
+                          file_issues[limit:]))
+        output.extend(format_lint_file(file, file_issues, limit))
+
+    output.append(format_lint_summary(*count_lint(issues)))
+
+    if profile is not None:
+        output.append("")
+        output.extend(profile.footer())
 
     if window:
-        display_lint(window, target, output)
+        display_lint(window, target, output, folds)
 
     return output
 
 
-def display_lint(window, target, output):
+def lint_output_rows(output):
     """
-    Display the lint output provided into the given window. The output is
-    assumed to have been generated from the provided package, which is used to
-    know where the help files are located.
+    Return the number of rows that the given list of lines of lint output
+    takes up once joined; a line can itself contain newlines.
+    """
+    return sum(line.count("\n") + 1 for line in output)
+
+
+def prepare_lint_view(window, target):
+    """
+    Find or create the view or panel in the given window that lint output for
+    the provided target should go to, and set it up for displaying lint
+    results. The view is returned empty.
     """
     if hha_setting("lint_output_to_view"):
-        prev_view = window.active_view()
         view = _find_or_create_output_view(window, target)
     else:
         view = window.create_output_panel("HyperHelpAuthor Lint", False)
 
-    basedir = os.path.join(sublime.packages_path(), target.pkg_info.doc_root)
+    if target.pkg_info is None:
+        basedir = sublime.packages_path()
+    else:
+        basedir = os.path.join(sublime.packages_path(),
+                               target.pkg_info.doc_root)
     # print("encoding:", view.encoding())
 
-    if not isinstance(output, str):
-        output = "\n".join(output)
-
     view.assign_syntax(hh_syntax("HyperHelpLinter.sublime-syntax"))
+    forget_lint_folds(view)
 
     settings = view.settings()
     settings.set("result_base_dir", basedir)
     settings.set("result_file_regex", r"^([^:]+):$")
     settings.set("result_line_regex", r"^.*?@ (\d+):(\d+)\s+(.*)$")
 
+    return view
+
+
+def append_lint(view, output, folds=None):
+    """
+    Append lint output, either a string or a list of lines, to the end of the
+    provided lint view.
+
+    folds is an optional list of (row, file, issues) tuples for the fold
+    lines in the output, in the order they appear, where row is the row of
+    the output that the fold line is on; each fold line is replaced with the
+    issues when it is expanded with expand_lint_fold().
+    """
+    if not isinstance(output, str):
+        output = "\n".join(output)
+
+    start_row = view.rowcol(view.size())[0]
     view.set_read_only(False)
     view.run_command("append", {"characters": output})
     view.set_read_only(True)
 
+    if folds:
+        regions = view.get_regions(_fold_key)
+        for row, file, issues in folds:
+            regions.append(view.line(view.text_point(start_row + row, 0)))
+
+        _lint_folds.setdefault(view.id(), []).extend(
+            (file, issues) for row, file, issues in folds)
+        view.add_regions(_fold_key, regions, "", "", sublime.HIDDEN)
+
+
+def lint_fold_count(view):
+    """
+    Return the number of fold lines in the lint view.
+    """
+    return len(view.get_regions(_fold_key))
+
+
+def lint_fold_at(view, point):
+    """
+    Return the index of the fold line in the lint view that contains the given
+    point, or None if there isn't one.
+    """
+    for index, region in enumerate(view.get_regions(_fold_key)):
+        if region.contains(point):
+            return index
+
+    return None
+
+
+def expand_lint_fold(view, edit, index):
+    """
+    Replace the fold line with the given index in the lint view with the
+    issues that it stands in for.
+    """
+    regions = view.get_regions(_fold_key)
+    folds = _lint_folds.get(view.id(), [])
+    if index >= len(regions) or index >= len(folds):
+        return
+
+    region = regions.pop(index)
+    file, issues = folds.pop(index)
+    view.add_regions(_fold_key, regions, "", "", sublime.HIDDEN)
+
+    view.set_read_only(False)
+    view.replace(edit, region, "\n".join(format_lint_issues(issues)))
+    view.set_read_only(True)
+
+
+def forget_lint_folds(view):
+    """
+    Throw away the folded issues for the provided lint view.
+    """
+    _lint_folds.pop(view.id(), None)
+    view.erase_regions(_fold_key)
+
+
+def show_lint_view(window, view, prev_view=None):
+    """
+    Make the provided lint view visible in the given window. When lint output
+    goes to a view, prev_view is the view that was active before the lint
+    view was created.
+    """
     if hha_setting("lint_output_to_view"):
         # In views, find results fail until the focus is lost and regained.
         # This is a bug in Sublime, so work around it by changing the focus.
-        window.focus_view(prev_view)
+        if prev_view is not None:
+            window.focus_view(prev_view)
         window.focus_view(view)
     else:
         window.run_command("show_panel", {"panel": "output.HyperHelpAuthor Lint"})
 
 
+def display_lint(window, target, output, folds=None):
+    """
+    Display the lint output provided into the given window. The output is
+    assumed to have been generated from the provided package, which is used to
+    know where the help files are located.
+
+    folds is an optional list of (row, file, issues) tuples for the fold lines
+    in the output, as for append_lint().
+    """
+    close_lint_output()
+
+    prev_view = window.active_view()
+    view = prepare_lint_view(window, target)
+
+    # Large output is added a chunk at a time, so the window stays responsive;
+    # each chunk carries the folds that are in it, relative to its first row.
+    chunks = []
+    row = 0
+    for i in range(0, len(output), _display_chunk):
+        lines = output[i:i + _display_chunk]
+        rows = lint_output_rows(lines)
+        chunks.append(("\n".join(lines),
+                       [(fold[0] - row,) + fold[1:] for fold in folds or []
+                        if row <= fold[0] < row + rows]))
+        row += rows
+
+    def write(index):
+        text, chunk_folds = chunks[index]
+        if index + 1 < len(chunks):
+            append_lint(view, text + "\n", chunk_folds)
+            sublime.set_timeout(lambda: write(index + 1), 0)
+        else:
+            append_lint(view, text, chunk_folds)
+
+    if chunks:
+        write(0)
+
+    show_lint_view(window, view, prev_view)
+
+
+def close_lint_output():
+    """
+    Close the LintOutput that is currently displaying in the lint view, if
+    there is one, so that the lint sending output to it stops.
+    """
+    if LintOutput.current is not None:
+        LintOutput.current.close()
+        LintOutput.current = None
+
+
+###----------------------------------------------------------------------------
+
+
+class LintOutput():
+    """
+    Display the lint output for a target in a window incrementally, as the
+    results for each file become available, followed by everything else once
+    the lint is finished.
+
+    This must be created in the main thread, but the other methods can be
+    called from any thread; the view is only ever touched from the main
+    thread. Once closed, any further output is discarded; this is how a lint
+    that is still running finds out that it has been superseded.
+
+    All lints share the same lint view, so the newest output is kept as the
+    current one; see close_lint_output().
+    """
+    current = None
+
+    def __init__(self, window, target):
+        LintOutput.current = self
+
+        self.window = window
+        self.target = target
+        self.closed = False
+
+        self.warn = 0
+        self.err = 0
+        self.shown = Counter()
+
+        self.limit = hha_setting("lint_max_file_issues") or 0
+
+        self.prev_view = window.active_view()
+        self.view = prepare_lint_view(window, target)
+
+        append_lint(self.view, format_lint_header(target) + "\n")
+        show_lint_view(window, self.view)
+
+    def close(self):
+        self.closed = True
+
+    def add_file(self, file, issues):
+        """
+        Display the issues for a single file that has just been linted; any
+        issues in the list that are for other files are held back until the
+        lint is finished.
+        """
+        issues = [issue for issue in issues if issue.file == file]
+        if issues:
+            self.shown.update(issues)
+            self._append_file(file, issues)
+
+    def finish(self, issues, profile=None):
+        """
+        Display all of the issues in the final list of LintResult issues that
+        have not already been displayed, followed by the summary (and the
+        footer for the LintProfile, if one is given) and then close the
+        output.
+        """
+        remaining = []
+        for issue in issues:
+            if self.shown[issue] > 0:
+                self.shown[issue] -= 1
+            else:
+                remaining.append(issue)
+
+        for file, file_issues in group_lint(remaining).items():
+            self._append_file(file, file_issues)
+
+        output = [format_lint_summary(self.warn, self.err)]
+        if profile is not None:
+            output.append("")
+            output.extend(profile.footer())
+
+        self._append(output, final=True)
+
+    def _append_file(self, file, issues):
+        """
+        Display the issues for a file, folding away any that are over the
+        limit.
+        """
+        warn, err = count_lint(issues)
+        self.warn += warn
+        self.err += err
+
+        folds = None
+        if self.limit and len(issues) > self.limit:
+            # The fold follows the file name and the issues that are shown.
+            folds = [(1 + self.limit, file, issues[self.limit:])]
+
+        self._append(format_lint_file(file, issues, self.limit), folds)
+
+    def _append(self, output, folds=None, final=False):
+        text = "\n".join(output) + ("" if final else "\n")
+        sublime.set_timeout(lambda: self._write(text, folds, final), 0)
+
+    def _write(self, text, folds, final):
+        if self.closed:
+            return
+
+        append_lint(self.view, text, folds)
+
+        if final:
+            self.closed = True
+            if self.window.active_view() == self.view:
+                show_lint_view(self.window, self.view, self.prev_view)
+
+
+###----------------------------------------------------------------------------
+
+
+class LintAllOutput(LintOutput):
+    """
+    Display the output of a lint of all help packages, one package at a time
+    as they finish, followed by a summary for each package and the totals.
+    Files are named relative to the Packages folder, so that they can be told
+    apart and navigated to.
+    """
+    def __init__(self, window, target):
+        super().__init__(window, target)
+        self.counts = []
+
+    def add_package(self, target, issues):
+        """
+        Display the list of LintResult issues for a package that has just
+        been linted.
+        """
+        warn, err = self.warn, self.err
+        doc_root = target.pkg_info.doc_root.strip("/")
+        for file, file_issues in group_lint(issues).items():
+            path = posixpath.join(doc_root, file)
+            self._append_file(path, [issue._replace(file=path)
+                                     for issue in file_issues])
+
+        self.counts.append((target.pkg_info.package,
+                            self.warn - warn, self.err - err))
+
+    def finish(self, issues=None, profile=None):
+        """
+        Display the summary of all of the packages, followed by the footer
+        for each of the LintProfiles in profile (if any), and then close the
+        output.
+        """
+        output = format_lint_packages(self.counts)
+        for package_profile in profile or []:
+            output.append("")
+            output.extend(package_profile.footer())
+
+        self._append(output, final=True)
+
+
 ###----------------------------------------------------------------------------
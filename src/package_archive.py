@@ -0,0 +1,329 @@
+import sublime
+
+import os
+import zlib
+import codecs
+import struct
+import zipfile
+import threading
+
+
+###----------------------------------------------------------------------------
+
+
+# The fixed part of the local header that precedes each member in a zip file.
+_LOCAL_HEADER = struct.Struct("<4sHHHHHLLLHH")
+_LOCAL_SIGNATURE = b"PK\003\004"
+
+# How much compressed data to read from an archive at a time.
+_CHUNK_SIZE = 64 * 1024
+
+
+def _stamp(path):
+    """
+    Return a stamp for the given file that changes when the file does, or
+    None if it does not exist.
+    """
+    try:
+        info = os.stat(path)
+        return (info.st_mtime, info.st_size)
+    except OSError:
+        return None
+
+
+def package_archive_paths(pkg):
+    """
+    Return the possible locations of the packed package file for the given
+    package, in priority order; a package in the Installed Packages folder
+    overrides one that ships with Sublime.
+    """
+    return [
+        os.path.join(sublime.installed_packages_path(),
+                     pkg + ".sublime-package"),
+        os.path.join(os.path.dirname(sublime.executable_path()),
+                     "Packages", pkg + ".sublime-package")
+    ]
+
+
+###----------------------------------------------------------------------------
+
+
+class PackageArchive():
+    """
+    A packed package file, with its central directory read once and indexed
+    by member name so that members can be found without going through
+    zipfile again.
+
+    Member contents are streamed straight out of the archive and decompressed
+    in memory; nothing is extracted to disk. The file handle is opened when a
+    member is first read and stays open until close() is called, so reading
+    several members in a row only opens the archive once.
+    """
+    def __init__(self, path, stamp):
+        self.path = path
+        self.stamp = stamp
+        self._lock = threading.RLock()
+        self._handle = None
+
+        with zipfile.ZipFile(path) as archive:
+            self.members = {info.filename: info
+                            for info in archive.infolist()
+                            if not info.filename.endswith("/")}
+
+    def names(self):
+        """
+        Return a list of the names of all of the files in the archive.
+        """
+        return list(self.members)
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def iter_member(self, name):
+        """
+        Yield the uncompressed content of the named member as a series of
+        byte strings. Raises KeyError if there is no such member and
+        zipfile.BadZipfile if the archive is damaged; encrypted or unusually
+        compressed members are read with zipfile, which can also raise
+        RuntimeError or NotImplementedError when it can't read them.
+        """
+        info = self.members[name]
+        if (info.flag_bits & 0x1 or
+                info.compress_type not in (zipfile.ZIP_STORED,
+                                           zipfile.ZIP_DEFLATED)):
+            # Encrypted or unusually compressed; let zipfile deal with it.
+            with zipfile.ZipFile(self.path) as archive:
+                yield archive.read(info)
+            return
+
+        inflate = None
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            inflate = zlib.decompressobj(-15)
+
+        offset = self._data_offset(info)
+        remaining = info.compress_size
+
+        crc = 0
+        while remaining > 0:
+            chunk = self._read_raw(info, offset, min(_CHUNK_SIZE, remaining))
+            offset += len(chunk)
+            remaining -= len(chunk)
+
+            if inflate is not None:
+                chunk = inflate.decompress(chunk)
+
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+
+        if inflate is not None:
+            tail = inflate.flush()
+            crc = zlib.crc32(tail, crc)
+            yield tail
+
+        if crc != info.CRC:
+            raise zipfile.BadZipfile("Bad CRC-32 for '%s' in '%s'" % (
+                name, self.path))
+
+    def read(self, name, encoding="utf-8"):
+        """
+        Return the content of the named member decoded as text, or None if
+        there is no such member or it can't be read.
+        """
+        if name not in self.members:
+            return None
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            text = [decoder.decode(chunk) for chunk in self.iter_member(name)]
+            text.append(decoder.decode(b"", final=True))
+        except (OSError, zlib.error, zipfile.BadZipfile, UnicodeDecodeError,
+                RuntimeError, NotImplementedError):
+            return None
+
+        return "".join(text)
+
+    def close(self):
+        """
+        Close the file handle for the archive, if it's open.
+        """
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _open_handle(self):
+        """
+        Return the file handle for the archive, opening it if needed. Must be
+        called with the lock held.
+        """
+        if self._handle is None:
+            self._handle = open(self.path, "rb")
+
+        return self._handle
+
+    def _data_offset(self, info):
+        """
+        Return the offset in the archive of the raw (possibly compressed)
+        data for the given member, which follows its local header.
+        """
+        with self._lock:
+            handle = self._open_handle()
+            handle.seek(info.header_offset)
+            header = handle.read(_LOCAL_HEADER.size)
+
+        if len(header) != _LOCAL_HEADER.size:
+            raise zipfile.BadZipfile("Truncated local header for '%s' in '%s'"
+                                     % (info.filename, self.path))
+
+        header = _LOCAL_HEADER.unpack(header)
+        if header[0] != _LOCAL_SIGNATURE:
+            raise zipfile.BadZipfile("Bad local header for '%s' in '%s'" % (
+                info.filename, self.path))
+
+        return info.header_offset + _LOCAL_HEADER.size + header[9] + header[10]
+
+    def _read_raw(self, info, offset, size):
+        """
+        Return size bytes of the raw data for the given member, starting at
+        the given offset in the archive. The lock is only held for the seek
+        and read, so reads of different members can interleave on the shared
+        handle a chunk at a time.
+        """
+        with self._lock:
+            handle = self._open_handle()
+            handle.seek(offset)
+            chunk = handle.read(size)
+
+        if len(chunk) != size:
+            raise zipfile.BadZipfile("Truncated data for '%s' in '%s'" % (
+                info.filename, self.path))
+
+        return chunk
+
+
+###----------------------------------------------------------------------------
+
+
+class ArchiveCache():
+    """
+    A cache of PackageArchive instances by file name. An archive is read
+    again if the file changes on disk.
+
+    Open file handles are only kept for the length of a session; reads that
+    happen outside of a session close the archive again right away, so that
+    packed packages are never held open while Sublime is otherwise idle (which
+    would stop them from being upgraded on Windows).
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._archives = {}
+        self._sessions = 0
+
+    def archive(self, path):
+        """
+        Return the PackageArchive for the given packed package file, or None
+        if it does not exist or is not a valid archive.
+        """
+        stamp = _stamp(path)
+        with self._lock:
+            archive = self._archives.get(path)
+            if archive is not None and archive.stamp == stamp:
+                return archive
+
+            if archive is not None:
+                archive.close()
+                del self._archives[path]
+
+            if stamp is None:
+                return None
+
+            try:
+                archive = self._archives[path] = PackageArchive(path, stamp)
+            except (IOError, OSError, zipfile.BadZipfile):
+                return None
+
+            return archive
+
+    def package(self, pkg):
+        """
+        Return the PackageArchive that Sublime would load the given package
+        from, or None if the package isn't packed.
+        """
+        for path in package_archive_paths(pkg):
+            archive = self.archive(path)
+            if archive is not None:
+                return archive
+
+        return None
+
+    def read(self, pkg, name, encoding="utf-8"):
+        """
+        Return the text of the file with the given name (relative to the
+        package root) from the packed package with the given name, or None if
+        there is no such file.
+        """
+        archive = self.package(pkg)
+        if archive is None:
+            return None
+
+        try:
+            return archive.read(name, encoding)
+        finally:
+            if not self._sessions:
+                archive.close()
+
+    def session(self):
+        """
+        Return a context manager that keeps archive handles open for reuse
+        until it exits; sessions can nest.
+        """
+        return _ArchiveSession(self)
+
+    def close(self):
+        """
+        Close the file handles of all of the cached archives; their indexes
+        are kept.
+        """
+        with self._lock:
+            for archive in self._archives.values():
+                archive.close()
+
+
+class _ArchiveSession():
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __enter__(self):
+        with self.cache._lock:
+            self.cache._sessions += 1
+
+        return self.cache
+
+    def __exit__(self, *exc):
+        with self.cache._lock:
+            self.cache._sessions -= 1
+            if not self.cache._sessions:
+                self.cache.close()
+
+
+###----------------------------------------------------------------------------
+
+
+# The shared cache of packed package files.
+package_archives = ArchiveCache()
+
+
+def read_packed_resource(res, encoding="utf-8"):
+    """
+    Return the text of the resource with the given name (for example
+    Packages/Package/help/index.txt) from the packed package that holds it,
+    or None if the package is not packed or has no such file.
+    """
+    if not res.startswith("Packages/"):
+        return None
+
+    pkg, _, name = res[len("Packages/"):].partition("/")
+    return package_archives.read(pkg, name, encoding)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,523 @@
+import sublime
+
+import os
+import re
+import json
+import shutil
+import tempfile
+from collections import namedtuple, OrderedDict
+
+from hyperhelpcore.common import log
+
+from .common import local_help_filename, local_help_index, reload_help_index
+from .common import format_template
+from .document import HelpDocument
+from .index_snapshot import normalize_topic
+from .inline_lint import refresh_inline_lint
+from .link_graph import links_to
+from .save_reload import refresh_help_views
+
+
+###----------------------------------------------------------------------------
+
+
+# A refactoring that is ready to be applied. files maps the full path of each
+# file to change to its new content, packages is the set of packages with
+# files being changed, sites is the number of anchors, links and index entries
+# being edited and skipped is a list of (package, file) tuples for files that
+# needed an edit but can't be changed because they're in a packed package.
+RefactorPlan = namedtuple("RefactorPlan", [
+    "pkg_info", "files", "packages", "sites", "skipped"
+])
+
+# A string in a help index; path is the keys that lead to it from the top of
+# the index, with "[]" standing for an array element.
+JsonString = namedtuple("JsonString", ["path", "start", "end", "value"])
+
+# An object or array in a help index; kind is "{" or "[" and items is a list
+# of (start, end) spans for the values in it.
+JsonContainer = namedtuple("JsonContainer", [
+    "path", "kind", "start", "end", "items"
+])
+
+
+# The tokens in a help index, which may contain comments.
+_json_token_re = re.compile(r'''
+      (?P<space>   \s+)
+    | (?P<comment> //[^\n]*|/\*.*?\*/)
+    | (?P<string>  "(?:[^"\\]|\\.)*")
+    | (?P<punct>   [{}\[\]:,])
+    | (?P<other>   [^\s{}\[\]:,"/]+)
+    ''', re.VERBOSE | re.DOTALL)
+
+# Characters that can't appear in a topic name.
+_bad_topic_re = re.compile(r'[|*:]')
+
+
+###----------------------------------------------------------------------------
+
+
+class _JsonFrame():
+    __slots__ = ("path", "kind", "start", "key", "expect_key", "items")
+
+    def __init__(self, path, kind, start):
+        self.path = path
+        self.kind = kind
+        self.start = start
+        self.key = None
+        self.expect_key = kind == "{"
+        self.items = []
+
+    def value_path(self):
+        return self.path + (("[]",) if self.kind == "[" else (self.key,))
+
+
+def scan_help_index(text):
+    """
+    Scan the raw text of a help index, returning a tuple of lists of the
+    JsonString and JsonContainer values in it, so that the index can be
+    edited in place without disturbing its layout or comments.
+    """
+    strings = []
+    containers = []
+    stack = []
+
+    for match in _json_token_re.finditer(text):
+        kind, token = match.lastgroup, match.group()
+        start, end = match.span()
+        if kind in ("space", "comment"):
+            continue
+
+        frame = stack[-1] if stack else None
+        if kind == "punct":
+            if token in "{[":
+                path = frame.value_path() if frame is not None else ()
+                stack.append(_JsonFrame(path, token, start))
+
+            elif token in "}]" and stack:
+                frame = stack.pop()
+                containers.append(JsonContainer(frame.path, frame.kind,
+                                                frame.start, end, frame.items))
+                if stack:
+                    stack[-1].items.append((frame.start, end))
+
+            elif token == "," and frame is not None and frame.kind == "{":
+                frame.expect_key = True
+
+            continue
+
+        value = json.loads(token) if kind == "string" else token
+        if frame is not None and frame.expect_key:
+            frame.key = value
+            frame.expect_key = False
+            continue
+
+        if kind == "string":
+            path = frame.value_path() if frame is not None else ()
+            strings.append(JsonString(path, start, end, value))
+
+        if frame is not None:
+            frame.items.append((start, end))
+
+    return (strings, containers)
+
+
+def _apply_edits(text, edits):
+    """
+    Apply a list of (start, end, replacement) edits to the given text; the
+    edits must not overlap.
+    """
+    for start, end, replacement in sorted(edits, reverse=True):
+        text = text[:start] + replacement + text[end:]
+
+    return text
+
+
+###----------------------------------------------------------------------------
+
+
+def _read_file(path):
+    """
+    Read the given file, returning a tuple of its content (with Unix line
+    endings) and whether it had Windows line endings, or None if it can't be
+    read.
+    """
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as handle:
+            content = handle.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    return (content.replace("\r\n", "\n"), "\r\n" in content)
+
+
+def _file_content(text, crlf):
+    return text.replace("\n", "\r\n") if crlf else text
+
+
+def write_file_atomic(path, content):
+    """
+    Write the given content to the given file by writing it to a temporary
+    file alongside it and then replacing the original with it, so that the
+    file is never left half written. The new file keeps the permissions of
+    the original.
+    """
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(path),
+                                prefix=os.path.basename(path) + ".",
+                                suffix=".hha-tmp")
+    try:
+        with open(fd, "w", encoding="utf-8", newline="") as handle:
+            handle.write(content)
+
+        shutil.copymode(path, temp)
+        os.replace(temp, path)
+    except OSError:
+        os.remove(temp)
+        raise
+
+
+def _dirty_views(paths):
+    """
+    Return the list of the given files that are open in a view that has
+    unsaved changes.
+    """
+    dirty = []
+    for window in sublime.windows():
+        for path in paths:
+            view = window.find_open_file(path)
+            if view is not None and view.is_dirty():
+                dirty.append(path)
+
+    return dirty
+
+
+def _refactor_error(message, *args):
+    log(format_template(message, *args), dialog=True)
+
+
+###----------------------------------------------------------------------------
+
+
+def _rename_anchor_body(body, new_topic):
+    """
+    Return the body of an anchor with its topic changed to the new topic; an
+    anchor whose text is its topic gets the new topic as its text as well.
+    """
+    topic, sep, text = body.partition(":")
+    return new_topic + sep + text if sep else new_topic
+
+
+def _rename_link_body(body, new_topic):
+    """
+    Return the body of a link with the topic that it links to changed to the
+    new topic; a link whose text is its topic gets the new topic as its text
+    as well.
+    """
+    parts = body.split(":")
+    if len(parts) == 1:
+        return new_topic
+
+    parts[1] = new_topic
+    return ":".join(parts)
+
+
+def plan_topic_rename(index_list, pkg_info, topic, new_topic):
+    """
+    Work out everything that has to change to rename the given topic in the
+    given package to the new topic; the anchor for the topic, every link in
+    every help package that links to it by name (links to an alias of the
+    topic are left alone) and the entries for it in the help index and table
+    of contents.
+
+    The help files that link to the topic are found from the link graphs of
+    the packages, so only those files (and the one with the anchor) are read;
+    every graph is refreshed first, so links added since the last lint are
+    renamed too.
+
+    Returns a RefactorPlan, or None if the rename can't be done; the reason
+    is reported in a dialog.
+    """
+    key = normalize_topic(topic)
+    new_key = normalize_topic(new_topic)
+    entry = pkg_info.help_topics.get(key)
+
+    if key in pkg_info.help_aliases:
+        return _refactor_error("'%s' is an alias of topic '%s', not a topic",
+                               topic, pkg_info.help_aliases[key])
+
+    if entry is None:
+        return _refactor_error("Topic '%s' does not exist in '%s'",
+                               topic, pkg_info.package)
+
+    if key in pkg_info.help_files:
+        return _refactor_error(
+            """
+            Topic '%s' is the name of a help file; help files can't
+            be renamed this way.
+            """, topic)
+
+    if not new_key or _bad_topic_re.search(new_topic):
+        return _refactor_error("'%s' is not a valid topic name", new_topic)
+
+    if new_key != key and (new_key in pkg_info.help_topics or
+                           new_key in pkg_info.help_aliases):
+        return _refactor_error("Topic '%s' already exists in '%s'",
+                               new_topic, pkg_info.package)
+
+    # The files with an edit in them, as (package, file) tuples.
+    targets = {(pkg_info.package, entry["file"])}
+    targets.update((link_pkg, file) for link_pkg, file, link in
+                   links_to(index_list, pkg_info.package, key)
+                   if normalize_topic(link.topic) == key)
+
+    files = OrderedDict()
+    packages = set()
+    skipped = []
+    sites = 0
+
+    for link_pkg, file in sorted(targets):
+        path = local_help_filename(index_list[link_pkg], file)
+        loaded = _read_file(path) if os.path.isfile(path) else None
+        if loaded is None:
+            skipped.append((link_pkg, file))
+            continue
+
+        text, crlf = loaded
+        scan = HelpDocument(text, path).scan()
+        edits = []
+
+        if link_pkg == pkg_info.package and file == entry["file"]:
+            edits.extend((anchor.point, anchor.point + len(anchor.body),
+                          _rename_anchor_body(anchor.body, new_topic))
+                         for anchor in scan.anchors
+                         if normalize_topic(anchor.topic) == key)
+
+        edits.extend((link.point, link.point + len(link.body),
+                      _rename_link_body(link.body, new_topic))
+                     for link in scan.links
+                     if (link.topic is not None and
+                         (link.pkg or link_pkg) == pkg_info.package and
+                         normalize_topic(link.topic) == key))
+
+        if edits:
+            files[path] = _file_content(_apply_edits(text, edits), crlf)
+            packages.add(link_pkg)
+            sites += len(edits)
+
+    index_path = local_help_index(pkg_info)
+    loaded = _read_file(index_path)
+    if loaded is None:
+        return _refactor_error("Unable to read the help index for '%s'",
+                               pkg_info.package)
+
+    text, crlf = loaded
+    strings, containers = scan_help_index(text)
+    edits = [(string.start, string.end, json.dumps(new_topic))
+             for string in strings
+             if (isinstance(string.value, str) and
+                 normalize_topic(string.value) == key and
+                 _is_topic_reference(string.path))]
+
+    files[index_path] = _file_content(_apply_edits(text, edits), crlf)
+    packages.add(pkg_info.package)
+    sites += len(edits)
+
+    return _checked_plan(RefactorPlan(pkg_info, files, packages, sites,
+                                      skipped))
+
+
+def _is_topic_reference(path):
+    """
+    Determine if a string in a help index at the given path names a topic;
+    that is the topic of an entry in help_files, or an entry in the table of
+    contents.
+    """
+    if len(path) == 4 and path[0] == "help_files":
+        return path[2:] == ("[]", "topic")
+
+    if path[:1] == ("help_contents",):
+        return path[-1] == "topic" or path[-2:] in (
+            ("help_contents", "[]"), ("children", "[]"))
+
+    return False
+
+
+###----------------------------------------------------------------------------
+
+
+def _anchor_section(text, scan, anchor):
+    """
+    Return the (start, end) span of the section of a help file that the given
+    anchor starts; that's from the start of the line the anchor is on up to
+    the start of the line with the next anchor, or the end of the file.
+    """
+    start = text.rfind("\n", 0, anchor.point) + 1
+    end = len(text)
+    for other in scan.anchors:
+        if other.point > anchor.point and other.line > anchor.line:
+            end = text.rfind("\n", 0, other.point) + 1
+            break
+
+    return (start, end)
+
+
+def plan_topic_move(index_list, pkg_info, topic, new_file):
+    """
+    Work out everything that has to change to move the given topic in the
+    given package to a different help file; the section of the help file
+    that the anchor for the topic starts is moved to the end of the new file,
+    and the entry for the topic in the help index is moved to the list of
+    topics for the new file. Links resolve by topic, so none of them change.
+
+    Returns a RefactorPlan, or None if the move can't be done; the reason is
+    reported in a dialog.
+    """
+    key = normalize_topic(topic)
+    entry = pkg_info.help_topics.get(key)
+
+    if entry is None:
+        return _refactor_error("Topic '%s' does not exist in '%s'",
+                               topic, pkg_info.package)
+
+    old_file = entry["file"]
+    if key in pkg_info.help_files:
+        return _refactor_error(
+            "Topic '%s' is the name of a help file and can't be moved", topic)
+
+    if new_file not in pkg_info.help_files:
+        return _refactor_error("Help file '%s' does not exist in '%s'",
+                               new_file, pkg_info.package)
+
+    if new_file == old_file:
+        return _refactor_error("Topic '%s' is already in '%s'", topic,
+                               new_file)
+
+    files = OrderedDict()
+    old_path = local_help_filename(pkg_info, old_file)
+    new_path = local_help_filename(pkg_info, new_file)
+    index_path = local_help_index(pkg_info)
+
+    loaded = [_read_file(path) for path in (old_path, new_path, index_path)]
+    if None in loaded:
+        return _refactor_error(
+            """
+            Unable to move topic '%s'; the help files and index for
+            '%s' must all exist locally.
+            """, topic, pkg_info.package)
+
+    (old_text, old_crlf), (new_text, new_crlf), (text, crlf) = loaded
+
+    scan = HelpDocument(old_text, old_path).scan()
+    anchor = next((anchor for anchor in scan.anchors
+                   if normalize_topic(anchor.topic) == key), None)
+    if anchor is None:
+        return _refactor_error("There is no anchor for topic '%s' in '%s'",
+                               topic, old_file)
+
+    start, end = _anchor_section(old_text, scan, anchor)
+    section = old_text[start:end].rstrip("\n")
+
+    files[old_path] = _file_content(old_text[:start] + old_text[end:],
+                                    old_crlf)
+    files[new_path] = _file_content(
+        new_text.rstrip("\n") + "\n\n" + section + "\n", new_crlf)
+    sites = 1
+
+    strings, containers = scan_help_index(text)
+    arrays = {container.path[1]: container for container in containers
+              if container.kind == "[" and len(container.path) == 2 and
+              container.path[0] == "help_files"}
+
+    topic_entry = next(
+        (container for container in containers
+         if container.kind == "{" and
+            container.path == ("help_files", old_file, "[]") and
+            any(string.path == ("help_files", old_file, "[]", "topic") and
+                container.start < string.start < container.end and
+                normalize_topic(string.value) == key
+                for string in strings)),
+        None)
+
+    source, target = arrays.get(old_file), arrays.get(new_file)
+    if topic_entry is None or source is None or target is None:
+        return _refactor_error(
+            "Unable to find the entry for topic '%s' in the help index", topic)
+
+    # The entry is never the first item, since that is the file title.
+    position = source.items.index((topic_entry.start, topic_entry.end))
+    entry_text = text[topic_entry.start:topic_entry.end]
+
+    last = target.items[-1]
+    separator = (text[target.items[-2][1]:target.items[-1][0]]
+                 if len(target.items) > 1 else ", ")
+
+    edits = [(source.items[position - 1][1], topic_entry.end, ""),
+             (last[1], last[1], separator + entry_text)]
+    files[index_path] = _file_content(_apply_edits(text, edits), crlf)
+    sites += 1
+
+    return _checked_plan(RefactorPlan(pkg_info, files, {pkg_info.package},
+                                      sites, []))
+
+
+###----------------------------------------------------------------------------
+
+
+def _checked_plan(plan):
+    """
+    Return the given plan, unless one of the files that it changes has
+    unsaved changes in a view, in which case that is reported and None is
+    returned.
+    """
+    dirty = _dirty_views(plan.files)
+    if dirty:
+        return _refactor_error(
+            """
+            Unable to refactor; save or revert the unsaved changes
+            to these files first: %s
+            """, ", ".join(os.path.basename(path) for path in dirty))
+
+    return plan
+
+
+def confirm_refactor(plan, title, button):
+    """
+    Show the files that the provided RefactorPlan changes (and those that it
+    can't) in a dialog under the given title before anything is written,
+    returning True if the user confirms it with the given button.
+    """
+    spp = sublime.packages_path()
+    msg = format_template("%s; %d edit(s) in %d file(s):", title,
+                          plan.sites, len(plan.files))
+    msg += "\n\n" + "\n".join(
+        "    " + os.path.relpath(path, spp).replace(os.sep, "/")
+        for path in plan.files)
+
+    if plan.skipped:
+        msg += "\n\nNot changed (packed): " + ", ".join(
+            "%s/%s" % item for item in plan.skipped)
+
+    return sublime.ok_cancel_dialog(msg, button)
+
+
+def apply_refactor(plan):
+    """
+    Apply the provided RefactorPlan, writing each file that it changes once,
+    and then reload the help index of the package a single time. Help files
+    that are open in views are reloaded by Sublime as they change on disk.
+
+    Returns the number of files written.
+    """
+    for path, content in plan.files.items():
+        write_file_atomic(path, content)
+
+    result = reload_help_index(plan.pkg_info.index_file)
+    if result is not None:
+        refresh_inline_lint(result[1])
+
+    refresh_help_views({package: None for package in plan.packages})
+
+    return len(plan.files)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,258 @@
+import sublime
+
+import os
+import fnmatch
+import threading
+
+from hyperhelpcore.core import is_topic_file_valid as core_topic_file_valid
+
+from .package_archive import package_archives, package_archive_paths
+
+
+###----------------------------------------------------------------------------
+
+
+def _mtime(path):
+    """
+    Return the modification time of the given path, or None if it does not
+    exist.
+    """
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _split_resource(res):
+    """
+    Split a resource name into its package, the folder within the package and
+    the file name. Returns None for resources that are not in a package.
+    """
+    if not res.startswith("Packages/"):
+        return None
+
+    pkg, _, rest = res[len("Packages/"):].partition("/")
+    folder, _, name = rest.rpartition("/")
+    return (pkg, folder, name)
+
+
+def _parent_folders(folder):
+    """
+    Return a list of the given folder within a package and every folder above
+    it, starting with the package root ("").
+    """
+    parts = folder.split("/") if folder else []
+    return ["/".join(parts[:i]) for i in range(len(parts) + 1)]
+
+
+def _folder_stamps(pkg, dirs):
+    """
+    Return the modification times of the unpacked folders on disk for the
+    given package, which has the provided folders, keyed by folder; the
+    package root and every folder above one of the provided folders are
+    included.
+    """
+    root = os.path.join(sublime.packages_path(), pkg)
+    folders = {name for folder in dirs for name in _parent_folders(folder)}
+    return {name: _mtime(os.path.join(root, name)) for name in folders}
+
+
+###----------------------------------------------------------------------------
+
+
+class ResourceInventory():
+    """
+    An index of all of the package resources that Sublime knows about, grouped
+    by package and then by folder within the package, so that questions about
+    the resources in a package or a folder can be answered without going back
+    to sublime.find_resources(), which has to look at every resource in every
+    package.
+
+    The whole inventory is built the first time that it's needed and thrown
+    away if packages are added or removed (based on the modification time of
+    the package folders) or when invalidate() is called. Queries about a
+    folder check the modification times of that folder, the folders above it
+    and the folders below it on disk against those recorded when the package
+    was scanned, so resources (and folders) that are created or deleted there
+    are picked up by rescanning only the package that contains them.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._packages = None
+        self._stamps = {}
+        self._roots = None
+        self._ignored = None
+
+    def invalidate(self, package=None):
+        """
+        Throw away the resources for the given package, or for all packages if
+        no package is given; they will be gathered again when next needed.
+        """
+        with self._lock:
+            if package is None or self._packages is None:
+                self._packages = None
+            else:
+                self._stamps.pop(package, None)
+                self._rescan_package(package)
+
+    def preferences_changed(self):
+        """
+        Invalidate the inventory if the list of ignored packages has changed;
+        this is meant to be called whenever the user preferences change.
+        """
+        prefs = sublime.load_settings("Preferences.sublime-settings")
+        ignored = sorted(prefs.get("ignored_packages", []))
+        if self._ignored is not None and ignored != self._ignored:
+            self.invalidate()
+
+        self._ignored = ignored
+
+    def packages(self):
+        """
+        Return the set of package names that have at least one resource.
+        """
+        return set(self._inventory())
+
+    def find(self, path, pattern="*"):
+        """
+        Return a sorted list of the resources in the provided package path (a
+        package name, optionally followed by a folder within it) or any folder
+        below it whose file name matches the given pattern.
+        """
+        pkg, _, folder = path.strip("/").partition("/")
+        dirs = self._package_dirs(pkg, folder)
+
+        results = []
+        for name, files in dirs.items():
+            if folder and name != folder and not name.startswith(folder + "/"):
+                continue
+
+            prefix = "Packages/%s/%s" % (pkg, name + "/" if name else "")
+            results.extend(prefix + file
+                           for file in fnmatch.filter(files, pattern))
+
+        return sorted(results)
+
+    def exists(self, res):
+        """
+        Determine if the resource with the given name exists.
+        """
+        parts = _split_resource(res)
+        if parts is None:
+            return False
+
+        pkg, folder, name = parts
+        return name in self._package_dirs(pkg, folder).get(folder, ())
+
+    def _inventory(self):
+        """
+        Return the inventory of resources, gathering it again if it has not
+        been gathered yet or packages have been added or removed since.
+        """
+        with self._lock:
+            roots = (_mtime(sublime.packages_path()),
+                     _mtime(sublime.installed_packages_path()))
+
+            if self._packages is None or roots != self._roots:
+                self._roots = roots
+                self._stamps = {}
+                self._packages = {}
+
+                for res in sublime.find_resources(""):
+                    parts = _split_resource(res)
+                    if parts is not None:
+                        pkg, folder, name = parts
+                        dirs = self._packages.setdefault(pkg, {})
+                        dirs.setdefault(folder, set()).add(name)
+
+                for pkg, dirs in self._packages.items():
+                    self._stamps[pkg] = _folder_stamps(pkg, dirs)
+
+            return self._packages
+
+    def _package_dirs(self, pkg, folder):
+        """
+        Return the folders and files for the given package, rescanning the
+        package first if the given folder, a folder above it or one below it
+        has been changed on disk since the package was last scanned. Folders
+        that did not exist when the package was scanned have no stamp, so
+        creating one is a change too.
+        """
+        with self._lock:
+            dirs = self._inventory().get(pkg, {})
+            stamps = self._stamps.get(pkg, {})
+
+            check = _parent_folders(folder)
+            check.extend(name for name in dirs if name.startswith(folder + "/"))
+
+            for name in check:
+                path = os.path.join(sublime.packages_path(), pkg, name)
+                if stamps.get(name) != _mtime(path):
+                    return self._rescan_package(pkg)
+
+            return dirs
+
+    def _rescan_package(self, pkg):
+        """
+        Gather the resources for a single package from the packed package
+        files and the unpacked package folder for it, and update the inventory
+        with them.
+        """
+        dirs = {}
+        for path in package_archive_paths(pkg):
+            archive = package_archives.archive(path)
+            if archive is None:
+                continue
+
+            for name in archive.names():
+                folder, _, file = name.rpartition("/")
+                dirs.setdefault(folder, set()).add(file)
+
+        root = os.path.join(sublime.packages_path(), pkg)
+        stamps = {}
+        for path, subdirs, files in os.walk(root):
+            folder = os.path.relpath(path, root).replace(os.sep, "/")
+            folder = "" if folder == "." else folder
+            stamps[folder] = _mtime(path)
+            if files:
+                dirs.setdefault(folder, set()).update(files)
+
+        packages = self._inventory()
+        self._stamps[pkg] = stamps
+        if dirs:
+            packages[pkg] = dirs
+        else:
+            packages.pop(pkg, None)
+
+        return dirs
+
+
+###----------------------------------------------------------------------------
+
+
+# The shared inventory of package resources.
+resource_inventory = ResourceInventory()
+
+
+def help_file_exists(pkg_info, file):
+    """
+    Determine if the provided help file exists in the doc_root of the given
+    package.
+    """
+    return resource_inventory.exists(
+        "Packages/%s/%s" % (pkg_info.doc_root.rstrip("/"), file))
+
+
+def is_topic_file_valid(pkg_info, topic_dict):
+    """
+    A drop in replacement for the hyperhelpcore function of the same name that
+    answers from the resource inventory for topics in help files, which is the
+    overwhelmingly common case. Other kinds of topics are left to hyperhelpcore.
+    """
+    file = topic_dict["file"]
+    if file in pkg_info.help_files:
+        return help_file_exists(pkg_info, file)
+    return core_topic_file_valid(pkg_info, topic_dict)
+
+
+###----------------------------------------------------------------------------
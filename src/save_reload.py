@@ -0,0 +1,154 @@
+import sublime
+
+import posixpath
+import threading
+
+from hyperhelpcore.core import load_help_index
+from hyperhelpcore.view import find_help_view
+
+from .common import hha_setting, is_authoring_source, package_for_view
+from .common import package_relative_path, install_help_index
+from .common import reload_help_view
+from .inline_lint import refresh_inline_lint
+
+
+###----------------------------------------------------------------------------
+
+
+# The reloads waiting to happen, keyed by package. For each package this is
+# the resource name of the help index to reload (or None) and the set of help
+# files that were saved.
+_pending = {}
+
+# Incremented on every save that queues a reload; only the most recent save
+# in a burst of them triggers the reloads.
+_saves = 0
+
+_lock = threading.Lock()
+
+
+###----------------------------------------------------------------------------
+
+
+def queue_save_reload(view):
+    """
+    Queue up whatever needs to be reloaded now that the file in the provided
+    view has been saved: the help index if it's a help index, and the help
+    file in the help view if it's a help file that is being displayed.
+
+    Reloads happen after reload_on_save_delay has elapsed. Saving again before
+    that restarts the delay, so a burst of saves (such as from Save All)
+    causes only one reload for each package. Help indexes are loaded in the
+    async thread, but only put in place in the main thread, as that changes
+    the help index list that everything else reads from there.
+    """
+    global _saves
+
+    name = package_relative_path(view.file_name())
+    if name is None:
+        return
+
+    if view.match_selector(0, "text.hyperhelp.index"):
+        if not hha_setting("reload_index_on_save"):
+            return
+
+        package = name.split("/")[0]
+        index, file = "Packages/" + name, None
+
+    elif is_authoring_source(view):
+        pkg_info = package_for_view(view)
+        if pkg_info is None or not hha_setting("reload_help_on_save"):
+            return
+
+        package = pkg_info.package
+        index, file = None, posixpath.relpath(name, pkg_info.doc_root)
+
+    else:
+        return
+
+    with _lock:
+        entry = _pending.setdefault(package, [None, set()])
+        entry[0] = index or entry[0]
+        if file is not None:
+            entry[1].add(file)
+
+        _saves += 1
+        count = _saves
+
+    sublime.set_timeout_async(lambda: _reload_saved(count),
+                              hha_setting("reload_on_save_delay"))
+
+
+def _reload_saved(count):
+    """
+    Load the help indexes for the queued reloads in the async thread, then
+    hand them to the main thread to be put in place, unless there has been
+    another save since they were queued.
+    """
+    global _pending
+
+    with _lock:
+        if count != _saves:
+            return
+
+        pending, _pending = _pending, {}
+
+    loaded = {}
+    for package, (index, files) in pending.items():
+        new_info = None if index is None else load_help_index(index)
+        loaded[package] = (index, new_info, files)
+
+    sublime.set_timeout(lambda: _install_saved(loaded))
+
+
+def _install_saved(loaded):
+    """
+    Put the help indexes loaded by _reload_saved() in place and refresh what
+    is displayed from them. loaded maps package names to a tuple of the help
+    index resource (or None), the loaded help index (or None) and the set of
+    help files that were saved.
+    """
+    refresh = {}
+    for package, (index, new_info, files) in loaded.items():
+        result = None
+        if index is not None:
+            result = install_help_index(index, new_info)
+
+        if result is not None:
+            change, dropped = result
+            refresh_inline_lint(dropped)
+
+            # Everything displayed from the package may have changed.
+            refresh[change.package] = None
+
+        # When there's no new index, saved help files are still reloaded,
+        # against the index that's already loaded.
+        elif files:
+            refresh[package] = files
+
+    if refresh:
+        refresh_help_views(refresh)
+
+
+def refresh_help_views(refresh):
+    """
+    Reload the help file displayed in the help view of each window if it's
+    one that needs to be refreshed; refresh maps package names to the set of
+    files that were saved, or None if every file in the package is affected.
+    """
+    for window in sublime.windows():
+        help_view = find_help_view(window)
+        if help_view is None:
+            continue
+
+        settings = help_view.settings()
+        package = settings.get("_hh_pkg")
+        file = settings.get("_hh_file")
+        if package not in refresh:
+            continue
+
+        if refresh[package] is None or file in refresh[package]:
+            reload_help_view(help_view, file)
+
+
+###----------------------------------------------------------------------------
@@ -0,0 +1,313 @@
+import sublime
+
+import re
+from bisect import bisect_left
+
+from .index_snapshot import normalize_topic, diff_help_index
+
+
+###----------------------------------------------------------------------------
+
+
+# Match the body of a link that is being typed at the end of a line.
+_link_re = re.compile(r'\|([^|\s][^|]*)?$')
+
+
+###----------------------------------------------------------------------------
+
+
+class _TrieNode():
+    """
+    A node in a TopicTrie. A leaf node holds a sorted bucket of (key, value)
+    items whose keys share the prefix that leads to the node; an internal
+    node holds its children, keyed by the next character, and the items whose
+    key ends at the node.
+    """
+    __slots__ = ("depth", "children", "items")
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.children = None
+        self.items = []
+
+
+class TopicTrie():
+    """
+    A prefix trie of (key, value) items, used to find all of the items whose
+    key starts with some prefix.
+
+    This is a burst trie; rather than a node for every character, items are
+    kept in small sorted buckets that are only split into a node per next
+    character once they grow past a threshold. This keeps the trie small even
+    for tens of thousands of topics, while a lookup is still a walk down at
+    most as many nodes as there are characters in the prefix followed by a
+    binary search of a bucket.
+    """
+    __slots__ = ("_root", "_size")
+
+    burst = 32
+
+    def __init__(self, items=()):
+        self._root = _TrieNode(0)
+        self._size = 0
+        for key, value in items:
+            self.add(key, value)
+
+    def __len__(self):
+        return self._size
+
+    def _node(self, key, create=False):
+        """
+        Return the node that items with the given key are stored in, or None
+        if there is no such node and create is False.
+        """
+        node = self._root
+        while node.children is not None and node.depth < len(key):
+            child = node.children.get(key[node.depth])
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[key[node.depth]] = _TrieNode(
+                    node.depth + 1)
+            node = child
+
+        return node
+
+    def add(self, key, value):
+        """
+        Add an item to the trie, unless it is already there.
+        """
+        node = self._node(key, create=True)
+        item = (key, value)
+        index = bisect_left(node.items, item)
+        if index < len(node.items) and node.items[index] == item:
+            return
+
+        node.items.insert(index, item)
+        self._size += 1
+
+        if node.children is None and len(node.items) > self.burst:
+            self._burst(node)
+
+    def _burst(self, node):
+        """
+        Turn a leaf node into an internal node, sharing its items out to new
+        leaf nodes for each next character.
+        """
+        items, node.items, node.children = node.items, [], {}
+        for key, value in items:
+            if len(key) == node.depth:
+                node.items.append((key, value))
+            else:
+                child = node.children.get(key[node.depth])
+                if child is None:
+                    child = node.children[key[node.depth]] = _TrieNode(
+                        node.depth + 1)
+                child.items.append((key, value))
+
+        # Children that are over the threshold on their own burst as well.
+        for child in node.children.values():
+            if len(child.items) > self.burst:
+                self._burst(child)
+
+    def discard(self, key):
+        """
+        Remove all of the items with the given key from the trie.
+        """
+        node = self._node(key)
+        if node is None:
+            return
+
+        start = bisect_left(node.items, (key,))
+        end = start
+        while end < len(node.items) and node.items[end][0] == key:
+            end += 1
+
+        del node.items[start:end]
+        self._size -= end - start
+
+    def complete(self, prefix, limit=None):
+        """
+        Return a list of the (key, value) items whose key starts with the
+        given prefix, in key order, stopping after limit items if a limit is
+        given.
+        """
+        node = self._node(prefix)
+        if node is None:
+            return []
+
+        results = []
+        if node.children is None:
+            index = bisect_left(node.items, (prefix,))
+            while (index < len(node.items) and
+                   node.items[index][0].startswith(prefix)):
+                results.append(node.items[index])
+                if limit is not None and len(results) >= limit:
+                    break
+                index += 1
+
+            return results
+
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                results.extend(node.items)
+            else:
+                results.extend(node.items)
+                stack.extend(node.children[char]
+                             for char in sorted(node.children, reverse=True))
+
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+
+        return results
+
+
+###----------------------------------------------------------------------------
+
+
+def _topic_items(pkg_info, keys=None):
+    """
+    Yield the (key, value) trie items for the topics and aliases in the given
+    help index, or only those with the given normalized keys. The key is the
+    normalized topic and the value is a tuple of the topic and a description
+    of it.
+    """
+    for key, entry in pkg_info.help_topics.items():
+        key = normalize_topic(key)
+        if keys is None or key in keys:
+            yield (key, (entry["topic"], entry.get("caption") or ""))
+
+    for alias, topic in pkg_info.help_aliases.items():
+        key = normalize_topic(alias)
+        if keys is None or key in keys:
+            yield (key, (alias, "alias of %s" % topic))
+
+
+class TopicCompletions():
+    """
+    Prefix tries over the topics and aliases of every loaded help package,
+    plus one over the package names, for completing links as they are typed.
+
+    A trie is built for each package when it's first seen; when the help
+    index for a package is reloaded, only the topics that changed are
+    updated in its trie.
+    """
+    def __init__(self):
+        self._index_list = {}
+        self._tries = {}
+        self._packages = TopicTrie()
+
+    def update(self, index_list):
+        """
+        Bring the tries up to date with the provided help index list.
+        """
+        for package in list(self._index_list):
+            if package not in index_list:
+                del self._index_list[package]
+                del self._tries[package]
+                self._packages.discard(normalize_topic(package))
+
+        for package, pkg_info in index_list.items():
+            old_info = self._index_list.get(package)
+            if old_info is pkg_info:
+                continue
+
+            self._index_list[package] = pkg_info
+            change = diff_help_index(old_info, pkg_info)
+            if change.everything:
+                self._tries[package] = TopicTrie(_topic_items(pkg_info))
+                self._packages.add(normalize_topic(package), package)
+                continue
+
+            trie = self._tries[package]
+            for key in change.topics:
+                trie.discard(key)
+            for key, value in _topic_items(pkg_info, change.topics):
+                trie.add(key, value)
+
+    def packages(self, prefix, limit=None):
+        """
+        Return a list of the names of the help packages that start with the
+        given prefix.
+        """
+        return [package for key, package in
+                self._packages.complete(normalize_topic(prefix), limit)]
+
+    def topics(self, package, prefix, limit=None):
+        """
+        Return a list of (topic, description) tuples for the topics and
+        aliases in the given package that start with the given prefix.
+        """
+        trie = self._tries.get(package)
+        if trie is None:
+            return []
+
+        # Normalizing drops trailing whitespace, which is part of the prefix.
+        key = normalize_topic(prefix)
+        if prefix[-1:].isspace() and key:
+            key += " "
+
+        return [value for key, value in trie.complete(key, limit)]
+
+
+def topic_completions(index_list):
+    """
+    Return the shared TopicCompletions, brought up to date with the provided
+    help index list. This only does any work when a help index has been
+    added, removed or reloaded since the last call.
+    """
+    key = tuple(id(pkg_info) for pkg_info in index_list.values())
+    if topic_completions.key != key:
+        topic_completions.shared.update(index_list)
+        topic_completions.key = key
+
+    return topic_completions.shared
+
+topic_completions.shared = TopicCompletions()
+topic_completions.key = None
+
+
+###----------------------------------------------------------------------------
+
+
+def link_completions(index_list, package, line, limit=100):
+    """
+    Return completions for a link that is being typed at the end of the given
+    line (the text from the start of the line up to the cursor) in a help
+    file in the given package, or None if a link is not being typed.
+
+    In a link with no package, topics in the given package are completed
+    along with the names of help packages. Once a package and ':' have been
+    typed (or just ':', for the current package), the topics in that package
+    are completed, followed by the ':' that starts the text of the link.
+
+    The return value is a tuple of the part of the link that the completions
+    are for (what follows the last ':') and a list of (completion,
+    description) tuples.
+    """
+    match = _link_re.search(line)
+    if match is None or line.count("|") % 2 == 0:
+        return None
+
+    parts = (match.group(1) or "").split(":")
+    if len(parts) > 2:
+        return None
+
+    completions = topic_completions(index_list)
+    partial = parts[-1]
+
+    if len(parts) == 2:
+        return (partial, [(topic + ":", desc) for topic, desc in
+                          completions.topics(parts[0] or package, partial,
+                                             limit)])
+
+    results = completions.topics(package, partial, limit)
+    results.extend((name + ":", "help package")
+                   for name in completions.packages(partial, limit))
+
+    return (partial, results)
+
+
+###----------------------------------------------------------------------------
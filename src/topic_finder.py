@@ -0,0 +1,384 @@
+from collections import namedtuple, Counter
+from itertools import groupby
+from operator import itemgetter
+from heapq import nsmallest
+
+from .index_snapshot import normalize_topic, diff_help_index
+
+
+###----------------------------------------------------------------------------
+
+
+# A topic that can be found with the TopicFinder. For an alias, topic is the
+# alias and alias_of is the topic that it stands for; otherwise alias_of is
+# None. file is the help file that the topic is in.
+FoundTopic = namedtuple("FoundTopic", [
+    "package", "topic", "caption", "file", "alias_of"
+])
+
+
+def trigrams(text):
+    """
+    Return the set of trigrams in the given text, which should already be
+    normalized. The text is padded with a space at each end, so that words at
+    the start and end of the text produce trigrams of their own.
+    """
+    text = " %s " % text
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# The most topics that could have a given trigram count that are ranked by
+# looking at each of them; past this, the ones that contain the query are
+# found through the index and the rest in length order, stopping once there
+# are enough.
+_rank_limit = 1000
+
+_no_ids = frozenset()
+
+
+###----------------------------------------------------------------------------
+
+
+class TopicFinder():
+    """
+    A trigram index over every topic, alias and caption in every loaded help
+    package, for finding topics across all packages with a fuzzy search.
+
+    Each topic has an id and a search text (its topic, caption and package);
+    every trigram of the search text maps to the set of ids that contain it,
+    and every trigram of the topic itself to the ids of the topics that
+    contain it. A search narrows down the topics that share enough of the
+    trigrams of the query with set operations, starting from the rarest
+    trigrams, and only ranks as many of the best of those as it needs.
+
+    Like TopicCompletions, this is built for each package when it's first
+    seen and only the changed topics are updated when a help index reloads.
+    """
+    def __init__(self):
+        self._index_list = {}
+        self._topics = []
+        self._texts = []
+        self._folded = []
+        self._ids = {}
+        self._keys = {}
+        self._grams = {}
+        self._topic_grams = {}
+        self._free = []
+        self._order = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def update(self, index_list):
+        """
+        Bring the index up to date with the provided help index list.
+        """
+        for package in list(self._index_list):
+            if package not in index_list:
+                del self._index_list[package]
+                self._remove(package, None)
+
+        for package, pkg_info in index_list.items():
+            old_info = self._index_list.get(package)
+            if old_info is pkg_info:
+                continue
+
+            self._index_list[package] = pkg_info
+            change = diff_help_index(old_info, pkg_info)
+            keys = None if change.everything else change.topics
+
+            self._remove(package, keys)
+            for key, topic in self._package_topics(pkg_info, keys):
+                self._add(key, topic)
+
+    def _package_topics(self, pkg_info, keys=None):
+        """
+        Yield a (key, FoundTopic) tuple for each topic and alias in the given
+        help index, or just those whose normalized topic is in keys.
+        """
+        package = pkg_info.package
+        for key, entry in pkg_info.help_topics.items():
+            key = normalize_topic(key)
+            if keys is None or key in keys:
+                yield ((package, key),
+                       FoundTopic(package, entry["topic"],
+                                  entry.get("caption") or "", entry["file"],
+                                  None))
+
+        for alias, topic in pkg_info.help_aliases.items():
+            key = normalize_topic(alias)
+            entry = pkg_info.help_topics.get(topic)
+            if entry is not None and (keys is None or key in keys):
+                yield ((package, key),
+                       FoundTopic(package, alias, entry.get("caption") or "",
+                                  entry["file"], entry["topic"]))
+
+    def _add(self, key, topic):
+        text = normalize_topic("%s %s %s" % (topic.topic, topic.caption,
+                                             topic.package))
+        folded = topic.topic.casefold()
+        if self._free:
+            topic_id = self._free.pop()
+            self._topics[topic_id] = topic
+            self._texts[topic_id] = text
+            self._folded[topic_id] = folded
+        else:
+            topic_id = len(self._topics)
+            self._topics.append(topic)
+            self._texts.append(text)
+            self._folded.append(folded)
+
+        self._ids.setdefault(key, []).append(topic_id)
+        self._keys.setdefault(key[0], set()).add(key)
+        for gram in trigrams(text):
+            self._grams.setdefault(gram, set()).add(topic_id)
+        for gram in trigrams(folded):
+            self._topic_grams.setdefault(gram, set()).add(topic_id)
+
+        self._order = None
+
+    def _remove(self, package, keys):
+        """
+        Remove the topics in the given package whose normalized topic is in
+        keys, or all of them if keys is None.
+        """
+        package_keys = self._keys.get(package, set())
+        remove = [key for key in package_keys
+                  if keys is None or key[1] in keys]
+
+        for key in remove:
+            package_keys.discard(key)
+            for topic_id in self._ids.pop(key):
+                _discard(self._grams, trigrams(self._texts[topic_id]),
+                         topic_id)
+                _discard(self._topic_grams, trigrams(self._folded[topic_id]),
+                         topic_id)
+
+                self._topics[topic_id] = None
+                self._texts[topic_id] = None
+                self._folded[topic_id] = None
+                self._free.append(topic_id)
+                self._order = None
+
+        if not package_keys:
+            self._keys.pop(package, None)
+
+    def search(self, query, limit=50):
+        """
+        Return a list of up to limit FoundTopic tuples that best match the
+        given query, best first.
+
+        Topics are ranked by how many of the trigrams of the query they share,
+        then whether the query appears in them as is (at the start of the
+        topic being best), then by the length of the topic, so that short
+        topics that match well come first. A topic has to share at least half
+        of the trigrams in the query to be a match at all, which allows for a
+        few typos.
+
+        Topics are taken a trigram count at a time, most first, and only until
+        there are enough of them, so the string checks are only done on the
+        topics that can make it into the results.
+        """
+        query = normalize_topic(query)
+        if not query:
+            return []
+
+        grams = trigrams(query)
+        needed = max(1, (len(grams) + 1) // 2)
+        sets = sorted((self._grams.get(gram, _no_ids) for gram in grams),
+                      key=len)
+
+        found = []
+        for member, pool in self._tiers(sets, needed):
+            found.extend(self._best(query, member, pool, limit - len(found)))
+            if len(found) >= limit:
+                break
+
+        return [self._topics[topic_id] for topic_id in found]
+
+    def _tiers(self, sets, needed):
+        """
+        Yield a (member, pool) tuple for each number of the provided sets of
+        ids (one for each trigram of the query, smallest first) from all of
+        them down to needed; member is a function that determines if an id is
+        in exactly that many of the sets and pool is the set of all such ids,
+        or None if it wasn't worth gathering.
+
+        An id in count of the sets has to be in at least one of any
+        len(sets) - count + 1 of them, so the ids for each count are found by
+        counting just those in that many of the rarest sets, adding one set
+        for each count; ids counted before that aren't in enough sets yet are
+        carried over to the next count. Once that covers most of the topics, the rest are
+        left to be found by checking topics one at a time.
+        """
+        total = len(sets)
+        if len(sets[0]) > len(self) // 2:
+            for count in range(total, needed - 1, -1):
+                yield (self._count_check(sets, count), None)
+            return
+
+        # The ids in every set are found without counting, which is often
+        # enough for a search to stop there.
+        full = set(sets[0]).intersection(*sets[1:])
+        yield (full.__contains__, full)
+
+        seen = set(full)
+        ranked = []
+        for count in range(total - 1, needed - 1, -1):
+            new = set().union(*sets[:total - count + 1]) - seen
+            if len(seen) + len(new) > len(self) // 2:
+                for count in range(count, needed - 1, -1):
+                    yield (self._count_check(sets, count), None)
+                return
+
+            seen |= new
+            counts = Counter(dict(ranked))
+            for ids in sets:
+                counts.update(ids & new)
+
+            # Nothing left to count can be in more than count of the sets.
+            ranked = counts.most_common()
+            pool = set()
+            if ranked and ranked[0][1] == count:
+                pool = set(map(itemgetter(0),
+                               next(groupby(ranked, itemgetter(1)))[1]))
+                ranked = ranked[len(pool):]
+
+            yield (pool.__contains__, pool)
+
+    def _count_check(self, sets, count):
+        """
+        Return a function that determines if a topic id is in exactly count of
+        the provided sets.
+        """
+        if count == len(sets):
+            return lambda topic_id: all(topic_id in ids for ids in sets)
+
+        return lambda topic_id: sum(topic_id in ids for ids in sets) == count
+
+    def _rank(self, topic_id, query):
+        topic = self._folded[topic_id]
+        return (0 if topic.startswith(query) else
+                1 if query in topic else
+                2 if query in self._texts[topic_id] else 3,
+                len(topic), topic)
+
+    def _best(self, query, member, pool, limit):
+        """
+        Return a list of up to limit of the ids of the topics for which the
+        member function returns True, best first. pool is the set of all of
+        those ids, if it's known.
+        """
+        if limit <= 0 or (pool is not None and not pool):
+            return []
+
+        if pool is not None and len(pool) <= _rank_limit:
+            return nsmallest(limit, pool,
+                             key=lambda topic_id: self._rank(topic_id, query))
+
+        # Topics that contain the query come first, in length order; member
+        # is only checked for those that could still make it into the list.
+        order, position = self._topic_order()
+        starts = []
+        contains = []
+        for topic_id in sorted(self._containing(query),
+                               key=position.__getitem__):
+            topic = self._folded[topic_id]
+            if topic.startswith(query):
+                if member(topic_id):
+                    starts.append(topic_id)
+                    if len(starts) == limit:
+                        return starts
+            elif (len(contains) < limit and query in topic and
+                    member(topic_id)):
+                contains.append(topic_id)
+
+        best = (starts + contains)[:limit]
+        wanted = limit - len(best)
+        if not wanted:
+            return best
+
+        # The rest only differ by whether the query is in the caption, and
+        # are otherwise in length order.
+        in_text = []
+        rest = []
+        for topic_id in order:
+            if query in self._folded[topic_id] or not member(topic_id):
+                continue
+
+            if query in self._texts[topic_id]:
+                in_text.append(topic_id)
+                if len(in_text) == wanted:
+                    break
+            elif len(rest) < wanted:
+                rest.append(topic_id)
+
+        return best + (in_text + rest)[:wanted]
+
+    def _containing(self, query):
+        """
+        Return a set of topic ids that includes every topic that contains the
+        given query (and maybe some that don't), from the trigrams of the
+        topics; a topic that contains the query has every trigram within it,
+        and a short query is within one of the trigrams of the topic.
+        """
+        if len(query) < 3:
+            return set().union(*(ids for gram, ids in self._topic_grams.items()
+                                 if query in gram))
+
+        inner = sorted((self._topic_grams.get(query[i:i + 3], _no_ids)
+                        for i in range(len(query) - 2)), key=len)
+        return set(inner[0]).intersection(*inner[1:])
+
+    def _topic_order(self):
+        """
+        Return a tuple of the list of every topic id, ordered by the length of
+        the topic and then the topic itself, and a list that gives the place
+        of each topic id in that order.
+        """
+        if self._order is None:
+            order = sorted(
+                (topic_id for topic_id, topic in enumerate(self._folded)
+                 if topic is not None),
+                key=lambda topic_id: (len(self._folded[topic_id]),
+                                      self._folded[topic_id]))
+
+            position = [None] * len(self._folded)
+            for place, topic_id in enumerate(order):
+                position[topic_id] = place
+
+            self._order = (order, position)
+
+        return self._order
+
+
+def _discard(grams, keys, topic_id):
+    """
+    Remove the given topic id from the sets of ids of the given trigrams,
+    dropping any set that ends up empty.
+    """
+    for gram in keys:
+        ids = grams.get(gram)
+        ids.discard(topic_id)
+        if not ids:
+            del grams[gram]
+
+
+def topic_finder(index_list):
+    """
+    Return the shared TopicFinder, brought up to date with the provided help
+    index list. This only does any work when a help index has been added,
+    removed or reloaded since the last call.
+    """
+    key = tuple(id(pkg_info) for pkg_info in index_list.values())
+    if topic_finder.key != key:
+        topic_finder.shared.update(index_list)
+        topic_finder.key = key
+
+    return topic_finder.shared
+
+topic_finder.shared = TopicFinder()
+topic_finder.key = None
+
+
+###----------------------------------------------------------------------------